@@ -1,14 +1,16 @@
 import re
 import os
+import math
 import logging
 import aiohttp
 import string
 import discord
 import random
+from bisect import bisect_left, bisect_right
 from enum import Enum
 from dataclasses import dataclass
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Collection, Optional, Sequence
 from enum import IntEnum
 
 
@@ -92,11 +94,14 @@ class Condition(IntEnum):
     def get_max_float(self) -> float:
         return [1.0, 0.45, 0.38, 0.15, 0.07][self.value]
 
-    def get_float(self, min_float: float, max_float: float) -> float:
+    def get_float(
+        self, min_float: float, max_float: float, rng: Optional[random.Random] = None
+    ) -> float:
         _min = max(self.get_min_float(), min_float)
         _max = min(self.get_max_float(), max_float)
         diff = _max - _min
-        return _min + random.random() * diff
+        u = random.random() if rng is None else rng.random()
+        return _min + u * diff
 
 
 class SkinMetadatum(BaseModel):
@@ -155,29 +160,228 @@ class ItemContainerEntry(BaseModel):
 type ContainerEntry = SkinContainerEntry | ItemContainerEntry
 
 
-class GenericContainer[T: ContainerEntry](BaseModel):
+class SkinDrop(BaseModel):
+    """
+    A skin variant a container can drop, resolved into the item key of every condition
+    it comes in
+    """
+
+    weight: int
+    min_float: float
+    max_float: float
+    # the wear draw (see wear_float) above each cut gives the next item key
+    wear_cuts: list[float]
+    item_keys: list[str]
+
+
+class ItemDrop(BaseModel):
+    weight: int
+    item_key: str
+
+
+type DropTableEntry = SkinDrop | ItemDrop
+
+
+class GenericContainer[T: ContainerEntry, D: DropTableEntry](BaseModel):
     formatted_name: str
     price: int
     image_url: str
     requires_key: bool
     contains: dict[Rarity, list[T]]
     contains_rare: list[T]
+    # everything the container can drop, resolved ahead of time from the entries above
+    drops: list[D]
 
 
-class SkinCase(GenericContainer[SkinContainerEntry]):
+class SkinCase(GenericContainer[SkinContainerEntry, SkinDrop]):
     pass
 
 
-class SouvenirPackage(GenericContainer[SkinContainerEntry]):
+class SouvenirPackage(GenericContainer[SkinContainerEntry, SkinDrop]):
     pass
 
 
-class StickerCapsule(GenericContainer[ItemContainerEntry]):
+class StickerCapsule(GenericContainer[ItemContainerEntry, ItemDrop]):
     pass
 
 
 type Container = SkinCase | SouvenirPackage | StickerCapsule
 
+# a skin's wear is drawn from these bands: the cumulative probability at the right end of
+# each band, then the band's range of floats
+WEAR_BANDS = (
+    (0.1471, 0.00, 0.07),
+    (0.3939, 0.07, 0.15),
+    (0.8257, 0.15, 0.38),
+    (0.9007, 0.38, 0.45),
+    (1.0, 0.45, 1.0),
+)
+_WEAR_CUTS = tuple(cut for cut, _, _ in WEAR_BANDS)
+_WEAR_HIGHS = tuple(high for _, _, high in WEAR_BANDS)
+# floats above each bound have the next worse condition, from Factory New up
+CONDITION_BOUNDS = (0.07, 0.15, 0.38, 0.45)
+# 1 in this many skins from a skin case is StatTrak
+STATTRAK_ODDS = 10
+
+
+def wear_float(u: float) -> float:
+    """Map a uniform value in [0, 1) onto the distribution of wear"""
+    idx = bisect_left(_WEAR_CUTS, u)
+    previous_cut = _WEAR_CUTS[idx - 1] if idx else 0.0
+    cut, low, high = WEAR_BANDS[idx]
+    return low + (u - previous_cut) * (high - low) / (cut - previous_cut)
+
+
+def wear_cdf(wear: float) -> float:
+    """The inverse of wear_float"""
+    idx = bisect_left(_WEAR_HIGHS, wear)
+    previous_cut = _WEAR_CUTS[idx - 1] if idx else 0.0
+    cut, low, high = WEAR_BANDS[idx]
+    return previous_cut + (wear - low) * (cut - previous_cut) / (high - low)
+
+
+def get_drop_tiers[T: ContainerEntry](
+    contains: dict[Rarity, list[T]], contains_rare: list[T]
+) -> list[tuple[int, list[T]]]:
+    """
+    Weight of each tier of entries a container drops from. A number from 1 to the sum of
+    1 + 5^(n + 1) over the tiers in contains, rarest first, is drawn. 1 is contains_rare
+    and each tier covers its run of the rest. Tiers with no entries are left out
+    """
+    tiers = [(1, contains_rare)]
+    previous = 1
+    cumulative = 0
+    for idx, entries in enumerate(reversed(contains.values())):
+        cumulative += 1 + 5 ** (idx + 1)
+        tiers.append((cumulative - previous, entries))
+        previous = cumulative
+    return [(weight, entries) for weight, entries in tiers if entries]
+
+
+def _check_item_key(item_key: str, item_keys: Collection[str]) -> str:
+    if item_key not in item_keys:
+        raise ValueError(f"No item metadata for {item_key}")
+    return item_key
+
+
+def resolve_skin_drops(
+    contains: dict[Rarity, list[SkinContainerEntry]],
+    contains_rare: list[SkinContainerEntry],
+    variants: Sequence[tuple[str, int]],
+    item_keys: Collection[str],
+) -> list[SkinDrop]:
+    """
+    Resolve every skin a container can drop into concrete item keys, checked against
+    item_keys. Each entry is split evenly between its phases, then between the prefixes
+    in variants by their weights. An entry missing any key of the variants after the
+    first gets only the first, with their combined weight. Weights are kept integral so
+    the odds are exact
+    """
+    tiers = get_drop_tiers(contains, contains_rare)
+    phase_groups = {
+        entry.phase_group
+        for _, entries in tiers
+        for entry in entries
+        if entry.phase_group is not None
+    }
+    scale = math.lcm(
+        *(len(entries) for _, entries in tiers),
+        *(len(phase_group.get_phases()) for phase_group in phase_groups),
+    )
+    condition_names = [
+        remove_skin_name_formatting(str(condition)) for condition in Condition
+    ]
+    drops = []
+    for tier_weight, entries in tiers:
+        for entry in entries:
+            phases = (
+                [""]
+                if entry.phase_group is None
+                else [
+                    remove_skin_name_formatting(phase)
+                    for phase in entry.phase_group.get_phases()
+                ]
+            )
+            float_range = entry.max_float - entry.min_float
+            bounds = [
+                bound
+                for bound in CONDITION_BOUNDS
+                if entry.min_float < bound < entry.max_float
+            ]
+            wear_cuts = [
+                wear_cdf((bound - entry.min_float) / float_range) for bound in bounds
+            ]
+            best_condition = bisect_right(CONDITION_BOUNDS, entry.min_float)
+            conditions = condition_names[
+                best_condition : best_condition + len(bounds) + 1
+            ]
+            weight = tier_weight * scale // len(entries) // len(phases)
+            variant_keys = [
+                (
+                    [
+                        [
+                            f"{prefix}{entry.unformatted_name}{phase}{condition}"
+                            for condition in conditions
+                        ]
+                        for phase in phases
+                    ],
+                    variant_weight,
+                )
+                for prefix, variant_weight in variants
+            ]
+            # entries without every variant, like gloves which have no StatTrak,
+            # drop the first variant only, with the weight of all of them
+            if not all(
+                key in item_keys
+                for keys_by_phase, _ in variant_keys[1:]
+                for keys in keys_by_phase
+                for key in keys
+            ):
+                variant_keys = [
+                    (
+                        variant_keys[0][0],
+                        sum(variant_weight for _, variant_weight in variants),
+                    )
+                ]
+            for keys_by_phase, variant_weight in variant_keys:
+                for keys in keys_by_phase:
+                    drops.append(
+                        SkinDrop(
+                            weight=weight * variant_weight,
+                            min_float=entry.min_float,
+                            max_float=entry.max_float,
+                            wear_cuts=wear_cuts,
+                            item_keys=[_check_item_key(key, item_keys) for key in keys],
+                        )
+                    )
+    divisor = math.gcd(*(drop.weight for drop in drops))
+    for drop in drops:
+        drop.weight //= divisor
+    return drops
+
+
+def resolve_item_drops(
+    contains: dict[Rarity, list[ItemContainerEntry]],
+    contains_rare: list[ItemContainerEntry],
+    item_keys: Collection[str],
+) -> list[ItemDrop]:
+    """Resolve every item a container can drop, checked against item_keys"""
+    tiers = get_drop_tiers(contains, contains_rare)
+    scale = math.lcm(*(len(entries) for _, entries in tiers))
+    drops = [
+        ItemDrop(
+            weight=tier_weight * scale // len(entries),
+            item_key=_check_item_key(entry.unformatted_name, item_keys),
+        )
+        for tier_weight, entries in tiers
+        for entry in entries
+    ]
+    divisor = math.gcd(*(drop.weight for drop in drops))
+    for drop in drops:
+        drop.weight //= divisor
+    return drops
+
+
 _SPECIAL_CHARS_REGEX = re.compile(r"[™★♥\s]")
 
 
@@ -215,6 +419,27 @@ STICKER_METADATA_PATH = os.path.join("generated", "sticker_metadata.json")
 SKIN_CASES_METADATA_PATH = os.path.join("generated", "skin_cases.json")
 STICKER_CAPSULE_METADATA_PATH = os.path.join("generated", "sticker_capsules.json")
 SOUVENIR_PACKAGE_METADATA_PATH = os.path.join("generated", "souvenir_packages.json")
+METADATA_MANIFEST_PATH = os.path.join("generated", "manifest.json")
+
+# bumped whenever the layout of the metadata files changes, so files are only trusted by
+# readers expecting the layout they were generated with
+METADATA_SCHEMA_VERSION = 2
+
+
+class MetadataManifest(BaseModel):
+    """
+    Written by the asset service next to the metadata files it generated and validated
+    """
+
+    schema_version: int
+    # metadata file name to the SHA-256 of its contents, in hex
+    checksums: dict[str, str]
+
+
+def validate_metadata[T: BaseModel](
+    raw_json: dict[str, Any], model: type[T]
+) -> dict[str, T]:
+    return {key: model.model_validate(value) for key, value in raw_json.items()}
 
 
 # Helper function to parse the raw JSON data into a dictionary of model instances
@@ -223,9 +448,7 @@ async def parse_metadata[T: BaseModel](url: str, model: type[T]) -> dict[str, T]
     async with aiohttp.ClientSession() as session:
         async with session.get(url) as response:
             raw_json = await response.json()
-            metadata = {
-                key: model.model_validate(value) for key, value in raw_json.items()
-            }
+            metadata = validate_metadata(raw_json, model)
     _logger.info(f"Metadata refreshed from {url}")
     return metadata
 
@@ -17,9 +17,16 @@ from common import (
     SouvenirPackage,
     StickerCapsule,
     PhaseGroup,
+    STATTRAK_ODDS,
     remove_skin_name_formatting,
+    resolve_item_drops,
+    resolve_skin_drops,
+)
+from util import (
+    create_image_url,
+    get_rarity_from_string,
+    update_metadata_manifest,
 )
-from util import create_image_url, get_rarity_from_string
 
 
 class Result(NamedTuple):
@@ -59,7 +66,10 @@ def create_skin_container_entry_from_datum(
 
 
 def process_skin_case(
-    skin_cases: dict[str, SkinCase], asset_domain: str, api_datum: Any
+    skin_cases: dict[str, SkinCase],
+    asset_domain: str,
+    item_keys: set[str],
+    api_datum: Any,
 ) -> None:
     formatted_name = api_datum["name"]
     unformatted_name = remove_skin_name_formatting(formatted_name)
@@ -82,11 +92,21 @@ def process_skin_case(
         requires_key=True,
         contains=contains,
         contains_rare=contains_rare,
+        # 1 in STATTRAK_ODDS skins from a case is StatTrak, except gloves which never are
+        drops=resolve_skin_drops(
+            contains,
+            contains_rare,
+            [("", STATTRAK_ODDS - 1), ("stattrak", 1)],
+            item_keys,
+        ),
     )
 
 
 def process_souvenir_package(
-    souvenir_packages: dict[str, SouvenirPackage], asset_domain: str, api_datum: Any
+    souvenir_packages: dict[str, SouvenirPackage],
+    asset_domain: str,
+    item_keys: set[str],
+    api_datum: Any,
 ) -> None:
     formatted_name = api_datum["name"]
     unformatted_name = remove_skin_name_formatting(formatted_name)
@@ -105,6 +125,8 @@ def process_souvenir_package(
         requires_key=False,
         contains=contains,
         contains_rare=[],
+        # souvenir packages only drop souvenir skins
+        drops=resolve_skin_drops(contains, [], [("souvenir", 1)], item_keys),
     )
 
 
@@ -115,7 +137,10 @@ STICKER_CAPSULES_THAT_REQUIRE_KEYS = {
 
 
 def process_sticker_capsule(
-    sticker_capsules: dict[str, StickerCapsule], asset_domain: str, api_datum: Any
+    sticker_capsules: dict[str, StickerCapsule],
+    asset_domain: str,
+    item_keys: set[str],
+    api_datum: Any,
 ) -> None:
     formatted_name = api_datum["name"]
     unformatted_name = remove_skin_name_formatting(formatted_name)
@@ -145,24 +170,41 @@ def process_sticker_capsule(
         requires_key=unformatted_name in STICKER_CAPSULES_THAT_REQUIRE_KEYS,
         contains=contains,
         contains_rare=[],
+        drops=resolve_item_drops(contains, [], item_keys),
     )
 
 
-def run(asset_domain: str, api_data: Any) -> Result:
+def run(asset_domain: str, item_keys: set[str], api_data: Any) -> Result:
     skin_cases: dict[str, SkinCase] = {}
     souvenir_packages: dict[str, SouvenirPackage] = {}
     sticker_capsules: dict[str, StickerCapsule] = {}
     for datum in api_data:
         match datum["type"]:
             case "Case":
-                process_skin_case(skin_cases, asset_domain, datum)
+                process_skin_case(skin_cases, asset_domain, item_keys, datum)
             case "Souvenir":
-                process_souvenir_package(souvenir_packages, asset_domain, datum)
+                process_souvenir_package(
+                    souvenir_packages, asset_domain, item_keys, datum
+                )
             case "Sticker Capsule":
-                process_sticker_capsule(sticker_capsules, asset_domain, datum)
+                process_sticker_capsule(
+                    sticker_capsules, asset_domain, item_keys, datum
+                )
     return Result(skin_cases, souvenir_packages, sticker_capsules)
 
 
+def get_item_keys() -> set[str]:
+    """
+    Keys of every item generated by gen_item_metadata.py, which every drop is checked
+    against
+    """
+    item_keys = set()
+    for file_name in ("skin_metadata.json", "sticker_metadata.json"):
+        with open(os.path.join(OUTPUT_DIRECTORY, file_name), encoding="utf-8") as f:
+            item_keys.update(json.load(f).keys())
+    return item_keys
+
+
 def get_skin_float_ranges() -> dict[str, tuple[float, float]]:
     skin_data = requests.get(
         "https://bymykel.github.io/CSGO-API/api/en/skins.json"
@@ -187,12 +229,16 @@ if __name__ == "__main__":
     os.makedirs(OUTPUT_DIRECTORY, exist_ok=True)
     # obtain float ranges
     float_ranges = get_skin_float_ranges()
+    # items the containers can drop
+    item_keys = get_item_keys()
     # container api data
     api_data = requests.get(
         "https://bymykel.github.io/CSGO-API/api/en/crates.json"
     ).json()
     # run script body
-    skin_cases, souvenir_packages, sticker_capsules = run(asset_domain, api_data)
+    skin_cases, souvenir_packages, sticker_capsules = run(
+        asset_domain, item_keys, api_data
+    )
     # output to json
     with open(f"{OUTPUT_DIRECTORY}/skin_cases.json", "w+", encoding="utf-8") as f:
         json.dump(
@@ -217,3 +263,6 @@ if __name__ == "__main__":
             ensure_ascii=False,
             indent=4,
         )
+    update_metadata_manifest(
+        "skin_cases.json", "souvenir_packages.json", "sticker_capsules.json"
+    )
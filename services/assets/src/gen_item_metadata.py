@@ -15,7 +15,12 @@ from common import (
     Rarity,
 )
 from constants import VANILLA_KNIVES
-from util import Condition, create_image_url, get_rarity_from_string
+from util import (
+    Condition,
+    create_image_url,
+    get_rarity_from_string,
+    update_metadata_manifest,
+)
 from dotenv import load_dotenv
 
 
@@ -155,3 +160,4 @@ if __name__ == "__main__":
             ensure_ascii=False,
             indent=4,
         )
+    update_metadata_manifest("skin_metadata.json", "sticker_metadata.json")
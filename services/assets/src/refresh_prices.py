@@ -11,7 +11,7 @@ from common import remove_skin_name_formatting, PhaseGroup
 from constants import OUTPUT_DIRECTORY, VANILLA_KNIVES
 from decimal import Decimal
 from statistics import mean
-from util import Condition
+from util import Condition, update_metadata_manifest
 
 
 def fetch_skinport_data() -> Any:
@@ -99,6 +99,7 @@ def aggregate_prices_for(file: str, skinport_item_data: Any) -> None:
     # Write updated metadata back to file
     with open(os.path.join(OUTPUT_DIRECTORY, file), "w", encoding="utf-8") as f:
         json.dump(metadata, f, indent=4, ensure_ascii=False)
+    update_metadata_manifest(file)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,7 @@
 import os
-from common import Rarity, Condition
+import hashlib
+from common import Rarity, Condition, MetadataManifest, METADATA_SCHEMA_VERSION
+from constants import OUTPUT_DIRECTORY
 
 
 def _get_best_condition_idx(min_float: float) -> int:
@@ -62,3 +64,27 @@ def get_rarity_from_string(string: str) -> Rarity:
         "rarity_ancient": Rarity.Ancient,
         "rarity_contraband": Rarity.Contraband,
     }[string]
+
+
+def update_metadata_manifest(*file_names: str) -> None:
+    """
+    Record the checksums of metadata files just written to the output directory, so the
+    bot can trust them without validating every entry again
+    """
+    path = os.path.join(OUTPUT_DIRECTORY, "manifest.json")
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = MetadataManifest.model_validate_json(f.read())
+    except FileNotFoundError:
+        manifest = MetadataManifest(
+            schema_version=METADATA_SCHEMA_VERSION, checksums={}
+        )
+    if manifest.schema_version != METADATA_SCHEMA_VERSION:
+        manifest = MetadataManifest(
+            schema_version=METADATA_SCHEMA_VERSION, checksums={}
+        )
+    for file_name in file_names:
+        with open(os.path.join(OUTPUT_DIRECTORY, file_name), "rb") as f:
+            manifest.checksums[file_name] = hashlib.sha256(f.read()).hexdigest()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(manifest.model_dump_json(indent=4))
@@ -0,0 +1,57 @@
+import os
+import time
+import logging
+import statistics
+from dotenv import load_dotenv
+from spacecases.database import Database, REGISTER, CLOSE
+
+# benchmarks create and delete this user, so run them against a throwaway database
+BENCHMARK_USER_ID = -1
+
+
+async def create_database(min_size: int = 10, max_size: int = 10) -> Database:
+    load_dotenv(override=True)
+    # per query debug logging would dominate the timings
+    logging.getLogger("spacecases.database").setLevel(logging.INFO)
+    return await Database.create(
+        os.environ["DB_USER"],
+        os.environ["DB_PASSWORD"],
+        os.environ["DB_NAME"],
+        os.environ.get("DB_HOST", "localhost"),
+        os.environ.get("DB_PORT", "5432"),
+        min_size,
+        max_size,
+    )
+
+
+async def register_benchmark_user(
+    db: Database, user_id: int = BENCHMARK_USER_ID
+) -> None:
+    await db.fetch_from_file(CLOSE, user_id)
+    await db.fetch_from_file(REGISTER, user_id)
+
+
+async def close_benchmark_user(db: Database, user_id: int = BENCHMARK_USER_ID) -> None:
+    await db.fetch_from_file(CLOSE, user_id)
+
+
+class Timer:
+    def __init__(self) -> None:
+        self.samples: list[float] = []
+
+    def __enter__(self) -> "Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.samples.append(time.perf_counter() - self.start)
+
+
+def report(name: str, samples: list[float]) -> None:
+    ordered = sorted(samples)
+    p50 = ordered[len(ordered) // 2] * 1000
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000
+    mean = statistics.fmean(ordered) * 1000
+    print(
+        f"{name:<45} n={len(ordered):<7} mean={mean:.3f}ms p50={p50:.3f}ms p99={p99:.3f}ms"
+    )
@@ -0,0 +1,119 @@
+"""
+Memory held by the item catalogue as a dict of pydantic models against compact records,
+over a generated catalogue the size of the real one
+
+uv run python -m benchmarks.catalogue_memory
+"""
+
+import gc
+import json
+import random
+import tracemalloc
+from itertools import product
+from typing import Any, Callable
+from common import (
+    Condition,
+    SkinMetadatum,
+    StickerMetadatum,
+    remove_skin_name_formatting,
+    validate_metadata,
+)
+from spacecases.catalogue import decode_skin_metadata, decode_sticker_metadata
+from benchmarks import Timer, report
+from benchmarks.item_search import WEAPONS, WORDS, TEAMS, TOURNAMENTS, FINISHES
+
+ASSET_DOMAIN = "https://assets.spacecases.xyz"
+RUNS = 2000
+
+
+def image_url(unformatted_name: str) -> str:
+    return f"{ASSET_DOMAIN}/generated/images/unformatted/{unformatted_name}.png"
+
+
+def generate_metadata_files(
+    rng: random.Random,
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    skins: dict[str, Any] = {}
+    for weapon in WEAPONS:
+        for _ in range(40):
+            skin = f"{weapon.replace('-', ' ')} | {' '.join(rng.sample(WORDS, 2))}"
+            description = " ".join(rng.choices(WORDS, k=25))
+            min_float = round(rng.uniform(0, 0.1), 2)
+            max_float = round(rng.uniform(0.5, 1), 2)
+            rarity = rng.randrange(6)
+            for condition, prefix in product(
+                Condition, ("", "StatTrak™ ", "Souvenir ")
+            ):
+                formatted_name = f"{prefix}{skin} ({condition})"
+                name = remove_skin_name_formatting(formatted_name)
+                skins[name] = {
+                    "formatted_name": formatted_name,
+                    "condition": condition.value,
+                    "rarity": rarity,
+                    "price": rng.randrange(100000),
+                    "image_url": image_url(name),
+                    "description": description,
+                    "min_float": min_float,
+                    "max_float": max_float,
+                }
+    stickers: dict[str, Any] = {}
+    for team, tournament, finish in product(TEAMS, TOURNAMENTS, FINISHES):
+        players = ["".join(rng.sample("abcdefghijklmnop", 6)) for _ in range(3)]
+        for owner in [team, *players]:
+            formatted_name = f"Sticker | {owner}{finish} | {tournament}"
+            name = remove_skin_name_formatting(formatted_name)
+            stickers[name] = {
+                "formatted_name": formatted_name,
+                "rarity": rng.randrange(2, 6),
+                "price": rng.randrange(100000),
+                "image_url": image_url(name),
+            }
+    # decoded from JSON like the real files, so no strings are shared between entries
+    return json.loads(json.dumps(skins)), json.loads(json.dumps(stickers))
+
+
+def measure(build: Callable[[], Any]) -> tuple[Any, int, float]:
+    """The catalogue, bytes it holds once built and seconds taken to build it"""
+    gc.collect()
+    tracemalloc.start()
+    timer = Timer()
+    with timer:
+        catalogue = build()
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return catalogue, memory, timer.samples[0]
+
+
+def main() -> None:
+    skins, stickers = generate_metadata_files(random.Random(0))
+    print(f"{len(skins)} skins, {len(stickers)} stickers")
+
+    def models() -> dict[str, Any]:
+        return validate_metadata(skins, SkinMetadatum) | validate_metadata(
+            stickers, StickerMetadatum
+        )
+
+    def records() -> dict[str, Any]:
+        return decode_skin_metadata(
+            skins, ASSET_DOMAIN, trusted=False
+        ) | decode_sticker_metadata(stickers, ASSET_DOMAIN, trusted=False)
+
+    names = list(skins)
+    for label, build in (("pydantic models", models), ("compact records", records)):
+        catalogue, memory, seconds = measure(build)
+        print(
+            f"{label:<16} {memory / 2**20:6.1f}MiB "
+            f"({memory / len(catalogue):.0f}B per item), built in {seconds * 1000:.0f}ms"
+        )
+        timer = Timer()
+        for name in random.Random(1).choices(names, k=RUNS):
+            with timer:
+                item = catalogue[name]
+                _ = (item.formatted_name, item.price, item.image_url, item.description)
+        report(f"{label} embed fields", timer.samples)
+        del catalogue
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Throughput of adding unboxed items to inventories with many users unboxing at the same
+time, one item per round trip with grant_item as /open does, against batches with
+open_containers as /open with an amount does
+
+uv run python -m benchmarks.concurrent_unboxing
+"""
+
+import time
+import asyncio
+from typing import Literal
+from spacecases.database import Database, GRANT_ITEM, OPEN_CONTAINERS
+from benchmarks import create_database, register_benchmark_user, close_benchmark_user
+
+USERS = 50
+ADDS_PER_USER = 40
+FIRST_USER_ID = -1000
+POOL_SIZE = 40
+# items per open_containers call, ADDS_PER_USER must be a multiple of it
+BATCH_SIZE = 10
+
+type Strategy = Literal["grant_item", "open_containers"]
+
+
+async def add_items(db: Database, user_id: int, strategy: Strategy) -> None:
+    """Add one item with grant_item, or BATCH_SIZE for free with open_containers"""
+    if strategy == "grant_item":
+        await db.fetch_from_file(GRANT_ITEM, user_id, "sticker", "benchmark", None)
+        return
+    await db.fetch_from_file(
+        OPEN_CONTAINERS,
+        user_id,
+        0,
+        ["sticker"] * BATCH_SIZE,
+        ["benchmark"] * BATCH_SIZE,
+        [None] * BATCH_SIZE,
+        [0] * BATCH_SIZE,
+    )
+
+
+def items_per_call(strategy: Strategy) -> int:
+    return 1 if strategy == "grant_item" else BATCH_SIZE
+
+
+async def unbox(db: Database, user_id: int, strategy: Strategy) -> None:
+    for _ in range(ADDS_PER_USER // items_per_call(strategy)):
+        await add_items(db, user_id, strategy)
+
+
+async def run(db: Database, strategy: Strategy) -> None:
+    user_ids = range(FIRST_USER_ID, FIRST_USER_ID - USERS, -1)
+    for user_id in user_ids:
+        await register_benchmark_user(db, user_id)
+        await db.execute(
+            "UPDATE users SET inventory_capacity = $2 WHERE id = $1",
+            user_id,
+            ADDS_PER_USER,
+        )
+    start = time.perf_counter()
+    await asyncio.gather(*(unbox(db, user_id, strategy) for user_id in user_ids))
+    elapsed = time.perf_counter() - start
+    print(
+        f"{strategy:<16} {USERS} users x {ADDS_PER_USER} adds: {elapsed:.2f}s ({USERS * ADDS_PER_USER / elapsed:.0f} adds/s)"
+    )
+    for user_id in user_ids:
+        await close_benchmark_user(db, user_id)
+
+
+async def check_capacity(db: Database, strategy: Strategy) -> None:
+    # many simultaneous adds for one user must still respect their capacity
+    await register_benchmark_user(db, FIRST_USER_ID)
+    calls = 50 // items_per_call(strategy)
+    await asyncio.gather(
+        *(add_items(db, FIRST_USER_ID, strategy) for _ in range(calls))
+    )
+    rows = await db.fetch(
+        "SELECT COUNT(*) FROM items WHERE owner_id = $1", FIRST_USER_ID
+    )
+    await close_benchmark_user(db, FIRST_USER_ID)
+    print(
+        f"{strategy:<16} capacity check: {rows[0]['count']} items added with a capacity of 5"
+    )
+
+
+async def main() -> None:
+    async with await create_database(max_size=POOL_SIZE) as db:
+        strategies: tuple[Strategy, ...] = ("grant_item", "open_containers")
+        for strategy in strategies:
+            await check_capacity(db, strategy)
+        for strategy in strategies:
+            await run(db, strategy)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,132 @@
+"""
+Openings drawn per second for a generated case the size of a real one, one at a time with
+the sampler /open uses against in bulk with the vectorised simulator, and how long working
+out its odds for /odds takes
+
+uv run python -m benchmarks.container_simulation
+"""
+
+import time
+import random
+import numpy as np
+from common import (
+    STATTRAK_ODDS,
+    Condition,
+    PhaseGroup,
+    Rarity,
+    SkinCase,
+    SkinContainerEntry,
+    remove_skin_name_formatting,
+    resolve_skin_drops,
+)
+from spacecases.drops import ContainerSampler
+from spacecases.simulation import ContainerSimulator
+
+SAMPLER_DRAWS = 200_000
+SIMULATOR_DRAWS = 20_000_000
+BATCH_SIZE = 1 << 20
+ODDS_REPEATS = 1000
+# entries per tier of a typical case, from Mil-Spec up
+TIER_SIZES = {
+    Rarity.Rare: 7,
+    Rarity.Mythical: 5,
+    Rarity.Legendary: 3,
+    Rarity.Ancient: 2,
+}
+KNIVES = 5
+KNIFE_FINISHES = ("Fade", "Doppler", "Gamma Doppler", "Slaughter", "Crimson Web")
+
+
+def entry(name: str, rng: random.Random) -> SkinContainerEntry:
+    unformatted_name = remove_skin_name_formatting(name)
+    phase_group = None
+    if "gammadoppler" in unformatted_name:
+        phase_group = PhaseGroup.GAMMA_DOPPLER
+    elif "doppler" in unformatted_name:
+        phase_group = PhaseGroup.DOPPLER
+    min_float = rng.choice((0.0, 0.0, 0.06, 0.1))
+    return SkinContainerEntry(
+        unformatted_name=unformatted_name,
+        min_float=min_float,
+        max_float=rng.choice((0.5, 0.8, 1.0)),
+        phase_group=phase_group,
+        image_url="",
+    )
+
+
+def generate_case(rng: random.Random) -> tuple[SkinCase, dict[str, int]]:
+    """A case with a realistic drop table, and a price for everything it drops"""
+    contains = {
+        rarity: [entry(f"Weapon {rarity.name} {i}", rng) for i in range(size)]
+        for rarity, size in TIER_SIZES.items()
+    }
+    contains_rare = [
+        entry(f"Knife {knife} {finish}", rng)
+        for knife in range(KNIVES)
+        for finish in KNIFE_FINISHES
+    ]
+    phases = [""] + [
+        remove_skin_name_formatting(phase)
+        for phase_group in PhaseGroup
+        for phase in phase_group.get_phases()
+    ]
+    conditions = [
+        remove_skin_name_formatting(str(condition)) for condition in Condition
+    ]
+    entries = [*contains_rare, *(e for tier in contains.values() for e in tier)]
+    # every variant gets a price, whether the case can drop it or not
+    item_prices = {
+        f"{prefix}{e.unformatted_name}{phase}{condition}": rng.randrange(10, 100_000)
+        for e in entries
+        for prefix in ("", "stattrak")
+        for phase in phases
+        for condition in conditions
+    }
+    drops = resolve_skin_drops(
+        contains,
+        contains_rare,
+        [("", STATTRAK_ODDS - 1), ("stattrak", 1)],
+        item_prices,
+    )
+    case = SkinCase(
+        formatted_name="Benchmark Case",
+        price=100,
+        image_url="",
+        requires_key=True,
+        contains=contains,
+        contains_rare=contains_rare,
+        drops=drops,
+    )
+    return case, item_prices
+
+
+def main() -> None:
+    case, item_prices = generate_case(random.Random(0))
+    sampler = ContainerSampler(case)
+    simulator = ContainerSimulator(case)
+    print(f"{len(case.drops)} drops, {len(simulator.item_keys)} items")
+
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for _ in range(SAMPLER_DRAWS):
+        sampler.sample(rng)
+    sampler_rate = SAMPLER_DRAWS / (time.perf_counter() - start)
+    print(f"{'ContainerSampler':<30} {sampler_rate / 1e6:8.2f}M openings/s")
+
+    np_rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    for _ in range(0, SIMULATOR_DRAWS, BATCH_SIZE):
+        simulator.draw(np_rng, BATCH_SIZE)
+    draws = -(-SIMULATOR_DRAWS // BATCH_SIZE) * BATCH_SIZE
+    simulator_rate = draws / (time.perf_counter() - start)
+    print(f"{'ContainerSimulator.draw':<30} {simulator_rate / 1e6:8.2f}M openings/s")
+
+    start = time.perf_counter()
+    for _ in range(ODDS_REPEATS):
+        simulator.odds(item_prices)
+    odds_time = (time.perf_counter() - start) / ODDS_REPEATS
+    print(f"{'ContainerSimulator.odds':<30} {odds_time * 1e6:8.2f}us per container")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Cost of reading and decoding large inventories with skin floats stored in a JSONB details
+column against a typed float column
+
+uv run python -m benchmarks.inventory_decode
+"""
+
+import os
+import json
+import random
+import asyncio
+import asyncpg
+from dotenv import load_dotenv
+from benchmarks import Timer, report
+
+INVENTORY_SIZES = (100, 1000, 10000)
+RUNS = 200
+OWNER_ID = 1
+# keeps the benchmark tables away from the real items table
+SCHEMA = "inventory_decode_benchmark"
+
+
+async def create_tables(connection: asyncpg.Connection, size: int) -> None:
+    await connection.execute(
+        """
+        CREATE TABLE items_details (
+            id BIGSERIAL PRIMARY KEY,
+            owner_id BIGINT NOT NULL,
+            type TEXT NOT NULL,
+            name TEXT NOT NULL,
+            details JSONB NOT NULL
+        );
+        CREATE TABLE items_float (
+            id BIGSERIAL PRIMARY KEY,
+            owner_id BIGINT NOT NULL,
+            type TEXT NOT NULL,
+            name TEXT NOT NULL,
+            float DOUBLE PRECISION
+        );
+        CREATE INDEX ON items_details (owner_id);
+        CREATE INDEX ON items_float (owner_id);
+        CREATE INDEX ON items_float (owner_id, float) WHERE float IS NOT NULL;
+        """
+    )
+    floats = [random.random() for _ in range(size)]
+    await connection.copy_records_to_table(
+        "items_details",
+        records=[
+            (OWNER_ID, "skin", f"skin {i}", json.dumps({"float": float}))
+            for i, float in enumerate(floats)
+        ],
+        columns=["owner_id", "type", "name", "details"],
+    )
+    await connection.copy_records_to_table(
+        "items_float",
+        records=[
+            (OWNER_ID, "skin", f"skin {i}", float) for i, float in enumerate(floats)
+        ],
+        columns=["owner_id", "type", "name", "float"],
+    )
+    await connection.execute("ANALYZE items_details; ANALYZE items_float")
+
+
+async def read_details(connection: asyncpg.Connection) -> list[float]:
+    # how inventories were read before the float column existed
+    rows = await connection.fetch(
+        "SELECT id, name, type, details FROM items_details WHERE owner_id = $1",
+        OWNER_ID,
+    )
+    return [json.loads(details)["float"] for _, _, _, details in rows]
+
+
+async def read_float(connection: asyncpg.Connection) -> list[float]:
+    rows = await connection.fetch(
+        "SELECT id, name, type, float FROM items_float WHERE owner_id = $1", OWNER_ID
+    )
+    return [float for _, _, _, float in rows]
+
+
+async def best_float_details(connection: asyncpg.Connection) -> float:
+    return min(await read_details(connection))
+
+
+async def best_float_indexed(connection: asyncpg.Connection) -> float:
+    return await connection.fetchval(
+        """SELECT float FROM items_float
+        WHERE owner_id = $1 AND float IS NOT NULL
+        ORDER BY float
+        LIMIT 1
+        """,
+        OWNER_ID,
+    )
+
+
+async def main() -> None:
+    load_dotenv(override=True)
+    connection = await asyncpg.connect(
+        user=os.environ["DB_USER"],
+        password=os.environ["DB_PASSWORD"],
+        database=os.environ["DB_NAME"],
+        host=os.environ.get("DB_HOST", "localhost"),
+        port=os.environ.get("DB_PORT", "5432"),
+    )
+    try:
+        for size in INVENTORY_SIZES:
+            await connection.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+            await connection.execute(f"CREATE SCHEMA {SCHEMA}")
+            await connection.execute(f"SET search_path TO {SCHEMA}")
+            await create_tables(connection, size)
+            for name, read in (
+                ("jsonb details", read_details),
+                ("float column", read_float),
+                ("best float, jsonb details", best_float_details),
+                ("best float, indexed", best_float_indexed),
+            ):
+                timer = Timer()
+                for _ in range(RUNS):
+                    with timer:
+                        await read(connection)
+                report(f"{size} items, {name}", timer.samples)
+    finally:
+        await connection.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await connection.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,130 @@
+"""
+Latency of item autocomplete lookups with the search index against the plain prefix trie,
+over a generated catalogue the size of the real one
+
+uv run python -m benchmarks.item_search
+"""
+
+import random
+import tracemalloc
+from itertools import islice, product
+from marisa_trie import Trie
+from common import remove_skin_name_formatting
+from spacecases.search import SearchIndex, MAX_RESULTS
+from benchmarks import Timer, report
+
+RUNS = 2000
+# p99 a lookup must stay under
+LATENCY_BUDGET = 0.001
+
+WEAPONS = (
+    "AK-47 M4A4 M4A1-S AWP Desert-Eagle USP-S Glock-18 P250 Five-SeveN Tec-9 CZ75-Auto "
+    "P2000 Dual-Berettas R8-Revolver MAC-10 MP9 MP7 MP5-SD UMP-45 P90 PP-Bizon Galil-AR "
+    "FAMAS SG-553 AUG SSG-08 SCAR-20 G3SG1 Nova XM1014 Sawed-Off MAG-7 M249 Negev "
+    "★-Karambit ★-Butterfly-Knife ★-Bayonet ★-M9-Bayonet ★-Talon-Knife ★-Skeleton-Knife"
+).split()
+WORDS = (
+    "Red Line Asiimov Hyper Beast Dragon Lore Fade Doppler Vulcan Redline Neo Noir "
+    "Printstream Bloodsport Fire Serpent Howl Gungnir Medusa Wildfire Fever Dream Case "
+    "Hardened Slate Phantom Disruptor Mecha Industries Cyrex Kill Confirmed Orion Cortex "
+    "Emerald Pinstripe Safari Mesh Boreal Forest Urban Masked Night Stripe Ultraviolet "
+    "Tiger Tooth Marble Crimson Web Slaughter Lore Autotronic Freehand Damascus Steel"
+).split()
+CONDITIONS = (
+    "Factory New",
+    "Minimal Wear",
+    "Field-Tested",
+    "Well-Worn",
+    "Battle-Scarred",
+)
+TEAMS = (
+    "Natus Vincere FaZe Clan Astralis Vitality G2 Esports Team Liquid Cloud9 ENCE "
+    "Heroic MOUZ Fnatic NIP Complexity BIG Spirit Virtus.pro FURIA OG"
+).split()
+TOURNAMENTS = (
+    "Katowice 2014",
+    "Cologne 2016",
+    "Boston 2018",
+    "Berlin 2019",
+    "Stockholm 2021",
+    "Antwerp 2022",
+    "Rio 2022",
+    "Paris 2023",
+    "Copenhagen 2024",
+)
+FINISHES = ("", " (Holo)", " (Foil)", " (Glitter)", " (Gold)")
+QUERIES = (
+    "a",
+    "ak",
+    "ak47",
+    "redline",
+    "asiimov",
+    "asimov",
+    "fieldtested",
+    "feildtested",
+    "stattrakawp",
+    "hyperbeast",
+    "karambitfade",
+    "dopler",
+    "nav",
+    "holo",
+    "katowice2014",
+    "cloud9katowice",
+    "zzzqqq",
+)
+
+
+def generate_catalogue(rng: random.Random) -> list[str]:
+    names = []
+    for weapon in WEAPONS:
+        for _ in range(40):
+            skin = f"{weapon.replace('-', ' ')} | {' '.join(rng.sample(WORDS, 2))}"
+            for condition, prefix in product(
+                CONDITIONS, ("", "StatTrak™ ", "Souvenir ")
+            ):
+                names.append(f"{prefix}{skin} ({condition})")
+    for team, tournament, finish in product(TEAMS, TOURNAMENTS, FINISHES):
+        names.append(f"Sticker | {team}{finish} | {tournament}")
+        for _ in range(3):
+            player = "".join(rng.sample("abcdefghijklmnopqrstuvwxyz", 6))
+            names.append(f"Sticker | {player}{finish} | {tournament}")
+    return [remove_skin_name_formatting(name) for name in names]
+
+
+def main() -> None:
+    rng = random.Random(0)
+    names = generate_catalogue(rng)
+    tracemalloc.start()
+    build_timer = Timer()
+    with build_timer:
+        index = SearchIndex(names)
+    index_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    trie_timer = Timer()
+    with trie_timer:
+        trie = Trie(names)
+    print(f"{len(index)} names, index holds {index_memory / 2**20:.1f}MiB")
+    report("build search index", build_timer.samples)
+    report("build trie", trie_timer.samples)
+
+    over_budget = []
+    for query in QUERIES:
+        trie_timer = Timer()
+        index_timer = Timer()
+        trie_results: list[str] = []
+        index_results: list[str] = []
+        for _ in range(RUNS):
+            with trie_timer:
+                trie_results = list(islice(trie.keys(query), MAX_RESULTS))
+            with index_timer:
+                index_results = index.search(query)
+        report(f"{query!r} trie ({len(trie_results)} results)", trie_timer.samples)
+        report(f"{query!r} index ({len(index_results)} results)", index_timer.samples)
+        if sorted(index_timer.samples)[int(RUNS * 0.99)] > LATENCY_BUDGET:
+            over_budget.append(query)
+    if over_budget:
+        print(f"over the {LATENCY_BUDGET * 1000:.0f}ms budget: {over_budget}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+CPU time to decode the item metadata files on a full refresh, validating every entry
+against trusting files the asset service vouches for, over a generated catalogue the
+size of the real one
+
+uv run python -m benchmarks.metadata_decode
+"""
+
+import json
+import time
+import random
+from typing import Any, Callable
+from common import SkinMetadatum, StickerMetadatum, validate_metadata
+from spacecases.catalogue import decode_skin_metadata, decode_sticker_metadata
+from benchmarks.catalogue_memory import ASSET_DOMAIN, generate_metadata_files
+
+RUNS = 5
+
+
+def cpu_time(decode: Callable[[], Any]) -> float:
+    """Fastest of several runs, in seconds of CPU time"""
+    best = float("inf")
+    for _ in range(RUNS):
+        start = time.process_time()
+        decode()
+        best = min(best, time.process_time() - start)
+    return best
+
+
+def main() -> None:
+    skins, stickers = generate_metadata_files(random.Random(0))
+    skin_body = json.dumps(skins, indent=4).encode()
+    sticker_body = json.dumps(stickers, indent=4).encode()
+    print(f"{len(skins)} skins, {len(stickers)} stickers")
+
+    def models() -> None:
+        validate_metadata(json.loads(skin_body), SkinMetadatum)
+        validate_metadata(json.loads(sticker_body), StickerMetadatum)
+
+    def records(trusted: bool) -> None:
+        decode_skin_metadata(json.loads(skin_body), ASSET_DOMAIN, trusted)
+        decode_sticker_metadata(json.loads(sticker_body), ASSET_DOMAIN, trusted)
+
+    def json_only() -> None:
+        json.loads(skin_body)
+        json.loads(sticker_body)
+
+    for label, decode in (
+        ("json.loads only", json_only),
+        ("pydantic models", models),
+        ("validated records", lambda: records(False)),
+        ("trusted records", lambda: records(True)),
+    ):
+        print(f"{label:<20} {cpu_time(decode) * 1000:7.1f}ms CPU")
+
+
+if __name__ == "__main__":
+    main()
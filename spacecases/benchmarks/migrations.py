@@ -0,0 +1,55 @@
+"""
+Startup cost of the migration runner against a database that already has hundreds of migrations applied
+
+uv run python -m benchmarks.migrations
+"""
+
+import os
+import asyncio
+import asyncpg
+import tempfile
+from dotenv import load_dotenv
+from spacecases.database import run_migrations
+from benchmarks import Timer, report
+
+MIGRATIONS = 500
+RUNS = 50
+# the runner uses unqualified table names, so this keeps it away from the real migrations table
+SCHEMA = "migrations_benchmark"
+
+
+async def main() -> None:
+    load_dotenv(override=True)
+    connection = await asyncpg.connect(
+        user=os.environ["DB_USER"],
+        password=os.environ["DB_PASSWORD"],
+        database=os.environ["DB_NAME"],
+        host=os.environ.get("DB_HOST", "localhost"),
+        port=os.environ.get("DB_PORT", "5432"),
+    )
+    await connection.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    await connection.execute(f"CREATE SCHEMA {SCHEMA}")
+    await connection.execute(f"SET search_path TO {SCHEMA}")
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            for i in range(MIGRATIONS):
+                with open(os.path.join(directory, f"{i}_migration.sql"), "w") as f:
+                    f.write(f"CREATE TABLE table_{i} (id BIGINT PRIMARY KEY);")
+
+            apply_timer = Timer()
+            with apply_timer:
+                await run_migrations(connection, directory)
+            report(f"apply {MIGRATIONS} migrations", apply_timer.samples)
+
+            timer = Timer()
+            for _ in range(RUNS):
+                with timer:
+                    await run_migrations(connection, directory)
+            report(f"startup with {MIGRATIONS} applied", timer.samples)
+    finally:
+        await connection.execute(f"DROP SCHEMA {SCHEMA} CASCADE")
+        await connection.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
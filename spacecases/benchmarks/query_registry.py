@@ -0,0 +1,47 @@
+"""
+Compare round trip latency of reading a query file per call against the in-memory query registry
+
+uv run python -m benchmarks.query_registry
+"""
+
+import os
+import asyncio
+from spacecases.database import Database, SQL_QUERIES_DIRECTORY, BALANCE, GET_INVENTORY
+from benchmarks import (
+    BENCHMARK_USER_ID,
+    Timer,
+    create_database,
+    register_benchmark_user,
+    close_benchmark_user,
+    report,
+)
+
+ITERATIONS = 5000
+
+
+async def fetch_reading_file(db: Database, filename: str, *params: object) -> None:
+    # how every query was run before the registry existed
+    with open(os.path.join(SQL_QUERIES_DIRECTORY, filename)) as f:
+        await db.fetch(f.read(), *params)
+
+
+async def main() -> None:
+    async with await create_database() as db:
+        await register_benchmark_user(db)
+        try:
+            for filename in (BALANCE, GET_INVENTORY):
+                file_timer = Timer()
+                registry_timer = Timer()
+                for _ in range(ITERATIONS):
+                    with file_timer:
+                        await fetch_reading_file(db, filename, BENCHMARK_USER_ID)
+                    with registry_timer:
+                        await db.fetch_from_file(filename, BENCHMARK_USER_ID)
+                report(f"{filename} (file per call)", file_timer.samples)
+                report(f"{filename} (registry)", registry_timer.samples)
+        finally:
+            await close_benchmark_user(db)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
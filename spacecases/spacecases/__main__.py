@@ -3,23 +3,41 @@ import discord
 import asyncio
 from contextlib import suppress
 from spacecases.database import Database
+from spacecases.http_client import HttpClient
 from spacecases.bot import SpaceCasesBot
 from spacecases.environment import Environment
 
 
 async def main(environment: Environment) -> None:
-    async with await Database.create(
-        environment.db_user,
-        environment.db_password,
-        environment.db_name,
-        environment.db_host,
-        environment.db_port,
-    ) as db:
+    async with (
+        await HttpClient.create() as http_client,
+        await Database.create(
+            environment.db_user,
+            environment.db_password,
+            environment.db_name,
+            environment.db_host,
+            environment.db_port,
+            environment.db_pool_min_size,
+            environment.db_pool_max_size,
+            environment.db_statement_cache_size,
+            environment.db_read_only_dsn,
+            environment.db_max_replica_lag,
+        ) as db,
+    ):
         bot = SpaceCasesBot(
             db,
+            http_client,
             environment.asset_domain,
             environment.leaderboards_domain,
             environment.owner_id,
+            environment.inventory_cache_size,
+            environment.inventory_cache_ttl,
+            environment.full_metadata_validation,
+            environment.metadata_snapshot_path,
+            environment.rng_seed,
+            environment.rng_replay_log_path,
+            environment.rng_replay_from_path,
+            environment.leaderboard_cache_size,
         )
         try:
             await bot.start(environment.bot_token)
@@ -1,5 +1,5 @@
-import json
 import discord
+from functools import partial
 from discord import app_commands
 from common import remove_skin_name_formatting, ItemType
 from spacecases.bot import SpaceCasesBot
@@ -11,17 +11,20 @@ async def inventory_item_autocomplete(
 ) -> list[app_commands.Choice[str]]:
     # get their items
     unformatted_curret = remove_skin_name_formatting(current)
-    items = await bot.db.fetch_from_file(GET_INVENTORY, user.id)
+    # users who wrote recently are loaded from the primary, so the cache never keeps an
+    # inventory from a replica that hasn't caught up with their last open or sell yet
+    items = await bot.inventory_cache.get(
+        user.id, partial(bot.db.fetch_from_file, GET_INVENTORY, user.id)
+    )
     result: list[app_commands.Choice[str]] = []
     name: str
     type: ItemType
-    for id, name, type, details in items:
-        details = json.loads(details)
+    for id, name, type, float in items:
         if not name.startswith(unformatted_curret):
             continue
         item_metadatum = bot.item_metadata[name]
         if type == ItemType.Skin:
-            name = f"{item_metadatum.formatted_name} - {details['float']} (ID: {id})"
+            name = f"{item_metadatum.formatted_name} - {float} (ID: {id})"
         elif type == ItemType.Sticker:
             name = f"{item_metadatum.formatted_name} (ID: {id})"
         result.append(
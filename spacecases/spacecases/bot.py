@@ -1,21 +1,47 @@
 import os
+import asyncio
 import discord
 from discord.ext import commands, tasks
 from discord import app_commands
-from spacecases.database import Database, COUNT_USERS
+from spacecases.database import (
+    Database,
+    COUNT_USERS,
+    SYNC_ITEM_METADATA,
+    REPLICA_LAG_CHECK_INTERVAL,
+)
 from spacecases.ui.embed import send_exception_embed
-from marisa_trie import Trie
+from spacecases.inventory_cache import InventoryCache
+from spacecases.coalescer import AutocompleteCoalescer
+from spacecases.search import SearchIndex
+from spacecases.choice_cache import ChoiceCache
+from spacecases.metrics import CacheStats
+from spacecases.metadata_file import MetadataFile, fetch_trusted_checksums
+from spacecases.snapshot import save_snapshot, load_snapshot
+from spacecases.drops import ContainerSampler
+from spacecases.rng import RngProvider
+from spacecases.simulation import ContainerOdds, ContainerSimulator, container_odds
+from spacecases.http_client import HttpClient
+from spacecases.catalogue import (
+    ItemRecord,
+    decode_skin_metadata,
+    decode_sticker_metadata,
+)
 from common import (
-    ItemMetadatum,
     Container,
-    get_skin_metadata,
-    get_sticker_metadata,
-    get_skin_cases,
-    get_souvenir_packages,
-    get_sticker_capsules,
+    SkinCase,
+    SouvenirPackage,
+    StickerCapsule,
+    SKIN_METADATA_PATH,
+    STICKER_METADATA_PATH,
+    SKIN_CASES_METADATA_PATH,
+    SOUVENIR_PACKAGE_METADATA_PATH,
+    STICKER_CAPSULE_METADATA_PATH,
+    METADATA_MANIFEST_PATH,
+    validate_metadata,
     get_logger,
 )
 from spacecases.leaderboard import Leaderboard
+from spacecases.leaderboard_cache import LeaderboardCache
 from typing import Optional
 from contextlib import suppress
 
@@ -63,9 +89,18 @@ class SpaceCasesBot(commands.Bot):
     def __init__(
         self,
         pool: Database,
+        http_client: HttpClient,
         asset_domain: str,
         leaderboards_domain: str,
         owner_id: int,
+        inventory_cache_size: int = 10000,
+        inventory_cache_ttl: float = 300.0,
+        full_metadata_validation: bool = False,
+        metadata_snapshot_path: str = "snapshot/metadata.snapshot",
+        rng_seed: Optional[int] = None,
+        rng_replay_log_path: Optional[str] = None,
+        rng_replay_from_path: Optional[str] = None,
+        leaderboard_cache_size: int = 1000,
     ):
         intents = discord.Intents.default()
         intents.message_content = True
@@ -73,54 +108,225 @@ class SpaceCasesBot(commands.Bot):
             command_prefix="", intents=intents, tree_cls=SpaceCasesCommandTree
         )
         self.db = pool
+        self.http_client = http_client
+        # environment variables
+        self.asset_domain = asset_domain
+        self.leaderboards_domain = leaderboards_domain
+        self.owner_id = owner_id
+        # metadata files, the catalogues below are rebuilt when their versions change.
+        # Items are kept as compact records. Containers are few, so they are always
+        # validated, as their nested entries have no cheaper trusted decoding
+        self.full_metadata_validation = full_metadata_validation
+        self.skin_metadata_file = MetadataFile(
+            self.get_asset_url(SKIN_METADATA_PATH),
+            lambda raw, trusted: decode_skin_metadata(raw, asset_domain, trusted),
+        )
+        self.sticker_metadata_file = MetadataFile(
+            self.get_asset_url(STICKER_METADATA_PATH),
+            lambda raw, trusted: decode_sticker_metadata(raw, asset_domain, trusted),
+        )
+        self.skin_cases_file = MetadataFile(
+            self.get_asset_url(SKIN_CASES_METADATA_PATH),
+            lambda raw, _: validate_metadata(raw, SkinCase),
+        )
+        self.souvenir_packages_file = MetadataFile(
+            self.get_asset_url(SOUVENIR_PACKAGE_METADATA_PATH),
+            lambda raw, _: validate_metadata(raw, SouvenirPackage),
+        )
+        self.sticker_capsules_file = MetadataFile(
+            self.get_asset_url(STICKER_CAPSULE_METADATA_PATH),
+            lambda raw, _: validate_metadata(raw, StickerCapsule),
+        )
+        self.metadata_files: list[MetadataFile] = [
+            self.skin_metadata_file,
+            self.sticker_metadata_file,
+            self.skin_cases_file,
+            self.souvenir_packages_file,
+            self.sticker_capsules_file,
+        ]
+        # the last good metadata files are kept on disk for the next startup
+        self.metadata_snapshot_path = metadata_snapshot_path
+        self.snapshot_digests: tuple[Optional[bytes], ...] = ()
         # items
-        self.item_metadata: dict[str, ItemMetadatum] = {}
+        self.item_metadata_versions = (0, 0)
+        self.item_metadata: dict[str, ItemRecord] = {}
         self.item_unformatted_names: list[str] = []
-        self.item_trie = Trie()
+        self.item_index = SearchIndex([])
+        self.item_choice_cache = ChoiceCache()
+        self.inventory_cache = InventoryCache(inventory_cache_size, inventory_cache_ttl)
+        self.autocomplete_coalescer = AutocompleteCoalescer()
         # containers
+        self.container_versions = (0, 0, 0)
         self.containers: dict[str, Container] = {}
+        self.container_samplers: dict[str, ContainerSampler] = {}
+        # the odds of every container are worked out again on each refresh, as prices move
+        self.container_simulators: dict[str, ContainerSimulator] = {}
+        self.container_odds: dict[str, ContainerOdds] = {}
         self.container_unformatted_names: list[str] = []
-        self.container_trie = Trie()
+        self.container_index = SearchIndex([])
+        self.container_choice_cache = ChoiceCache()
+        # every roll of the dice in commands goes through here, so it can be seeded and replayed
+        self.rng = RngProvider(rng_seed, rng_replay_log_path, rng_replay_from_path)
         # other stuff
         self.command_ids: dict[str, int] = {}
         self.status_int = 0
         self.user_count = 0
-        # environment variables
-        self.asset_domain = asset_domain
-        self.leaderboards_domain = leaderboards_domain
-        self.owner_id = owner_id
         # leaderboards
         self.global_leaderboard = Leaderboard({})
-        self.guild_leaderboards: dict[int, Leaderboard] = {}
+        # guild leaderboards are fetched when first looked at, as most guilds never do
+        self.guild_leaderboards = LeaderboardCache(
+            lambda guild_id: Leaderboard.from_remote_json(
+                self.http_client, self.leaderboards_domain, guild_id
+            ),
+            leaderboard_cache_size,
+        )
 
     def get_asset_url(self, path: str) -> str:
         return os.path.join(self.asset_domain, path)
 
-    async def refresh_item_metadata(self) -> None:
-        skin_metadata = await get_skin_metadata(self.asset_domain)
-        sticker_metadata = await get_sticker_metadata(self.asset_domain)
-        self.item_metadata = skin_metadata | sticker_metadata
-        self.item_unformatted_names = list(skin_metadata.keys()) + list(
+    def cache_stats(self) -> dict[str, CacheStats]:
+        return {
+            "inventory": self.inventory_cache.stats(),
+            "item choices": self.item_choice_cache.stats(),
+            "container choices": self.container_choice_cache.stats(),
+            "guild leaderboards": self.guild_leaderboards.stats(),
+        }
+
+    async def update_item_metadata(self) -> None:
+        """
+        Swap in a new catalogue if either item metadata file was replaced, otherwise
+        sync any patched prices
+        """
+        skin_metadata = self.skin_metadata_file.parsed
+        sticker_metadata = self.sticker_metadata_file.parsed
+        versions = (self.skin_metadata_file.version, self.sticker_metadata_file.version)
+        if versions == self.item_metadata_versions:
+            patched_prices = (
+                self.skin_metadata_file.patched_prices
+                | self.sticker_metadata_file.patched_prices
+            )
+            if patched_prices:
+                await self.db.execute_from_file(
+                    SYNC_ITEM_METADATA,
+                    list(patched_prices.keys()),
+                    list(patched_prices.values()),
+                    [self.item_metadata[name].rarity for name in patched_prices],
+                )
+            return
+
+        item_metadata = skin_metadata | sticker_metadata
+        item_unformatted_names = list(skin_metadata.keys()) + list(
             sticker_metadata.keys()
         )
-        self.item_trie = Trie(self.item_unformatted_names)
-
-    async def refresh_containers(self) -> None:
-        skin_cases = await get_skin_cases(self.asset_domain)
-        souvenir_packages = await get_souvenir_packages(self.asset_domain)
-        sticker_capsules = await get_sticker_capsules(self.asset_domain)
-        self.containers = skin_cases | souvenir_packages | sticker_capsules
-        self.container_unformatted_names = (
+        # building the index for the full catalogue takes a few hundred milliseconds,
+        # so keep it off the event loop
+        item_index = await asyncio.to_thread(SearchIndex, item_unformatted_names)
+        # swap everything in without awaiting in between, so autocomplete never sees
+        # names from one catalogue and metadata or cached choices from another
+        self.item_metadata = item_metadata
+        self.item_unformatted_names = item_unformatted_names
+        self.item_index = item_index
+        self.item_choice_cache.clear()
+        self.item_metadata_versions = versions
+        # the database sorts and values inventories with its own copy of prices and rarities
+        await self.db.execute_from_file(
+            SYNC_ITEM_METADATA,
+            list(self.item_metadata.keys()),
+            [metadatum.price for metadatum in self.item_metadata.values()],
+            [metadatum.rarity for metadatum in self.item_metadata.values()],
+        )
+
+    async def update_containers(self) -> None:
+        """
+        Swap in new containers if any container metadata file was replaced. Containers
+        drop items by key, so this must run after update_item_metadata
+        """
+        versions = (
+            self.skin_cases_file.version,
+            self.souvenir_packages_file.version,
+            self.sticker_capsules_file.version,
+        )
+        if versions == self.container_versions:
+            return
+
+        skin_cases = self.skin_cases_file.parsed
+        souvenir_packages = self.souvenir_packages_file.parsed
+        sticker_capsules = self.sticker_capsules_file.parsed
+        containers = skin_cases | souvenir_packages | sticker_capsules
+        container_unformatted_names = (
             list(skin_cases.keys())
             + list(souvenir_packages.keys())
             + list(sticker_capsules.keys())
         )
-        self.container_trie = Trie(self.container_unformatted_names)
+        container_index = await asyncio.to_thread(
+            SearchIndex, container_unformatted_names
+        )
+        container_samplers = {}
+        container_simulators = {}
+        for name, container in containers.items():
+            try:
+                sampler = ContainerSampler(container)
+                simulator = ContainerSimulator(container)
+            except ValueError:
+                logger.warning(f"Container {name} has nothing to drop")
+                continue
+            # containers without a sampler can't be opened, so nobody is charged for
+            # an item that isn't in the catalogue
+            missing = [
+                key for key in simulator.item_keys if key not in self.item_metadata
+            ]
+            if missing:
+                logger.warning(f"Container {name} drops unknown items: {missing}")
+                continue
+            container_samplers[name] = sampler
+            container_simulators[name] = simulator
+        self.containers = containers
+        self.container_samplers = container_samplers
+        self.container_simulators = container_simulators
+        self.container_unformatted_names = container_unformatted_names
+        self.container_index = container_index
+        self.container_choice_cache.clear()
+        self.container_versions = versions
+
+    def update_container_odds(self) -> None:
+        item_prices = {
+            name: record.price for name, record in self.item_metadata.items()
+        }
+        self.container_odds = container_odds(self.container_simulators, item_prices)
+
+    async def refresh_data(self) -> None:
+        if self.full_metadata_validation:
+            trusted_checksums = {}
+        else:
+            trusted_checksums = await fetch_trusted_checksums(
+                self.http_client, self.get_asset_url(METADATA_MANIFEST_PATH)
+            )
+        # every file is downloaded and parsed at once, price changes are patched onto the
+        # records already in use
+        await asyncio.gather(
+            *(
+                file.refresh(self.http_client, trusted_checksums)
+                for file in self.metadata_files
+            )
+        )
+        # but items go live before the containers that drop them, or a container naming
+        # a new item could be opened before the item is known
+        await self.update_item_metadata()
+        await self.update_containers()
+        digests = tuple(file.digest for file in self.metadata_files)
+        if digests != self.snapshot_digests:
+            snapshots = [file.snapshot() for file in self.metadata_files]
+            await asyncio.to_thread(
+                save_snapshot,
+                self.metadata_snapshot_path,
+                [snapshot for snapshot in snapshots if snapshot is not None],
+            )
+            self.snapshot_digests = digests
+        self.update_container_odds()
 
     @tasks.loop(minutes=15)
     async def refresh_data_loop(self) -> None:
-        await self.refresh_item_metadata()
-        await self.refresh_containers()
+        await self.refresh_data()
 
     @tasks.loop(seconds=10)
     async def bot_status_loop(self) -> None:
@@ -138,17 +344,19 @@ class SpaceCasesBot(commands.Bot):
             case _:
                 raise ValueError("Invalid status int")
 
+    @tasks.loop(seconds=REPLICA_LAG_CHECK_INTERVAL)
+    async def replica_lag_loop(self) -> None:
+        await self.db.check_replica_lag()
+
     @tasks.loop(minutes=5)
     async def refresh_leaderboards_loop(self) -> None:
         self.global_leaderboard = await Leaderboard.from_remote_json(
-            self.leaderboards_domain
+            self.http_client, self.leaderboards_domain
         )
-        async for guild in self.fetch_guilds():
-            self.guild_leaderboards[guild.id] = await Leaderboard.from_remote_json(
-                self.leaderboards_domain, guild.id
-            )
 
     async def close(self) -> None:
+        self.rng.close()
+        self.guild_leaderboards.close()
         if self.user:
             logger.info(f"Goodbye from {self.user}")
         else:
@@ -159,9 +367,25 @@ class SpaceCasesBot(commands.Bot):
         await self._load_cogs()
         for command in await self.tree.fetch_commands():
             self.command_ids[command.name] = command.id
+        # commands are only received once this returns, so make sure the catalogue is
+        # filled, from the local snapshot when there is one, so startup is fast and
+        # works while the asset domain is unreachable
+        if load_snapshot(
+            self.metadata_snapshot_path,
+            self.metadata_files,
+            trusted=not self.full_metadata_validation,
+        ):
+            await self.update_item_metadata()
+            await self.update_containers()
+            self.update_container_odds()
+            self.snapshot_digests = tuple(file.digest for file in self.metadata_files)
+        else:
+            await self.refresh_data()
         self.refresh_data_loop.start()
         self.refresh_leaderboards_loop.start()
         self.bot_status_loop.start()
+        if self.db.replica_pool is not None:
+            self.replica_lag_loop.start()
 
     async def sync_commands(self, guild_id: Optional[int]) -> None:
         if guild_id is not None:
@@ -0,0 +1,181 @@
+import os
+from typing import Any, Optional
+from common import (
+    Condition,
+    Rarity,
+    SkinMetadatum,
+    StickerMetadatum,
+    validate_metadata,
+)
+
+# where the asset service puts an item's image, named after its unformatted name
+IMAGE_PATH = os.path.join("generated", "images", "unformatted")
+
+# enum members by value, much cheaper to look up than calling the enum
+_RARITIES = {rarity.value: rarity for rarity in Rarity}
+_CONDITIONS = {condition.value: condition for condition in Condition}
+
+
+class _Interner:
+    """
+    Hands out one shared object per distinct value. Every wear, StatTrak and souvenir
+    variant of a skin repeats its description and float range, and the JSON decoder makes
+    a new object for each repeat
+    """
+
+    def __init__(self) -> None:
+        self.values: dict[Any, Any] = {}
+
+    def __call__[T](self, value: T) -> T:
+        return self.values.setdefault(value, value)
+
+
+class _ItemRecord:
+    __slots__ = (
+        "unformatted_name",
+        "formatted_name",
+        "rarity",
+        "price",
+        "_image_url_prefix",
+        "_image_url",
+    )
+
+    def __init__(
+        self,
+        unformatted_name: str,
+        formatted_name: str,
+        rarity: Rarity,
+        price: int,
+        image_url: str,
+        image_url_prefix: str,
+    ) -> None:
+        self.unformatted_name = unformatted_name
+        self.formatted_name = formatted_name
+        self.rarity = rarity
+        self.price = price
+        # URLs following the asset service's layout are derived from the shared prefix
+        # rather than stored
+        if image_url == f"{image_url_prefix}{unformatted_name}.png":
+            self._image_url_prefix: Optional[str] = image_url_prefix
+            self._image_url: Optional[str] = None
+        else:
+            self._image_url_prefix = None
+            self._image_url = image_url
+
+    @property
+    def image_url(self) -> str:
+        if self._image_url_prefix is None:
+            assert self._image_url is not None
+            return self._image_url
+        return f"{self._image_url_prefix}{self.unformatted_name}.png"
+
+
+class SkinRecord(_ItemRecord):
+    """The fields of a SkinMetadatum in a fraction of the memory"""
+
+    __slots__ = ("condition", "description", "min_float", "max_float")
+
+    def __init__(
+        self,
+        unformatted_name: str,
+        formatted_name: str,
+        rarity: Rarity,
+        price: int,
+        image_url: str,
+        image_url_prefix: str,
+        condition: Condition,
+        description: Optional[str],
+        min_float: float,
+        max_float: float,
+    ) -> None:
+        super().__init__(
+            unformatted_name, formatted_name, rarity, price, image_url, image_url_prefix
+        )
+        self.condition = condition
+        self.description = description
+        self.min_float = min_float
+        self.max_float = max_float
+
+
+class StickerRecord(_ItemRecord):
+    """The fields of a StickerMetadatum in a fraction of the memory"""
+
+    __slots__ = ()
+
+
+type ItemRecord = SkinRecord | StickerRecord
+
+
+def get_image_url_prefix(asset_domain: str) -> str:
+    return os.path.join(asset_domain, IMAGE_PATH, "")
+
+
+def decode_skin_metadata(
+    raw_json: dict[str, Any], asset_domain: str, trusted: bool
+) -> dict[str, SkinRecord]:
+    """
+    Trusted files were generated and validated by the asset service for this schema
+    version, so their entries are read as they are rather than validated again
+    """
+    image_url_prefix = get_image_url_prefix(asset_domain)
+    intern = _Interner()
+    if trusted:
+        return {
+            name: SkinRecord(
+                name,
+                value["formatted_name"],
+                _RARITIES[value["rarity"]],
+                value["price"],
+                value["image_url"],
+                image_url_prefix,
+                _CONDITIONS[value["condition"]],
+                intern(value["description"]),
+                intern(value["min_float"]),
+                intern(value["max_float"]),
+            )
+            for name, value in raw_json.items()
+        }
+    return {
+        name: SkinRecord(
+            name,
+            metadatum.formatted_name,
+            metadatum.rarity,
+            metadatum.price,
+            metadatum.image_url,
+            image_url_prefix,
+            metadatum.condition,
+            intern(metadatum.description),
+            intern(metadatum.min_float),
+            intern(metadatum.max_float),
+        )
+        for name, metadatum in validate_metadata(raw_json, SkinMetadatum).items()
+    }
+
+
+def decode_sticker_metadata(
+    raw_json: dict[str, Any], asset_domain: str, trusted: bool
+) -> dict[str, StickerRecord]:
+    image_url_prefix = get_image_url_prefix(asset_domain)
+    if trusted:
+        return {
+            name: StickerRecord(
+                name,
+                value["formatted_name"],
+                _RARITIES[value["rarity"]],
+                value["price"],
+                value["image_url"],
+                image_url_prefix,
+            )
+            for name, value in raw_json.items()
+        }
+    return {
+        name: StickerRecord(
+            name,
+            metadatum.formatted_name,
+            metadatum.rarity,
+            metadatum.price,
+            metadatum.image_url,
+            image_url_prefix,
+        )
+        for name, metadatum in validate_metadata(raw_json, StickerMetadatum).items()
+    }
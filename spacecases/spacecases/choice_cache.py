@@ -0,0 +1,58 @@
+import sys
+from collections import OrderedDict
+from typing import Optional
+from discord import app_commands
+from spacecases.metrics import CacheStats
+
+
+class ChoiceCache:
+    """
+    Autocomplete choices for the most recently typed inputs, least recently used first
+    out once max_size is reached. Choices depend on the catalogue, so the cache must be
+    cleared whenever a new catalogue is swapped in.
+    """
+
+    def __init__(self, max_size: int = 1024) -> None:
+        self.max_size = max_size
+        self.entries: OrderedDict[str, list[app_commands.Choice[str]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, input: str) -> Optional[list[app_commands.Choice[str]]]:
+        choices = self.entries.get(input)
+        if choices is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(input)
+        self.hits += 1
+        return choices
+
+    def put(self, input: str, choices: list[app_commands.Choice[str]]) -> None:
+        self.entries[input] = choices
+        self.entries.move_to_end(input)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def memory_usage(self) -> int:
+        """Approximate bytes held, choice names and values are shared with the catalogue"""
+        total = sys.getsizeof(self.entries)
+        for input, choices in self.entries.items():
+            total += sys.getsizeof(input) + sys.getsizeof(choices)
+            total += sum(map(sys.getsizeof, choices))
+        return total
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            size=len(self.entries),
+            hits=self.hits,
+            misses=self.misses,
+            coalesced=0,
+            evictions=self.evictions,
+            expirations=0,
+            memory_bytes=self.memory_usage(),
+        )
@@ -0,0 +1,74 @@
+import asyncio
+import discord
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Awaitable, Callable
+from spacecases.metrics import CoalescerStats
+
+
+@dataclass
+class _InFlight:
+    inputs: tuple[tuple[str, Any], ...]
+    task: asyncio.Future[Any]
+
+
+class AutocompleteCoalescer:
+    """
+    Discord sends an autocomplete interaction for every character typed, so a user
+    typing quickly has several lookups for the same option in flight at once. This keeps
+    at most one running per user and option. A request with the same option values joins
+    the lookup in flight, while a request with different values cancels it, and whoever
+    was waiting on the old lookup gets no choices, as Discord only shows the newest
+    response.
+
+    Lookups are cancelled, so any database work they share with other requests must be
+    shielded, as the inventory cache does.
+    """
+
+    def __init__(self) -> None:
+        self.in_flight: dict[tuple[int, str], _InFlight] = {}
+        self.requests = 0
+        self.coalesced = 0
+        self.superseded = 0
+
+    async def run[T](
+        self,
+        interaction: discord.Interaction,
+        option: str,
+        lookup: Callable[[], Awaitable[list[T]]],
+    ) -> list[T]:
+        key = (interaction.user.id, option)
+        # every option typed so far, as other options can change the choices
+        inputs = tuple(interaction.namespace)
+        self.requests += 1
+        in_flight = self.in_flight.get(key)
+        if in_flight is not None and in_flight.inputs == inputs:
+            self.coalesced += 1
+            task = in_flight.task
+        else:
+            if in_flight is not None:
+                in_flight.task.cancel()
+                self.superseded += 1
+            task = asyncio.ensure_future(lookup())
+            self.in_flight[key] = _InFlight(inputs, task)
+            task.add_done_callback(partial(self._done, key))
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # the lookup was superseded, rather than this request being cancelled
+            current_task = asyncio.current_task()
+            if current_task is not None and current_task.cancelling() == 0:
+                return []
+            raise
+
+    def _done(self, key: tuple[int, str], task: asyncio.Future[Any]) -> None:
+        in_flight = self.in_flight.get(key)
+        if in_flight is not None and in_flight.task is task:
+            del self.in_flight[key]
+
+    def stats(self) -> CoalescerStats:
+        return CoalescerStats(
+            requests=self.requests,
+            coalesced=self.coalesced,
+            superseded=self.superseded,
+        )
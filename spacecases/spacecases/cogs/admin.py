@@ -2,6 +2,8 @@ import discord
 from discord.ext import commands
 from spacecases.bot import SpaceCasesBot
 from spacecases.commands.admin.sync import sync, SyncType
+from spacecases.commands.admin.metrics import metrics, MetricsFormat
+from spacecases.commands.admin.item_counts import item_counts
 from typing import cast
 
 
@@ -22,6 +24,33 @@ class Admin(commands.Cog):
         value = cast(SyncType, type.value)
         await sync(self.bot, interaction, value)
 
+    @discord.app_commands.command(
+        name="metrics", description="View database query and pool metrics"
+    )
+    @discord.app_commands.choices(
+        format=[
+            discord.app_commands.Choice(name="Summary", value="summary"),
+            discord.app_commands.Choice(name="Prometheus", value="prometheus"),
+        ]
+    )
+    async def metrics(
+        self,
+        interaction: discord.Interaction,
+        format: discord.app_commands.Choice[str],
+    ) -> None:
+        value = cast(MetricsFormat, format.value)
+        await metrics(self.bot, interaction, value)
+
+    @discord.app_commands.command(
+        name="itemcounts",
+        description="Check every user's stored item count against their items",
+    )
+    @discord.app_commands.describe(repair="Recount and fix any inconsistent users")
+    async def item_counts(
+        self, interaction: discord.Interaction, repair: bool = False
+    ) -> None:
+        await item_counts(self.bot, interaction, repair)
+
 
 async def setup(bot: SpaceCasesBot) -> None:
     await bot.add_cog(Admin(bot))
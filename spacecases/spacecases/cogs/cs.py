@@ -1,9 +1,11 @@
 import discord
+from functools import partial
 from discord.ext import commands
 from spacecases.bot import SpaceCasesBot
 from spacecases.commands.cs.item import item, item_name_autocomplete
-from spacecases.commands.cs.open import open, open_name_autocomplete
+from spacecases.commands.cs.open import open, open_name_autocomplete, MAX_OPEN_AMOUNT
 from spacecases.commands.cs.containers import containers
+from spacecases.commands.cs.odds import odds
 from spacecases.commands.cs.upgrade import upgrade
 from spacecases.autocomplete import inventory_item_autocomplete
 from typing import Optional
@@ -20,20 +22,53 @@ class Unbox(commands.Cog):
 
     @item.autocomplete("name")
     async def item_autocomplete(
-        self, _: discord.Interaction, current: str
+        self, interaction: discord.Interaction, current: str
     ) -> list[discord.app_commands.Choice]:
-        return await item_name_autocomplete(self.bot, current)
+        return await self.bot.autocomplete_coalescer.run(
+            interaction,
+            "item.name",
+            partial(item_name_autocomplete, self.bot, current),
+        )
 
     @discord.app_commands.command(name="open", description="Open a container")
-    @discord.app_commands.describe(name="Name of the container you want to open")
-    async def open(self, interaction: discord.Interaction, name: str) -> None:
-        await open(self.bot, interaction, name)
+    @discord.app_commands.describe(
+        name="Name of the container you want to open",
+        amount="How many to open at once",
+    )
+    async def open(
+        self,
+        interaction: discord.Interaction,
+        name: str,
+        amount: discord.app_commands.Range[int, 1, MAX_OPEN_AMOUNT] = 1,
+    ) -> None:
+        await open(self.bot, interaction, name, amount)
 
     @open.autocomplete("name")
     async def open_autocomplete(
-        self, _: discord.Interaction, current: str
+        self, interaction: discord.Interaction, current: str
     ) -> list[discord.app_commands.Choice]:
-        return await open_name_autocomplete(self.bot, current)
+        return await self.bot.autocomplete_coalescer.run(
+            interaction,
+            "open.name",
+            partial(open_name_autocomplete, self.bot, current),
+        )
+
+    @discord.app_commands.command(
+        name="odds", description="View the expected value of opening a container"
+    )
+    @discord.app_commands.describe(name="Name of the container you want the odds of")
+    async def odds(self, interaction: discord.Interaction, name: str) -> None:
+        await odds(self.bot, interaction, name)
+
+    @odds.autocomplete("name")
+    async def odds_autocomplete(
+        self, interaction: discord.Interaction, current: str
+    ) -> list[discord.app_commands.Choice]:
+        return await self.bot.autocomplete_coalescer.run(
+            interaction,
+            "odds.name",
+            partial(open_name_autocomplete, self.bot, current),
+        )
 
     @discord.app_commands.command(
         name="containers", description="View all available containers"
@@ -70,13 +105,21 @@ class Unbox(commands.Cog):
     async def upgrade_item_id_autocomplete(
         self, interaction: discord.Interaction, current: str
     ) -> list[discord.app_commands.Choice]:
-        return await inventory_item_autocomplete(self.bot, interaction.user, current)
+        return await self.bot.autocomplete_coalescer.run(
+            interaction,
+            "upgrade.item_id",
+            partial(inventory_item_autocomplete, self.bot, interaction.user, current),
+        )
 
     @upgrade.autocomplete("target_item")
     async def upgrade_target_item_autocomplete(
-        self, _: discord.Interaction, current: str
+        self, interaction: discord.Interaction, current: str
     ) -> list[discord.app_commands.Choice]:
-        return await item_name_autocomplete(self.bot, current)
+        return await self.bot.autocomplete_coalescer.run(
+            interaction,
+            "upgrade.target_item",
+            partial(item_name_autocomplete, self.bot, current),
+        )
 
 
 async def setup(bot: SpaceCasesBot) -> None:
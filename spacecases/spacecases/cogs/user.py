@@ -1,4 +1,5 @@
 import discord
+from functools import partial
 from discord.ext import commands
 from spacecases.bot import SpaceCasesBot
 from spacecases.commands.user.close import close
@@ -61,20 +62,26 @@ class User(commands.Cog):
     @discord.app_commands.describe(
         user="The user whose inventory you want to view.",
         item_id="The id of the specific item to inspect in the user's inventory.",
+        sort="How to order the items in the inventory.",
     )
     async def inventory(
         self,
         interaction: discord.Interaction,
         user: Optional[discord.User],
         item_id: Optional[int],
+        sort: Literal["id", "price", "rarity"] = "id",
     ) -> None:
-        await inventory.inventory(self.bot, interaction, user, item_id)
+        await inventory.inventory(self.bot, interaction, user, item_id, sort)
 
     @inventory.autocomplete("item_id")
     async def inventory_item_id_autocomplete(
         self, interaction: discord.Interaction, current: str
     ) -> list[discord.app_commands.Choice]:
-        return await inventory.item_id_autocomplete(self.bot, interaction, current)
+        return await self.bot.autocomplete_coalescer.run(
+            interaction,
+            "inventory.item_id",
+            partial(inventory.item_id_autocomplete, self.bot, interaction, current),
+        )
 
     @discord.app_commands.command(
         name="sell",
@@ -90,7 +97,11 @@ class User(commands.Cog):
     async def sell_item_id_autocomplete(
         self, interaction: discord.Interaction, current: str
     ) -> list[discord.app_commands.Choice]:
-        return await sell.item_id_autocomplete(self.bot, interaction, current)
+        return await self.bot.autocomplete_coalescer.run(
+            interaction,
+            "sell.item_id",
+            partial(sell.item_id_autocomplete, self.bot, interaction, current),
+        )
 
     @discord.app_commands.command(
         name="leaderboard",
@@ -0,0 +1,50 @@
+import discord
+from spacecases.bot import SpaceCasesBot
+from spacecases.database import CHECK_ITEM_COUNTS, LOCK_ITEMS_SHARE, REPAIR_ITEM_COUNTS
+from spacecases.ui.embed import send_err_embed, send_success_embed
+
+# mismatched users listed in the response
+MAX_LISTED_USERS = 20
+
+
+async def item_counts(
+    bot: SpaceCasesBot, interaction: discord.Interaction, repair: bool
+) -> None:
+    if interaction.user.id != bot.owner_id:
+        await send_err_embed(
+            interaction, "You do **not** have permission to use this command."
+        )
+        return
+
+    if repair:
+        async with bot.db.acquire() as connection:
+            async with connection.transaction():
+                # stop items changing while they are recounted
+                await bot.db.execute_from_file_with_connection(
+                    LOCK_ITEMS_SHARE, connection
+                )
+                rows = await bot.db.fetch_from_file_with_connection(
+                    REPAIR_ITEM_COUNTS, connection
+                )
+        await send_success_embed(
+            interaction, f"Repaired item counts for **{len(rows)}** users", True
+        )
+        return
+
+    rows = await bot.db.fetch_from_file(CHECK_ITEM_COUNTS)
+    if len(rows) == 0:
+        await send_success_embed(
+            interaction, "All item counts are **consistent**", True
+        )
+        return
+    lines = [
+        f"`{row['id']}`: stored **{row['item_count']}**, actual **{row['actual_item_count']}**"
+        for row in rows[:MAX_LISTED_USERS]
+    ]
+    if len(rows) > MAX_LISTED_USERS:
+        lines.append(f"...and **{len(rows) - MAX_LISTED_USERS}** more")
+    await send_err_embed(
+        interaction,
+        f"**{len(rows)}** users have inconsistent item counts\n" + "\n".join(lines),
+        True,
+    )
@@ -0,0 +1,83 @@
+import io
+import discord
+from spacecases.bot import SpaceCasesBot
+from spacecases.metrics import to_prometheus
+from spacecases.ui.embed import send_err_embed
+from typing import Literal
+
+type MetricsFormat = Literal["summary"] | Literal["prometheus"]
+
+# slowest queries shown in the summary embed
+MAX_SUMMARY_QUERIES = 15
+
+
+def format_milliseconds(seconds: float) -> str:
+    return f"{seconds * 1000:.2f}"
+
+
+async def metrics(
+    bot: SpaceCasesBot, interaction: discord.Interaction, format: MetricsFormat
+) -> None:
+    if interaction.user.id != bot.owner_id:
+        await send_err_embed(
+            interaction, "You do **not** have permission to use this command."
+        )
+        return
+
+    pool_stats = bot.db.pool_stats()
+    if format == "prometheus":
+        dump = to_prometheus(
+            bot.db.metrics,
+            pool_stats,
+            bot.db.replica_lag,
+            bot.cache_stats(),
+            bot.autocomplete_coalescer.stats(),
+        )
+        await interaction.response.send_message(
+            file=discord.File(io.BytesIO(dump.encode()), filename="metrics.txt"),
+            ephemeral=True,
+        )
+        return
+
+    e = discord.Embed(title="Database Metrics (ms)", color=discord.Color.dark_theme())
+    e.add_field(
+        name="Pool",
+        value=f"Size: **{pool_stats.size}**\nIdle: **{pool_stats.idle}**\nAcquired: **{pool_stats.acquired}**",
+    )
+    e.add_field(
+        name="Pool Wait",
+        value=f"Mean: **{format_milliseconds(pool_stats.mean_wait_time)}**\nMax: **{format_milliseconds(pool_stats.max_wait_time)}**\nAcquires: **{pool_stats.acquires}**",
+    )
+    if bot.db.replica_pool is not None:
+        lag = "unknown" if bot.db.replica_lag is None else f"{bot.db.replica_lag:.2f}s"
+        status = "Serving reads" if bot.db.replica_healthy else "**Not** serving reads"
+        e.add_field(name="Read Replica", value=f"{status}\nLag: **{lag}**")
+    for name, stats in bot.cache_stats().items():
+        e.add_field(
+            name=f"{name.title()} Cache",
+            value=f"Hit Rate: **{stats.hit_rate:.1%}**\nShared Loads: **{stats.coalesced}**\nEntries: **{stats.size}**\nMemory: **{stats.memory_bytes / 1024:.0f} KiB**",
+        )
+    autocomplete = bot.autocomplete_coalescer.stats()
+    e.add_field(
+        name="Autocomplete",
+        value=f"Requests: **{autocomplete.requests}**\nShared: **{autocomplete.coalesced}**\nSuperseded: **{autocomplete.superseded}**",
+    )
+    execution_times = sorted(
+        bot.db.metrics.execution_time.items(),
+        key=lambda item: item[1].quantile(0.99),
+        reverse=True,
+    )[:MAX_SUMMARY_QUERIES]
+    lines = []
+    for query, histogram in execution_times:
+        wait = bot.db.metrics.pool_wait_time.get(query)
+        wait_p99 = format_milliseconds(wait.quantile(0.99)) if wait else "-"
+        lines.append(
+            f"`{query}` ({histogram.count})\n"
+            f"p50 **{format_milliseconds(histogram.quantile(0.5))}** "
+            f"p95 **{format_milliseconds(histogram.quantile(0.95))}** "
+            f"p99 **{format_milliseconds(histogram.quantile(0.99))}** "
+            f"wait p99 **{wait_p99}**"
+        )
+    # field values are capped at 1024 characters, so queries go in the description
+    e.description = "\n".join(lines) if lines else "No queries run yet"
+    await interaction.response.send_message(embed=e, ephemeral=True)
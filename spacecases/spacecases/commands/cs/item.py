@@ -1,15 +1,11 @@
 import discord
 import random
-from itertools import islice
 from spacecases.bot import SpaceCasesBot
 from spacecases.strutils import currency_str_format
 from spacecases.exceptions import ItemDoesNotExistError
 from spacecases.ui.embed import get_rarity_embed_color
-from common import (
-    remove_skin_name_formatting,
-    SkinMetadatum,
-    StickerMetadatum,
-)
+from spacecases.catalogue import SkinRecord, StickerRecord
+from common import remove_skin_name_formatting
 
 
 async def item(bot: SpaceCasesBot, interaction: discord.Interaction, name: str) -> None:
@@ -29,7 +25,7 @@ async def item(bot: SpaceCasesBot, interaction: discord.Interaction, name: str)
     e.set_image(url=item_metadata.image_url)
     e.add_field(name="Price", value=currency_str_format(item_metadata.price))
     # if its a skin, it has a rarity and float range
-    if isinstance(item_metadata, SkinMetadatum):
+    if isinstance(item_metadata, SkinRecord):
         e.add_field(name="Rarity", value=item_metadata.rarity.get_name_for_skin())
         e.add_field(
             name="Float Range",
@@ -37,7 +33,7 @@ async def item(bot: SpaceCasesBot, interaction: discord.Interaction, name: str)
         )
         e.description = item_metadata.description
     # if its a sticker, only a rarity
-    elif isinstance(item_metadata, StickerMetadatum):
+    elif isinstance(item_metadata, StickerRecord):
         e.add_field(
             name="Rarity", value=item_metadata.rarity.get_name_for_regular_item()
         )
@@ -49,14 +45,22 @@ async def item_name_autocomplete(
 ) -> list[discord.app_commands.Choice]:
     unformatted_current = remove_skin_name_formatting(current)
     if len(unformatted_current) == 0:
-        options = random.sample(bot.item_unformatted_names, 25)
-    else:
-        options = list(islice(bot.item_trie.keys(unformatted_current), 25))
+        return item_choices(bot, random.sample(bot.item_unformatted_names, 25))
 
-    return [
-        discord.app_commands.Choice(
-            name=bot.item_metadata[unformatted_name].formatted_name,
-            value=bot.item_metadata[unformatted_name].formatted_name,
+    choices = bot.item_choice_cache.get(unformatted_current)
+    if choices is None:
+        choices = item_choices(bot, bot.item_index.search(unformatted_current))
+        bot.item_choice_cache.put(unformatted_current, choices)
+    return choices
+
+
+def item_choices(
+    bot: SpaceCasesBot, unformatted_names: list[str]
+) -> list[discord.app_commands.Choice[str]]:
+    choices = []
+    for unformatted_name in unformatted_names:
+        formatted_name = bot.item_metadata[unformatted_name].formatted_name
+        choices.append(
+            discord.app_commands.Choice(name=formatted_name, value=formatted_name)
         )
-        for unformatted_name in options
-    ]
+    return choices
@@ -0,0 +1,52 @@
+import discord
+from spacecases.bot import SpaceCasesBot
+from spacecases.strutils import currency_str_format
+from spacecases.exceptions import ContainerDoesNotExistError
+from spacecases.ui.embed import send_err_embed
+from common import remove_skin_name_formatting
+
+
+def signed_currency_str_format(amount: int) -> str:
+    if amount < 0:
+        return f"-{currency_str_format(-amount)}"
+    return currency_str_format(amount)
+
+
+async def odds(bot: SpaceCasesBot, interaction: discord.Interaction, name: str) -> None:
+    container_unformatted_name = remove_skin_name_formatting(name)
+    try:
+        container = bot.containers[container_unformatted_name]
+    except KeyError:
+        raise ContainerDoesNotExistError(name)
+
+    container_odds = bot.container_odds.get(container_unformatted_name)
+    if container_odds is None:
+        await send_err_embed(
+            interaction,
+            f"The odds for **{container.formatted_name}** haven't been worked out yet, try again soon!",
+        )
+        return
+
+    e = discord.Embed(
+        title=f"{container.formatted_name} - Odds", color=discord.Color.dark_theme()
+    )
+    e.set_thumbnail(url=container.image_url)
+    e.add_field(name="Cost", value=currency_str_format(container_odds.cost))
+    e.add_field(
+        name="Expected Value",
+        value=currency_str_format(round(container_odds.expected_value)),
+    )
+    e.add_field(
+        name="Expected Return",
+        value=signed_currency_str_format(round(container_odds.expected_return)),
+    )
+    e.add_field(
+        name="Standard Deviation",
+        value=currency_str_format(round(container_odds.standard_deviation)),
+    )
+    e.add_field(
+        name="Chance of Profit",
+        value=f"{container_odds.profit_probability:.2%}",
+    )
+    e.set_footer(text="Worked out from current prices, which update every 15 minutes")
+    await interaction.response.send_message(embed=e)
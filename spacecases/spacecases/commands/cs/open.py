@@ -1,14 +1,12 @@
-import json
 import discord
 import random
+from itertools import batched
 from typing import Optional
-from itertools import islice
 from spacecases.bot import SpaceCasesBot
 from spacecases.database import (
-    ADD_ITEM,
-    DOES_USER_EXIST_FOR_UPDATE,
-    LOCK_ITEMS,
-    CHANGE_BALANCE,
+    GRANT_ITEM,
+    OPEN_CONTAINERS,
+    SELL_UNBOXED_ITEM,
     TRY_DEDUCT_BALANCE,
 )
 from spacecases.ui.embed import get_rarity_embed_color, send_err_embed
@@ -22,16 +20,16 @@ from spacecases.exceptions import (
 )
 from common import (
     remove_skin_name_formatting,
-    SkinContainerEntry,
-    ItemContainerEntry,
-    PhaseGroup,
-    SkinCase,
-    SouvenirPackage,
-    SkinMetadatum,
-    StickerMetadatum,
-    ItemMetadatum,
+    ItemType,
     Container,
 )
+from spacecases.catalogue import ItemRecord, SkinRecord, StickerRecord
+from spacecases.drops import ContainerSampler, Drop
+
+# most containers one /open can open
+MAX_OPEN_AMOUNT = 50
+# unboxed items listed on each page of a bulk open's summary
+ITEMS_PER_PAGE = 10
 
 
 class OpenView(SpaceCasesView):
@@ -40,7 +38,7 @@ class OpenView(SpaceCasesView):
         interaction: discord.Interaction,
         bot: SpaceCasesBot,
         container: Container,
-        item: ItemMetadatum,
+        item: ItemRecord,
         item_unformatted_name: str,
         float: Optional[float],
     ):
@@ -63,55 +61,44 @@ class OpenView(SpaceCasesView):
             return
 
         match self.item:
-            case SkinMetadatum():
+            case SkinRecord():
                 args = (
                     self.interaction.user.id,
                     "skin",
                     self.item_unformatted_name,
-                    json.dumps({"float": self.float}),
+                    self.float,
                 )
-            case StickerMetadatum():
+            case StickerRecord():
                 args = (
                     self.interaction.user.id,
                     "sticker",
                     self.item_unformatted_name,
-                    json.dumps({}),
+                    None,
                 )
 
-        async with self.bot.db.pool.acquire() as connection:
-            async with connection.transaction():
-                # check we exist
-                rows = await self.bot.db.fetch_from_file_with_connection(
-                    DOES_USER_EXIST_FOR_UPDATE,
-                    connection,
-                    interaction.user.id,
-                )
-                if not rows[0]["exists"]:
-                    raise UserNotRegisteredError(interaction.user)
+        # lock our row, check capacity and insert in one round trip
+        registered, item_id = (await self.bot.db.fetch_from_file(GRANT_ITEM, *args))[0]
+        if not registered:
+            raise UserNotRegisteredError(interaction.user)
 
-                # lock the items
-                await self.bot.db.execute_from_file_with_connection(
-                    LOCK_ITEMS, connection
-                )
-                # add item
-                rows = await self.bot.db.fetch_from_file_with_connection(
-                    ADD_ITEM,
-                    connection,
-                    *args,
-                )
-                # no space
-                if len(rows) == 0:
-                    await send_err_embed(
-                        interaction,
-                        "You don't have enough inventory space for this action!",
-                        ephemeral=True,
-                    )
-                    return
+        # no space
+        if item_id is None:
+            await send_err_embed(
+                interaction,
+                "You don't have enough inventory space for this action!",
+                ephemeral=True,
+            )
+            return
+
+        self.bot.inventory_cache.add_item(
+            interaction.user.id,
+            (item_id, self.item_unformatted_name, ItemType(args[1]), self.float),
+        )
 
         message = await self.interaction.original_response()
         e = discord.Embed(title=self.item.formatted_name, color=discord.Color.green())
         e.add_field(name="Price", value=currency_str_format(self.item.price))
-        if isinstance(self.item, SkinMetadatum):
+        if isinstance(self.item, SkinRecord):
             e.description = self.item.description
             e.add_field(name="Float", value=str(self.float))
         e.set_image(url=self.item.image_url)
@@ -124,16 +111,16 @@ class OpenView(SpaceCasesView):
 
     async def sell(self, give_up: bool) -> bool:
         rows = await self.bot.db.fetch_from_file(
-            CHANGE_BALANCE, self.interaction.user.id, self.item.price
+            SELL_UNBOXED_ITEM, self.interaction.user.id, self.item.price
         )
-        if len(rows) == 0 and not give_up:
+        if rows[0]["balance"] is None and not give_up:
             return False
         message = await self.interaction.original_response()
         e = discord.Embed(
             title=f"{self.item.formatted_name} - Sold!", color=discord.Color.dark_grey()
         )
         e.add_field(name="Price", value=currency_str_format(self.item.price))
-        if isinstance(self.item, SkinMetadatum):
+        if isinstance(self.item, SkinRecord):
             e.description = self.item.description
             e.add_field(name="Float", value=str(self.float))
         e.set_image(url=self.item.image_url)
@@ -162,15 +149,148 @@ class OpenView(SpaceCasesView):
         await self.sell(give_up=True)
 
 
+class BulkOpenView(SpaceCasesView):
+    def __init__(
+        self,
+        interaction: discord.Interaction,
+        summary: discord.Embed,
+        pages: list[list[str]],
+    ):
+        super().__init__(timeout=30)
+        self.interaction = interaction
+        self.owner_id = interaction.user.id
+        self.summary = summary
+        self.pages = pages
+        self.current_page = 0
+
+    @discord.ui.button(emoji="◀", style=discord.ButtonStyle.gray)
+    async def left_arrow_callback(
+        self, interaction: discord.Interaction, button: discord.ui.Button
+    ) -> None:
+        if interaction.user.id != self.owner_id:
+            await send_err_embed(interaction, "This is not your button!", True)
+            return
+        self.current_page = (self.current_page - 1) % len(self.pages)
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    @discord.ui.button(emoji="▶", style=discord.ButtonStyle.gray)
+    async def right_arrow_callback(
+        self, interaction: discord.Interaction, button: discord.ui.Button
+    ) -> None:
+        if interaction.user.id != self.owner_id:
+            await send_err_embed(interaction, "This is not your button!", True)
+            return
+        self.current_page = (self.current_page + 1) % len(self.pages)
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    def build_embed(self) -> discord.Embed:
+        e = self.summary.copy()
+        e.description = "\n".join(self.pages[self.current_page])
+        e.set_footer(text=f"Page {self.current_page + 1} / {len(self.pages)}")
+        return e
+
+    async def on_timeout(self) -> None:
+        for item in self.children:
+            if isinstance(item, discord.ui.Button):
+                item.disabled = True
+        await self.interaction.edit_original_response(view=self)
+
+
+def get_item_type(item: ItemRecord) -> ItemType:
+    match item:
+        case SkinRecord():
+            return ItemType.Skin
+        case StickerRecord():
+            return ItemType.Sticker
+
+
+def format_unboxed_item(item: ItemRecord, drop: Drop, item_id: Optional[int]) -> str:
+    line = f"• {item.formatted_name} - **{currency_str_format(item.price)}**"
+    if drop.float is not None:
+        line += f" ({drop.float:.6f})"
+    if item_id is None:
+        return f"{line} - Sold"
+    return f"{line} - ID {item_id}"
+
+
+async def open_many(
+    bot: SpaceCasesBot,
+    interaction: discord.Interaction,
+    container: Container,
+    sampler: ContainerSampler,
+    rng: random.Random,
+    price: int,
+    amount: int,
+) -> None:
+    """
+    Open amount containers in one database round trip. The most valuable drops are added
+    to the user's inventory while they have space, and the rest are sold
+    """
+    unboxed = sorted(
+        (
+            (bot.item_metadata[drop.unformatted_name], drop)
+            for drop in sampler.sample_many(rng, amount)
+        ),
+        key=lambda unboxed: unboxed[0].price,
+        reverse=True,
+    )
+    cost = price * amount
+    rows = await bot.db.fetch_from_file(
+        OPEN_CONTAINERS,
+        interaction.user.id,
+        cost,
+        [get_item_type(item).value for item, _ in unboxed],
+        [drop.unformatted_name for _, drop in unboxed],
+        [drop.float for _, drop in unboxed],
+        [item.price for item, _ in unboxed],
+    )
+    if len(rows) == 0:
+        raise UserNotRegisteredError(interaction.user)
+    if not rows[0]["deducted"]:
+        raise InsufficientBalanceError(rows[0]["balance_before_transaction"], cost)
+
+    item_ids: list[int] = rows[0]["item_ids"]
+    bot.inventory_cache.add_items(
+        interaction.user.id,
+        [
+            (item_id, drop.unformatted_name, get_item_type(item), drop.float)
+            for item_id, (item, drop) in zip(item_ids, unboxed)
+        ],
+    )
+
+    summary = discord.Embed(
+        title=f"{amount}x {container.formatted_name}",
+        color=get_rarity_embed_color(max(item.rarity for item, _ in unboxed)),
+    )
+    summary.add_field(name="Cost", value=currency_str_format(cost))
+    summary.add_field(
+        name="Value", value=currency_str_format(sum(item.price for item, _ in unboxed))
+    )
+    summary.add_field(name="Kept", value=f"{len(item_ids)} / {amount}")
+    summary.add_field(name="Sold For", value=currency_str_format(rows[0]["sold_for"]))
+    lines = [
+        format_unboxed_item(item, drop, item_ids[i] if i < len(item_ids) else None)
+        for i, (item, drop) in enumerate(unboxed)
+    ]
+    view = BulkOpenView(
+        interaction,
+        summary,
+        [list(page) for page in batched(lines, ITEMS_PER_PAGE)],
+    )
+    await interaction.response.send_message(embed=view.build_embed(), view=view)
+
+
 async def open(
     bot: SpaceCasesBot,
     interaction: discord.Interaction,
     name: str,
+    amount: int = 1,
 ) -> None:
     container_unformatted_name = remove_skin_name_formatting(name)
 
     try:
         container = bot.containers[container_unformatted_name]
+        sampler = bot.container_samplers[container_unformatted_name]
     except KeyError:
         raise ContainerDoesNotExistError(name)
 
@@ -178,6 +298,11 @@ async def open(
     if container.requires_key:
         price += KEY_PRICE
 
+    rng = bot.rng.for_interaction(interaction.id, interaction.user.id, "open")
+    if amount > 1:
+        await open_many(bot, interaction, container, sampler, rng, price, amount)
+        return
+
     # try and deduct price
     rows = await bot.db.fetch_from_file(TRY_DEDUCT_BALANCE, interaction.user.id, price)
     if len(rows) == 0:
@@ -189,82 +314,9 @@ async def open(
         balance_before_transaction: int = rows[0]["balance_before_transaction"]
         raise InsufficientBalanceError(balance_before_transaction, price)
 
-    # generate probability table (maybe move to asset generation?)
-    cumulative_probabilities = {}
-    cumulative_probability = 0
-    for idx, rarity in enumerate(reversed(container.contains.keys())):
-        cumulative_probability += 1 + 5 ** (idx + 1)
-        cumulative_probabilities[rarity] = cumulative_probability
-
-    # select random rarity
-    random_int = random.randint(1, cumulative_probability)
-    if random_int == 1:
-        container_entry = random.choice(container.contains_rare)
-    else:
-        for rarity, cum in cumulative_probabilities.items():
-            if random_int <= cum:
-                break
-        else:
-            raise ValueError("Why is cumulative probabilities empty?")
-        container_entry = random.choice(container.contains[rarity])
-
-    # generate the item
-    match container_entry:
-        case SkinContainerEntry():
-            # calculate its float value
-            min_float = container_entry.min_float
-            max_float = container_entry.max_float
-
-            float_value = random.random()
-            if float_value > 0 and float_value <= 0.1471:
-                float_value = random.uniform(0.00, 0.07)
-            elif float_value > 0.1471 and float_value <= 0.3939:
-                float_value = random.uniform(0.07, 0.15)
-            elif float_value > 0.3939 and float_value <= 0.8257:
-                float_value = random.uniform(0.15, 0.38)
-            elif float_value > 0.8257 and float_value <= 0.9007:
-                float_value = random.uniform(0.38, 0.45)
-            elif float_value > 0.9007 and float_value <= 1.0:
-                float_value = random.uniform(0.45, 1)
-
-            # linear interpolate between max and min float
-            final_float = float_value * (max_float - min_float) + min_float
-
-            # what condition is this float?
-            for condition, lower_bound in {
-                remove_skin_name_formatting("Battle-Scarred"): 0.45,
-                remove_skin_name_formatting("Well-Worn"): 0.38,
-                remove_skin_name_formatting("Field-Tested"): 0.15,
-                remove_skin_name_formatting("Minimal Wear"): 0.07,
-                remove_skin_name_formatting("Factory New"): 0.00,
-            }.items():
-                if final_float > lower_bound:
-                    break
-            else:
-                raise ValueError(
-                    f"Couldn't select condition as final_float is {final_float}"
-                )
-
-            # if it has a phase, obtain it
-            if isinstance(container_entry.phase_group, PhaseGroup):
-                phase = remove_skin_name_formatting(
-                    random.choice(container_entry.phase_group.get_phases())
-                )
-                unformatted_name = container_entry.unformatted_name + phase + condition
-            else:
-                unformatted_name = container_entry.unformatted_name + condition
-        case ItemContainerEntry():
-            final_float = None
-            unformatted_name = container_entry.unformatted_name
-
-    # if the container is a skin case, 10% chance of stattrak
-    if isinstance(container, SkinCase):
-        if random.randint(1, 10) == 1:
-            unformatted_name = "stattrak" + unformatted_name
-
-    # if the container is a souvenir package, always come as souvenir item
-    elif isinstance(container, SouvenirPackage):
-        unformatted_name = "souvenir" + unformatted_name
+    drop = sampler.sample(rng)
+    unformatted_name = drop.unformatted_name
+    final_float = drop.float
 
     # create embed
     item_metadatum = bot.item_metadata[unformatted_name]
@@ -273,7 +325,7 @@ async def open(
         color=get_rarity_embed_color(item_metadatum.rarity),
     )
     e.add_field(name="Price", value=currency_str_format(item_metadatum.price))
-    if isinstance(item_metadatum, SkinMetadatum):
+    if isinstance(item_metadatum, SkinRecord):
         e.description = item_metadatum.description
         e.add_field(name="Float", value=str(final_float))
     e.set_image(url=item_metadatum.image_url)
@@ -299,14 +351,26 @@ async def open_name_autocomplete(
 ) -> list[discord.app_commands.Choice]:
     unformatted_current = remove_skin_name_formatting(current)
     if len(unformatted_current) == 0:
-        options = random.sample(bot.container_unformatted_names, 25)
-    else:
-        options = list(islice(bot.container_trie.keys(unformatted_current), 25))
-
-    return [
-        discord.app_commands.Choice(
-            name=bot.containers[unformatted_name].formatted_name,
-            value=bot.containers[unformatted_name].formatted_name,
+        return container_choices(
+            bot, random.sample(bot.container_unformatted_names, 25)
         )
-        for unformatted_name in options
-    ]
+
+    choices = bot.container_choice_cache.get(unformatted_current)
+    if choices is None:
+        choices = container_choices(
+            bot, bot.container_index.search(unformatted_current)
+        )
+        bot.container_choice_cache.put(unformatted_current, choices)
+    return choices
+
+
+def container_choices(
+    bot: SpaceCasesBot, unformatted_names: list[str]
+) -> list[discord.app_commands.Choice[str]]:
+    choices = []
+    for unformatted_name in unformatted_names:
+        formatted_name = bot.containers[unformatted_name].formatted_name
+        choices.append(
+            discord.app_commands.Choice(name=formatted_name, value=formatted_name)
+        )
+    return choices
@@ -1,21 +1,19 @@
 import discord
-import random
-import json
 from spacecases.bot import SpaceCasesBot
-from spacecases.database import Database, GET_ITEM
+from spacecases.database import Database, GET_ITEM, EDIT_ITEM, DELETE_ITEM
 from spacecases.exceptions import (
     UserNotRegisteredError,
     UserDoesNotOwnItemError,
     ItemDoesNotExistError,
 )
 from spacecases.ui.embed import send_err_embed
+from spacecases.inventory_cache import InventoryCache
+from spacecases.rng import RngProvider
 from common import (
     ItemType,
     remove_skin_name_formatting,
-    ItemMetadatum,
-    SkinMetadatum,
-    StickerMetadatum,
 )
+from spacecases.catalogue import ItemRecord, SkinRecord, StickerRecord
 
 
 EXPONENT = 2
@@ -28,14 +26,18 @@ class UpgradeView(discord.ui.View):
     def __init__(
         self,
         db: Database,
+        inventory_cache: InventoryCache,
+        rng: RngProvider,
         interaction: discord.Interaction,
         original_embed: discord.Embed,
         start_item_id: int,
         target_item: str,
-        target_item_metadatum: ItemMetadatum,
+        target_item_metadatum: ItemRecord,
         upgrade_chance: float,
     ):
         self.db = db
+        self.inventory_cache = inventory_cache
+        self.rng = rng
         self.interaction = interaction
         self.original_embed = original_embed
         self.start_item_id = start_item_id
@@ -52,47 +54,59 @@ class UpgradeView(discord.ui.View):
             await send_err_embed(interaction, "This is not your button!", True)
             return
 
-        if random.random() < self.upgrade_chance:
+        rng = self.rng.for_interaction(interaction.id, interaction.user.id, "upgrade")
+        if rng.random() < self.upgrade_chance:
             new_color = discord.Color.green()
             new_footer = "Upgrade successful"
 
             # generate new item
             args = []
-            if isinstance(self.target_item_metadatum, SkinMetadatum):
+            if isinstance(self.target_item_metadatum, SkinRecord):
                 # new float required
                 float = self.target_item_metadatum.condition.get_float(
                     self.target_item_metadatum.min_float,
                     self.target_item_metadatum.max_float,
+                    rng,
                 )
                 args = [
                     "skin",
                     self.target_item,
-                    json.dumps({"float": float}),
+                    float,
                 ]
-            elif isinstance(self.target_item_metadatum, StickerMetadatum):
+            elif isinstance(self.target_item_metadatum, StickerRecord):
                 args = [
                     "sticker",
                     self.target_item,
-                    json.dumps({}),
+                    None,
                 ]
-            query = "inventory/edit_item.sql"
+            query = EDIT_ITEM
         else:
             new_color = discord.Color.red()
             new_footer = "Upgrade failed"
-            query = "inventory/delete_item.sql"
+            query = DELETE_ITEM
             args = []
 
         # take action
         result = await self.db.fetch_from_file(
             query, interaction.user.id, self.start_item_id, *args
         )
+        user_id = interaction.user.id
         if len(result) == 0:
+            # changed elsewhere since we looked it up, so our cached copy is stale too
+            self.inventory_cache.invalidate(user_id)
             await send_err_embed(
                 interaction,
                 "Upgrade **failed** as the start item is no longer in your inventory.",
                 ephemeral=True,
             )
             return
+        if query == EDIT_ITEM:
+            type, name, float = args
+            self.inventory_cache.replace_item(
+                user_id, (self.start_item_id, name, ItemType(type), float)
+            )
+        else:
+            self.inventory_cache.remove_item(user_id, self.start_item_id)
         self.original_embed.colour = new_color
         self.original_embed.set_footer(
             text=new_footer, icon_url=interaction.user.display_avatar.url
@@ -125,7 +139,7 @@ async def upgrade(
         raise UserDoesNotOwnItemError(interaction.user, item_id)
     name: str
     type: ItemType
-    name, type, details = item
+    name, type, _ = item
     start_item_metadatum = bot.item_metadata[name]
     try:
         target_item_metadatum = bot.item_metadata[target_item]
@@ -166,6 +180,14 @@ async def upgrade(
     await interaction.response.send_message(
         embed=e,
         view=UpgradeView(
-            bot.db, interaction, e, item_id, target_item, target_item_metadatum, chance
+            bot.db,
+            bot.inventory_cache,
+            bot.rng,
+            interaction,
+            e,
+            item_id,
+            target_item,
+            target_item_metadatum,
+            chance,
         ),
     )
@@ -25,6 +25,7 @@ async def close(bot: SpaceCasesBot, interaction: discord.Interaction) -> None:
 
     async def on_yes(interaction: discord.Interaction) -> None:
         rows = await bot.db.fetch_from_file(CLOSE, interaction.user.id)
+        bot.inventory_cache.invalidate(interaction.user.id)
         if len(rows) > 0:
             new_embed = create_success_embed(
                 "You have successfully **deleted** your account"
@@ -1,17 +1,43 @@
-import json
+import math
 import discord
+from asyncpg import Record
 from spacecases.bot import SpaceCasesBot
-from spacecases.database import GET_INVENTORY_CHECK_EXIST, GET_ITEM
+from spacecases.database import (
+    Database,
+    GET_INVENTORY_SUMMARY,
+    GET_INVENTORY_PAGE,
+    GET_INVENTORY_PAGE_BY_PRICE,
+    GET_INVENTORY_PAGE_BY_RARITY,
+    GET_ITEM,
+)
 from spacecases.strutils import currency_str_format
 from spacecases.autocomplete import inventory_item_autocomplete
-from spacecases.ui.embed import get_rarity_embed_color
+from spacecases.ui.embed import get_rarity_embed_color, send_err_embed
 from spacecases.exceptions import (
     UserNotRegisteredError,
     UserInventoryEmptyError,
     UserDoesNotOwnItemError,
 )
-from common import SkinMetadatum, ItemType
-from typing import Optional, cast, Any
+from common import ItemType
+from spacecases.catalogue import SkinRecord
+from typing import Optional, Literal, cast
+
+type InventorySort = Literal["id"] | Literal["price"] | Literal["rarity"]
+
+# where the next page starts, the id of the previous page's last item, preceded by its
+# sort key when sorting by price or rarity
+type InventoryCursor = tuple[int, ...]
+
+INVENTORY_PAGE_SIZE = 10
+
+INVENTORY_PAGE_QUERIES: dict[InventorySort, str] = {
+    "id": GET_INVENTORY_PAGE,
+    "price": GET_INVENTORY_PAGE_BY_PRICE,
+    "rarity": GET_INVENTORY_PAGE_BY_RARITY,
+}
+
+# above every price and rarity, so sorted inventories start from the top
+MAX_SORT_KEY = 2**63 - 1
 
 
 async def inventory(
@@ -19,6 +45,7 @@ async def inventory(
     interaction: discord.Interaction,
     user: Optional[discord.User],
     item_id: Optional[int],
+    sort: InventorySort,
 ) -> None:
     if user is None:
         target_user = interaction.user
@@ -26,41 +53,168 @@ async def inventory(
         target_user = user
 
     if item_id is None:
-        await show_user_inventory(interaction, bot, target_user)
+        await show_user_inventory(interaction, bot, target_user, sort)
     else:
         await show_item_from_user_inventory(interaction, bot, target_user, item_id)
 
 
-async def show_user_inventory(
-    interaction: discord.Interaction,
-    bot: SpaceCasesBot,
-    user: discord.Member | discord.User,
-) -> None:
-    user_exists, inventory_capacity, items = (
-        await bot.db.fetch_from_file(GET_INVENTORY_CHECK_EXIST, user.id)
-    )[0]
-    if not user_exists:
-        raise UserNotRegisteredError(user)
+class InventoryView(discord.ui.View):
+    """
+    Pages through a user's inventory, fetching each page from the database as it is
+    viewed. Pages are keyset paginated, so the cursor of every page visited so far is
+    kept to allow going back.
+    """
+
+    def __init__(
+        self,
+        interaction: discord.Interaction,
+        bot: SpaceCasesBot,
+        user: discord.Member | discord.User,
+        sort: InventorySort,
+        summary: Record,
+        next_cursor: InventoryCursor,
+    ):
+        self.interaction = interaction
+        self.bot = bot
+        self.user = user
+        self.sort: InventorySort = sort
+        self.summary = summary
+        self.cursors = [first_inventory_cursor(sort), next_cursor]
+        self.page = 0
+        super().__init__(timeout=30)
+        self.left_button.disabled = True
+
+    async def show_page(self, interaction: discord.Interaction, page: int) -> None:
+        page, items, next_cursor = await fetch_nonempty_inventory_page(
+            self.bot.db, self.user.id, self.sort, self.cursors, page
+        )
+        self.page = page
+        # the inventory may have changed since later pages were visited, so forget them
+        del self.cursors[page + 1 :]
+        if next_cursor is not None:
+            self.cursors.append(next_cursor)
+        self.left_button.disabled = page == 0
+        self.right_button.disabled = next_cursor is None
+        e = create_inventory_embed(self.bot, self.user, self.summary, items, page)
+        await interaction.response.edit_message(embed=e, view=self)
+
+    @discord.ui.button(emoji="◀", style=discord.ButtonStyle.gray)
+    async def left_button(
+        self, interaction: discord.Interaction, button: discord.ui.Button
+    ) -> None:
+        if interaction.user.id != self.interaction.user.id:
+            await send_err_embed(interaction, "This is **not** your button!", True)
+            return
+        await self.show_page(interaction, self.page - 1)
+
+    @discord.ui.button(emoji="▶", style=discord.ButtonStyle.gray)
+    async def right_button(
+        self, interaction: discord.Interaction, button: discord.ui.Button
+    ) -> None:
+        if interaction.user.id != self.interaction.user.id:
+            await send_err_embed(interaction, "This is **not** your button!", True)
+            return
+        await self.show_page(interaction, self.page + 1)
+
+    async def on_timeout(self) -> None:
+        await self.interaction.edit_original_response(view=None)
+
+
+def first_inventory_cursor(sort: InventorySort) -> InventoryCursor:
+    if sort == "id":
+        return (0,)
+    return (MAX_SORT_KEY, 0)
 
-    # empty inventory
-    if len(items) == 0:
-        raise UserInventoryEmptyError(user)
 
-    # create embed
-    inventory_value = sum(bot.item_metadata[item[2]].price for item in items)
+async def fetch_inventory_page(
+    db: Database, user_id: int, sort: InventorySort, cursor: InventoryCursor
+) -> tuple[list[Record], Optional[InventoryCursor]]:
+    """
+    Fetch the page of a user's inventory starting at cursor, along with the cursor for
+    the page after it, or None if this is the last page
+    """
+    items = await db.fetch_from_file(
+        INVENTORY_PAGE_QUERIES[sort], user_id, *cursor, INVENTORY_PAGE_SIZE + 1
+    )
+    if len(items) <= INVENTORY_PAGE_SIZE:
+        return items, None
+    items = items[:INVENTORY_PAGE_SIZE]
+    last = items[-1]
+    if sort == "id":
+        return items, (last["id"],)
+    return items, (last["sort_key"], last["id"])
+
+
+async def fetch_nonempty_inventory_page(
+    db: Database,
+    user_id: int,
+    sort: InventorySort,
+    cursors: list[InventoryCursor],
+    page: int,
+) -> tuple[int, list[Record], Optional[InventoryCursor]]:
+    """
+    Fetch a page like fetch_inventory_page, falling back to earlier pages if the
+    inventory has shrunk since cursors were saved so the page starts past its end
+    """
+    while True:
+        items, next_cursor = await fetch_inventory_page(
+            db, user_id, sort, cursors[page]
+        )
+        if len(items) > 0 or page == 0:
+            return page, items, next_cursor
+        page -= 1
+
+
+def create_inventory_embed(
+    bot: SpaceCasesBot,
+    user: discord.Member | discord.User,
+    summary: Record,
+    items: list[Record],
+    page: int,
+) -> discord.Embed:
+    inventory_capacity, item_count, inventory_value = summary
+    page_count = max(1, math.ceil(item_count / INVENTORY_PAGE_SIZE))
     e = discord.Embed(
         title=f"{user.display_name}'s Inventory",
-        description=f"Total Value: **{currency_str_format(inventory_value)}**\nSlots Used: **{len(items)}/{inventory_capacity}**",
+        description=f"Total Value: **{currency_str_format(inventory_value)}**\nSlots Used: **{item_count}/{inventory_capacity}**",
     )
     item_strings = []
-    for id, _, name, _ in items:
+    for id, _, name, _, *_ in items:
         metadata = bot.item_metadata[name]
         item_strings.append(
             f"{metadata.formatted_name} - **{currency_str_format(metadata.price)}** (ID: **{id}**)"
         )
-    e.add_field(name="Items", value="\n".join(item_strings))
+    # discord rejects empty field values, and the inventory may have been emptied while
+    # it was being paged through
+    e.add_field(name="Items", value="\n".join(item_strings) or "No items")
     e.set_thumbnail(url=user.display_avatar.url)
-    await interaction.response.send_message(embed=e)
+    e.set_footer(text=f"Page {page + 1}/{page_count}")
+    return e
+
+
+async def show_user_inventory(
+    interaction: discord.Interaction,
+    bot: SpaceCasesBot,
+    user: discord.Member | discord.User,
+    sort: InventorySort,
+) -> None:
+    summary = await bot.db.fetch_from_file(GET_INVENTORY_SUMMARY, user.id)
+    if len(summary) == 0:
+        raise UserNotRegisteredError(user)
+
+    items, next_cursor = await fetch_inventory_page(
+        bot.db, user.id, sort, first_inventory_cursor(sort)
+    )
+    # empty inventory
+    if len(items) == 0:
+        raise UserInventoryEmptyError(user)
+
+    e = create_inventory_embed(bot, user, summary[0], items, 0)
+    if next_cursor is None:
+        await interaction.response.send_message(embed=e)
+    else:
+        view = InventoryView(interaction, bot, user, sort, summary[0], next_cursor)
+        await interaction.response.send_message(embed=e, view=view)
 
 
 async def show_item_from_user_inventory(
@@ -70,14 +224,13 @@ async def show_item_from_user_inventory(
     item_id: int,
 ) -> None:
     user_exists: bool
-    item: Optional[tuple[str, ItemType, Any]]
+    item: Optional[tuple[str, ItemType, Optional[float]]]
     user_exists, item = (await bot.db.fetch_from_file(GET_ITEM, user.id, item_id))[0]
     if not user_exists:
         raise UserNotRegisteredError(user)
     if item is None:
         raise UserDoesNotOwnItemError(user, item_id)
-    name, type, details = item
-    details = json.loads(details)
+    name, type, float_val = item
     metadatum = bot.item_metadata[name]
     e = discord.Embed(
         title=metadatum.formatted_name, color=get_rarity_embed_color(metadatum.rarity)
@@ -87,9 +240,8 @@ async def show_item_from_user_inventory(
     e.set_footer(text=f"Owned by {user.display_name}", icon_url=user.display_avatar)
     match type:
         case ItemType.Skin:
-            metadatum = cast(SkinMetadatum, metadatum)
+            metadatum = cast(SkinRecord, metadatum)
             e.description = metadatum.description
-            float_val: float = details["float"]
             e.add_field(name="Float", value=float_val)
             rarity = metadatum.rarity.get_name_for_skin()
         case ItemType.Sticker:
@@ -3,7 +3,6 @@ from typing import Literal
 from itertools import batched
 from spacecases.bot import SpaceCasesBot
 from spacecases.ui.embed import send_err_embed
-from spacecases.leaderboard import Leaderboard
 from spacecases.strutils import currency_str_format
 from spacecases.ui.embed import send_paginated_embed
 
@@ -29,7 +28,11 @@ async def leaderboard(
                 interaction, "You can only access a local leaderboard in a **guild**"
             )
             return
-        leaderboard = bot.guild_leaderboards.get(interaction.guild.id, Leaderboard({}))
+        # fetching a leaderboard nobody has looked at yet can outlast the time
+        # Discord gives to respond, so the response is deferred while it loads
+        if interaction.guild.id not in bot.guild_leaderboards:
+            await interaction.response.defer()
+        leaderboard = await bot.guild_leaderboards.get(interaction.guild.id)
         leaderboard_title = f"{interaction.guild.name}'s Leaderboard"
 
     # no leaderboard data found
@@ -1,6 +1,5 @@
 import discord
 from spacecases.bot import SpaceCasesBot
-from spacecases.leaderboard import Leaderboard
 from spacecases.ui.embed import send_err_embed, send_success_embed
 from typing import Literal
 
@@ -19,7 +18,11 @@ async def ranking(
                 interaction, "You can only access a local leaderboard in a **guild**"
             )
             return
-        leaderboard = bot.guild_leaderboards.get(interaction.guild.id, Leaderboard({}))
+        # fetching a leaderboard nobody has looked at yet can outlast the time
+        # Discord gives to respond, so the response is deferred while it loads
+        if interaction.guild.id not in bot.guild_leaderboards:
+            await interaction.response.defer()
+        leaderboard = await bot.guild_leaderboards.get(interaction.guild.id)
         leaderboard_title = f"{interaction.guild.name}'s leaderboard"
 
     if len(leaderboard) == 0:
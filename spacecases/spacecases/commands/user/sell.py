@@ -1,4 +1,3 @@
-import json
 import discord
 from spacecases.bot import SpaceCasesBot
 from spacecases.autocomplete import inventory_item_autocomplete
@@ -24,8 +23,7 @@ async def sell(
         raise UserNotRegisteredError(interaction.user)
     if item is None:
         raise UserDoesNotOwnItemError(interaction.user, item_id)
-    name, _, details = item
-    details = json.loads(details)
+    name, _, _ = item
     metadatum = bot.item_metadata[name]
 
     async def on_yes(interaction: discord.Interaction) -> None:
@@ -36,6 +34,7 @@ async def sell(
             raise UserNotRegisteredError(interaction.user)
         if not item_removed:
             raise UserDoesNotOwnItemError(interaction.user, item_id)
+        bot.inventory_cache.remove_item(interaction.user.id, item_id)
         _, balance = (
             await bot.db.fetch_from_file(
                 CHANGE_BALANCE, interaction.user.id, metadatum.price
@@ -34,7 +34,7 @@ async def transfer(
         await send_err_embed(interaction, "You **cannot** transfer **zero** balance")
         return
 
-    async with bot.db.pool.acquire() as connection:
+    async with bot.db.acquire() as connection:
         async with connection.transaction(isolation="serializable"):
             # check we exist
             rows = await bot.db.fetch_from_file_with_connection(
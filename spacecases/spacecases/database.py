@@ -1,9 +1,15 @@
 import os
+import time
+import hashlib
 import asyncpg
-from typing import Any, Self
-from asyncpg import Record
+from pathlib import PurePath
+from dataclasses import dataclass
+from contextlib import asynccontextmanager
+from typing import Any, Self, AsyncIterator, Optional
+from asyncpg import Record, Connection
 from asyncpg.pool import PoolConnectionProxy
 from common import ItemType, get_logger
+from spacecases.metrics import PoolStats, QueryMetrics
 
 logger = get_logger(__name__)
 
@@ -22,18 +28,239 @@ TRY_DEDUCT_BALANCE = "user/money/try_deduct_balance.sql"
 REGISTER = "user/register.sql"
 CLOSE = "user/close.sql"
 COUNT_USERS = "user/count_users.sql"
-DOES_USER_EXIST_FOR_UPDATE = "user/does_user_exist_for_update.sql"
 DOES_USER_EXIST = "user/does_user_exist.sql"
-ADD_ITEM = "inventory/add_item.sql"
-LOCK_ITEMS = "inventory/lock_items.sql"
-GET_INVENTORY_CHECK_EXIST = "inventory/get_inventory_check_exist.sql"
+GRANT_ITEM = "inventory/grant_item.sql"
+SELL_UNBOXED_ITEM = "inventory/sell_unboxed_item.sql"
+OPEN_CONTAINERS = "inventory/open_containers.sql"
+GET_INVENTORY_SUMMARY = "inventory/get_inventory_summary.sql"
+GET_INVENTORY_PAGE = "inventory/get_inventory_page.sql"
+GET_INVENTORY_PAGE_BY_PRICE = "inventory/get_inventory_page_by_price.sql"
+GET_INVENTORY_PAGE_BY_RARITY = "inventory/get_inventory_page_by_rarity.sql"
 GET_INVENTORY = "inventory/get_inventory.sql"
 GET_ITEM = "inventory/get_item.sql"
 REMOVE_ITEM = "inventory/remove_item.sql"
+EDIT_ITEM = "inventory/edit_item.sql"
+DELETE_ITEM = "inventory/delete_item.sql"
+LOCK_ITEMS_SHARE = "inventory/lock_items_share.sql"
+CHECK_ITEM_COUNTS = "inventory/check_item_counts.sql"
+REPAIR_ITEM_COUNTS = "inventory/repair_item_counts.sql"
+SYNC_ITEM_METADATA = "item_metadata/sync_item_metadata.sql"
+REPLICA_LAG = "database/replica_lag.sql"
 
+# every query constant above, checked against the registry at startup
+QUERIES = (
+    BALANCE,
+    BALANCE_FOR_UPDATE,
+    CHANGE_BALANCE,
+    CLAIM,
+    TRY_DEDUCT_BALANCE,
+    REGISTER,
+    CLOSE,
+    COUNT_USERS,
+    DOES_USER_EXIST,
+    GRANT_ITEM,
+    SELL_UNBOXED_ITEM,
+    OPEN_CONTAINERS,
+    GET_INVENTORY_SUMMARY,
+    GET_INVENTORY_PAGE,
+    GET_INVENTORY_PAGE_BY_PRICE,
+    GET_INVENTORY_PAGE_BY_RARITY,
+    GET_INVENTORY,
+    GET_ITEM,
+    REMOVE_ITEM,
+    EDIT_ITEM,
+    DELETE_ITEM,
+    LOCK_ITEMS_SHARE,
+    CHECK_ITEM_COUNTS,
+    REPAIR_ITEM_COUNTS,
+    SYNC_ITEM_METADATA,
+    REPLICA_LAG,
+)
 
-async def register_type_codecs(conn: PoolConnectionProxy) -> None:
-    await conn.set_type_codec(
+# queries that never write, so can be served by a read replica. Users who wrote recently
+# read from the primary instead, see Database.use_replica
+READ_ONLY_QUERIES = frozenset(
+    (
+        BALANCE,
+        COUNT_USERS,
+        DOES_USER_EXIST,
+        GET_INVENTORY,
+        GET_INVENTORY_SUMMARY,
+        GET_INVENTORY_PAGE,
+        GET_INVENTORY_PAGE_BY_PRICE,
+        GET_INVENTORY_PAGE_BY_RARITY,
+        GET_ITEM,
+    )
+)
+
+# queries not about a single user. Every other query takes the id of the user it reads
+# or writes as its first parameter
+GLOBAL_QUERIES = frozenset(
+    (
+        COUNT_USERS,
+        LOCK_ITEMS_SHARE,
+        CHECK_ITEM_COUNTS,
+        REPAIR_ITEM_COUNTS,
+        SYNC_ITEM_METADATA,
+        REPLICA_LAG,
+    )
+)
+
+# seconds between replica lag checks, the replica can fall this much further behind
+# than max_replica_lag before reads are routed away from it
+REPLICA_LAG_CHECK_INTERVAL = 5.0
+
+
+# key for the advisory lock held while migrating, so replicas starting together take turns
+MIGRATIONS_LOCK_KEY = 7_350_203_543_061_021
+
+
+class QueryRegistry:
+    """
+    Every query under the sql directory, read from disk once at startup.
+
+    Queries are passed to asyncpg as text, so each pooled connection prepares a
+    query the first time it sees it and reuses the prepared statement from its
+    statement cache afterwards.
+    """
+
+    def __init__(self, queries: dict[str, str]):
+        self.queries = queries
+
+    @classmethod
+    def load(cls, directory: str = SQL_QUERIES_DIRECTORY) -> "QueryRegistry":
+        queries: dict[str, str] = {}
+        for root, directories, filenames in os.walk(directory):
+            # migrations are only ever run by run_migrations
+            if root == directory and "migrations" in directories:
+                directories.remove("migrations")
+            for filename in filenames:
+                if not filename.endswith(".sql"):
+                    continue
+                path = os.path.join(root, filename)
+                with open(path, "r") as file:
+                    name = PurePath(os.path.relpath(path, directory)).as_posix()
+                    queries[name] = file.read()
+
+        missing = [name for name in QUERIES if name not in queries]
+        if missing:
+            raise FileNotFoundError(f"Missing query files: {', '.join(missing)}")
+        logger.info(f"Loaded {len(queries)} queries from {directory}")
+        return QueryRegistry(queries)
+
+    def __getitem__(self, filename: str) -> str:
+        return self.queries[filename]
+
+    def __len__(self) -> int:
+        return len(self.queries)
+
+
+class MigrationChecksumError(Exception):
+    pass
+
+
+@dataclass
+class Migration:
+    name: str
+    contents: bytes
+    checksum: str
+
+
+def load_migrations(directory: str = MIGRATIONS_DIRECTORY) -> list[Migration]:
+    """
+    Read every migration file, ordered by the number at the start of its name
+    """
+    migrations: list[Migration] = []
+    for entry in os.scandir(directory):
+        if not entry.is_file() or not entry.name.endswith(".sql"):
+            continue
+        # read as bytes, only pending migrations ever need decoding
+        with open(entry.path, "rb") as file:
+            contents = file.read()
+        checksum = hashlib.sha256(contents).hexdigest()
+        migrations.append(Migration(entry.name, contents, checksum))
+    migrations.sort(key=lambda migration: int(migration.name.split("_", 1)[0]))
+    return migrations
+
+
+async def run_migrations(
+    connection: Connection, directory: str = MIGRATIONS_DIRECTORY
+) -> None:
+    """
+    Apply every pending migration in a single transaction.
+
+    Applied migrations are stored with a checksum of their contents, and a
+    migration file that has changed since it was applied stops startup.
+    Migrations can't use statements that refuse to run inside a transaction,
+    such as CREATE INDEX CONCURRENTLY.
+    """
+    migrations = load_migrations(directory)
+    async with connection.transaction():
+        await connection.execute(
+            "SELECT pg_advisory_xact_lock($1)", MIGRATIONS_LOCK_KEY
+        )
+        await connection.execute(
+            """CREATE TABLE IF NOT EXISTS migrations (
+                name TEXT PRIMARY KEY,
+                applied_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+                checksum TEXT
+            );
+            ALTER TABLE migrations ADD COLUMN IF NOT EXISTS checksum TEXT;
+            """
+        )
+        applied: dict[str, str | None] = {
+            row["name"]: row["checksum"]
+            for row in await connection.fetch("SELECT name, checksum FROM migrations")
+        }
+
+        pending: list[Migration] = []
+        unverified: list[Migration] = []
+        for migration in migrations:
+            if migration.name not in applied:
+                pending.append(migration)
+            elif applied[migration.name] is None:
+                # applied before checksums were stored, so trust the file as it is
+                unverified.append(migration)
+            elif applied[migration.name] != migration.checksum:
+                raise MigrationChecksumError(
+                    f"Migration {migration.name} has been edited since it was applied"
+                )
+
+        if unverified:
+            await connection.execute(
+                """UPDATE migrations SET checksum = new.checksum
+                FROM unnest($1::TEXT[], $2::TEXT[]) AS new (name, checksum)
+                WHERE migrations.name = new.name
+                """,
+                [migration.name for migration in unverified],
+                [migration.checksum for migration in unverified],
+            )
+
+        for migration in pending:
+            logger.info(f"Applying migration: {migration.name}")
+            await connection.execute(migration.contents.decode())
+
+        if pending:
+            await connection.execute(
+                """INSERT INTO migrations (name, checksum)
+                SELECT * FROM unnest($1::TEXT[], $2::TEXT[])
+                """,
+                [migration.name for migration in pending],
+                [migration.checksum for migration in pending],
+            )
+    logger.info(
+        f"Applied {len(pending)} migrations, {len(migrations) - len(pending)} already applied"
+    )
+
+
+async def init_connection(connection: Connection) -> None:
+    """
+    Run once for every new connection the pool opens.
+
+    Setting a type codec drops the connection's statement cache, so this must
+    never happen per acquire.
+    """
+    await connection.set_type_codec(
         "item_type", schema="public", encoder=str, decoder=ItemType, format="text"
     )
 
@@ -41,8 +268,33 @@ async def register_type_codecs(conn: PoolConnectionProxy) -> None:
 class Database:
     @classmethod
     async def create(
-        cls, user: str, password: str, database: str, host: str, port: str
+        cls,
+        user: str,
+        password: str,
+        database: str,
+        host: str,
+        port: str,
+        min_size: int = 10,
+        max_size: int = 10,
+        statement_cache_size: int = 100,
+        read_only_dsn: Optional[str] = None,
+        max_replica_lag: float = 5.0,
     ) -> "Database":
+        # load queries first so a missing file fails before we connect
+        queries = QueryRegistry.load()
+        # migrations create the types registered in init_connection, so they run
+        # on their own connection before the pool exists
+        connection = await asyncpg.connect(
+            user=user,
+            password=password,
+            database=database,
+            host=host,
+            port=port,
+        )
+        try:
+            await run_migrations(connection)
+        finally:
+            await connection.close()
         # create pool
         pool = await asyncpg.create_pool(
             user=user,
@@ -50,6 +302,10 @@ class Database:
             database=database,
             host=host,
             port=port,
+            min_size=min_size,
+            max_size=max_size,
+            statement_cache_size=statement_cache_size,
+            init=init_connection,
         )
         # bruh
         if pool is None:
@@ -59,94 +315,176 @@ class Database:
         logger.info(
             f"Connected to database '{database}' as user '{user}' on {host}:{port}"
         )
-        db_instance = Database(pool)
-        await db_instance.run_migrations()
+        replica_pool = None
+        if read_only_dsn is not None:
+            replica_pool = await asyncpg.create_pool(
+                read_only_dsn,
+                min_size=min_size,
+                max_size=max_size,
+                statement_cache_size=statement_cache_size,
+                init=init_connection,
+            )
+            logger.info("Connected to read replica")
+        db_instance = Database(pool, queries, replica_pool, max_replica_lag)
+        await db_instance.check_replica_lag()
         return db_instance
 
-    def __init__(self, pool: asyncpg.Pool):
+    def __init__(
+        self,
+        pool: asyncpg.Pool,
+        queries: QueryRegistry,
+        replica_pool: Optional[asyncpg.Pool] = None,
+        max_replica_lag: float = 5.0,
+    ):
         self.pool = pool
+        self.queries = queries
+        # read only queries go to the replica while it is within max_replica_lag, except
+        # for users who wrote within the last read_your_writes_window seconds, whose
+        # writes the replica may not have yet
+        self.replica_pool = replica_pool
+        self.max_replica_lag = max_replica_lag
+        self.read_your_writes_window = max_replica_lag + REPLICA_LAG_CHECK_INTERVAL
+        self.replica_lag: Optional[float] = None
+        self.replica_healthy = False
+        self.last_writes: dict[int, float] = {}
+        self.metrics = QueryMetrics()
+        # live pool counters, see pool_stats
+        self.acquired = 0
+        self.acquires = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
 
-    async def run_migrations(self) -> None:
-        async with self.pool.acquire() as connection:
-            # create our migrations table if not already present
-            await connection.execute(
-                """CREATE TABLE IF NOT EXISTS migrations (
-                    name TEXT PRIMARY KEY,
-                    applied_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
-                );
-                """
-            )
-            logger.info("Running migrationss")
-            # run migrations if not already runs
-            for entry in sorted(
-                os.scandir(MIGRATIONS_DIRECTORY), key=lambda entry: entry.name
-            ):
-                if not entry.is_file():
-                    continue
+    @asynccontextmanager
+    async def acquire(
+        self, query: str = "transaction", replica: bool = False
+    ) -> AsyncIterator[PoolConnectionProxy]:
+        """
+        Acquire a pooled connection, recording the wait against the given query
+        file, or against "transaction" for connections shared by several queries
+        """
+        pool = self.replica_pool if replica and self.replica_pool else self.pool
+        start = time.perf_counter()
+        async with pool.acquire() as connection:
+            wait_time = time.perf_counter() - start
+            self.metrics.observe_pool_wait(query, wait_time)
+            self.acquired += 1
+            self.acquires += 1
+            self.total_wait_time += wait_time
+            self.max_wait_time = max(self.max_wait_time, wait_time)
+            try:
+                yield connection
+            finally:
+                self.acquired -= 1
 
-                # check if migration is already present
-                already_present = await connection.fetch(
-                    "SELECT 1 FROM migrations WHERE name = $1 LIMIT 1", entry.name
+    async def check_replica_lag(self) -> None:
+        """
+        Measure how far behind the replica is, routing reads back to the primary
+        if it is too far behind or can't be reached
+        """
+        if self.replica_pool is None:
+            return
+        try:
+            async with self.acquire(REPLICA_LAG, replica=True) as connection:
+                rows = await self.fetch_from_file_with_connection(
+                    REPLICA_LAG, connection
                 )
+            self.replica_lag = rows[0]["lag"]
+        except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+            logger.warning(f"Failed to check read replica lag: {e}")
+            self.replica_lag = None
 
-                # skip this migration
-                if already_present:
-                    logger.info(f"Migration {entry.name} already applied... skipping!")
-                    continue
+        healthy = (
+            self.replica_lag is not None and self.replica_lag <= self.max_replica_lag
+        )
+        if healthy != self.replica_healthy:
+            if healthy:
+                logger.info("Routing read only queries to the read replica")
+            else:
+                logger.warning(
+                    f"Routing read only queries to the primary, replica lag: {self.replica_lag}"
+                )
+        self.replica_healthy = healthy
+        # forget writes old enough for any healthy replica to have
+        cutoff = time.monotonic() - self.read_your_writes_window
+        self.last_writes = {
+            user_id: written_at
+            for user_id, written_at in self.last_writes.items()
+            if written_at > cutoff
+        }
 
-                # apply the migration
-                logger.info(f"Applying migration: {entry.name}")
-                with open(entry.path, "r") as file:
-                    print(entry.path)
-                    sql = file.read()
-                await connection.execute(sql)
+    def record_write(self, filename: str, params: tuple[Any, ...]) -> None:
+        """Remember when a user was last written to, so they can read their own writes"""
+        if filename in READ_ONLY_QUERIES or filename in GLOBAL_QUERIES or not params:
+            return
+        self.last_writes[params[0]] = time.monotonic()
 
-                # add to migration table
-                await connection.execute(
-                    "INSERT INTO migrations (name) VALUES ($1)", entry.name
-                )
-                logger.info(f"Applied migration: {entry.name}")
+    def use_replica(self, filename: str, params: tuple[Any, ...] = ()) -> bool:
+        if not self.replica_healthy or filename not in READ_ONLY_QUERIES:
+            return False
+        if filename in GLOBAL_QUERIES or not params:
+            return True
+        written_at = self.last_writes.get(params[0])
+        return (
+            written_at is None
+            or time.monotonic() - written_at > self.read_your_writes_window
+        )
+
+    def pool_stats(self) -> PoolStats:
+        return PoolStats(
+            size=self.pool.get_size(),
+            idle=self.pool.get_idle_size(),
+            acquired=self.acquired,
+            acquires=self.acquires,
+            total_wait_time=self.total_wait_time,
+            max_wait_time=self.max_wait_time,
+        )
 
     async def execute(self, query: str, *params: Any) -> None:
-        async with self.pool.acquire() as connection:
-            await register_type_codecs(connection)
+        async with self.acquire("inline") as connection:
             await connection.execute(query, *params)
 
     async def execute_from_file(self, filename: str, *params: Any) -> None:
-        with open(os.path.join(SQL_QUERIES_DIRECTORY, filename)) as f:
-            await self.execute(f.read(), *params)
-        logger.debug(
-            f"Ran execute query from file: '{filename}' with params: ({', '.join(map(str, params))})"
-        )
+        async with self.acquire(filename) as connection:
+            await self.execute_from_file_with_connection(filename, connection, *params)
 
     async def execute_from_file_with_connection(
         self, filename: str, connection: PoolConnectionProxy, *params: Any
     ) -> None:
-        with open(os.path.join(SQL_QUERIES_DIRECTORY, filename)) as f:
-            await connection.execute(f.read(), *params)
+        start = time.perf_counter()
+        await connection.execute(self.queries[filename], *params)
+        self.metrics.observe_execution(filename, time.perf_counter() - start)
+        self.record_write(filename, params)
         logger.debug(
             f"Ran execute query from file: '{filename}' with params: ({', '.join(map(str, params))})"
         )
 
     async def fetch(self, query: str, *params: Any) -> list[Record]:
-        async with self.pool.acquire() as connection:
-            await register_type_codecs(connection)
+        async with self.acquire("inline") as connection:
             result = await connection.fetch(query, *params)
         return result
 
     async def fetch_from_file(self, filename: str, *params: Any) -> list[Record]:
-        with open(os.path.join(SQL_QUERIES_DIRECTORY, filename)) as f:
-            val = await self.fetch(f.read(), *params)
-        logger.debug(
-            f"Ran fetch query from file: '{filename}' with params: ({', '.join(map(str, params))})"
-        )
-        return val
+        if self.use_replica(filename, params):
+            try:
+                async with self.acquire(filename, replica=True) as connection:
+                    return await self.fetch_from_file_with_connection(
+                        filename, connection, *params
+                    )
+            except (OSError, asyncpg.PostgresConnectionError, asyncpg.InterfaceError):
+                logger.exception("Read replica failed, falling back to the primary")
+                self.replica_healthy = False
+        async with self.acquire(filename) as connection:
+            return await self.fetch_from_file_with_connection(
+                filename, connection, *params
+            )
 
     async def fetch_from_file_with_connection(
         self, filename: str, connection: PoolConnectionProxy, *params: Any
     ) -> list[Record]:
-        with open(os.path.join(SQL_QUERIES_DIRECTORY, filename)) as f:
-            val = await connection.fetch(f.read(), *params)
+        start = time.perf_counter()
+        val = await connection.fetch(self.queries[filename], *params)
+        self.metrics.observe_execution(filename, time.perf_counter() - start)
+        self.record_write(filename, params)
         logger.debug(
             f"Ran fetch query from file: '{filename}' with params: ({', '.join(map(str, params))})"
         )
@@ -154,6 +492,8 @@ class Database:
 
     async def close(self) -> None:
         await self.pool.close()
+        if self.replica_pool is not None:
+            await self.replica_pool.close()
         logger.info("Closed database")
 
     async def __aenter__(self) -> Self:
@@ -0,0 +1,74 @@
+import random
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Optional, Sequence
+from common import Container, ItemDrop, wear_float
+
+
+class AliasTable:
+    """
+    Walker's alias method over integer weights. Every column holds at most two
+    outcomes, so a draw is one random number and one comparison. Integer arithmetic
+    keeps the probabilities exactly weight / sum of weights.
+    """
+
+    def __init__(self, weights: Sequence[int]) -> None:
+        n = len(weights)
+        total = sum(weights)
+        if n == 0 or total <= 0:
+            raise ValueError("An alias table needs a positive total weight")
+        self.total = total
+        # each column is worth total, so weights are scaled by n to fill n columns
+        scaled = [weight * n for weight in weights]
+        self.thresholds = [total] * n
+        self.aliases = list(range(n))
+        small = [i for i, weight in enumerate(scaled) if weight < total]
+        large = [i for i, weight in enumerate(scaled) if weight >= total]
+        while small and large:
+            less = small.pop()
+            more = large[-1]
+            self.thresholds[less] = scaled[less]
+            self.aliases[less] = more
+            scaled[more] -= total - scaled[less]
+            if scaled[more] < total:
+                small.append(large.pop())
+        # what remains fills its column exactly
+        for i in small + large:
+            self.thresholds[i] = total
+
+    def sample(self, rng: random.Random) -> int:
+        column, threshold = divmod(
+            rng.randrange(len(self.thresholds) * self.total), self.total
+        )
+        if threshold < self.thresholds[column]:
+            return column
+        return self.aliases[column]
+
+
+@dataclass(frozen=True)
+class Drop:
+    unformatted_name: str
+    float: Optional[float]
+
+
+class ContainerSampler:
+    """
+    Draws from a container's drop table, which the asset service resolved into concrete
+    item keys and integer weights. A draw picks a table entry through an alias table, then
+    a wear float for skins, whose condition picks the item key
+    """
+
+    def __init__(self, container: Container) -> None:
+        self.drops = container.drops
+        self.table = AliasTable([drop.weight for drop in self.drops])
+
+    def sample(self, rng: random.Random) -> Drop:
+        drop = self.drops[self.table.sample(rng)]
+        if isinstance(drop, ItemDrop):
+            return Drop(drop.item_key, None)
+        u = rng.random()
+        float = drop.min_float + wear_float(u) * (drop.max_float - drop.min_float)
+        return Drop(drop.item_keys[bisect_left(drop.wear_cuts, u)], float)
+
+    def sample_many(self, rng: random.Random, amount: int) -> list[Drop]:
+        return [self.sample(rng) for _ in range(amount)]
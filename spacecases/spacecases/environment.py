@@ -1,6 +1,7 @@
 import os
 from dotenv import load_dotenv
 from dataclasses import dataclass
+from typing import Optional
 
 DEFAULT_ASSET_DOMAIN = "https://assets.spacecases.xyz"
 
@@ -16,10 +17,24 @@ class Environment:
     db_name: str
     asset_domain: str
     leaderboards_domain: str
+    db_pool_min_size: int
+    db_pool_max_size: int
+    db_statement_cache_size: int
+    db_read_only_dsn: Optional[str]
+    db_max_replica_lag: float
+    inventory_cache_size: int
+    inventory_cache_ttl: float
+    full_metadata_validation: bool
+    metadata_snapshot_path: str
+    rng_seed: Optional[int]
+    rng_replay_log_path: Optional[str]
+    rng_replay_from_path: Optional[str]
+    leaderboard_cache_size: int
 
     @staticmethod
     def load() -> "Environment":
         load_dotenv(override=True)
+        rng_seed = os.environ.get("RNG_SEED")
         return Environment(
             bot_token=os.environ["BOT_TOKEN"],
             owner_id=int(os.environ["OWNER_ID"]),
@@ -30,4 +45,26 @@ class Environment:
             db_name=os.environ["DB_NAME"],
             asset_domain=os.environ.get("ASSET_DOMAIN", DEFAULT_ASSET_DOMAIN),
             leaderboards_domain=os.environ["LEADERBOARDS_DOMAIN"],
+            db_pool_min_size=int(os.environ.get("DB_POOL_MIN_SIZE", "10")),
+            db_pool_max_size=int(os.environ.get("DB_POOL_MAX_SIZE", "10")),
+            db_statement_cache_size=int(
+                os.environ.get("DB_STATEMENT_CACHE_SIZE", "100")
+            ),
+            db_read_only_dsn=os.environ.get("DB_READ_ONLY_DSN"),
+            db_max_replica_lag=float(os.environ.get("DB_MAX_REPLICA_LAG", "5")),
+            inventory_cache_size=int(os.environ.get("INVENTORY_CACHE_SIZE", "10000")),
+            inventory_cache_ttl=float(os.environ.get("INVENTORY_CACHE_TTL", "300")),
+            full_metadata_validation=os.environ.get(
+                "FULL_METADATA_VALIDATION", "false"
+            ).lower()
+            == "true",
+            metadata_snapshot_path=os.environ.get(
+                "METADATA_SNAPSHOT_PATH", os.path.join("snapshot", "metadata.snapshot")
+            ),
+            rng_seed=int(rng_seed) if rng_seed is not None else None,
+            rng_replay_log_path=os.environ.get("RNG_REPLAY_LOG"),
+            rng_replay_from_path=os.environ.get("RNG_REPLAY_FROM"),
+            leaderboard_cache_size=int(
+                os.environ.get("LEADERBOARD_CACHE_SIZE", "1000")
+            ),
         )
@@ -0,0 +1,76 @@
+import asyncio
+import aiohttp
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional, Self
+from common import get_logger
+
+logger = get_logger(__name__)
+
+# statuses worth asking again for, as the server may just be busy or restarting
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class HttpClient:
+    """
+    One keep-alive session shared by everything the bot downloads, so connections and
+    TLS sessions to the asset and leaderboard domains are reused between requests.
+    Requests that fail to connect, time out or get a transient status are retried with
+    exponential backoff.
+    """
+
+    def __init__(
+        self, session: aiohttp.ClientSession, retries: int, backoff: float
+    ) -> None:
+        self.session = session
+        self.retries = retries
+        self.backoff = backoff
+
+    @classmethod
+    async def create(
+        cls,
+        timeout: float = 30.0,
+        connect_timeout: float = 10.0,
+        max_connections: int = 20,
+        retries: int = 3,
+        backoff: float = 0.5,
+    ) -> "HttpClient":
+        connector = aiohttp.TCPConnector(limit=max_connections, ttl_dns_cache=300)
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=timeout, connect=connect_timeout),
+        )
+        return cls(session, retries, backoff)
+
+    @asynccontextmanager
+    async def get(
+        self, url: str, headers: Optional[dict[str, str]] = None
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        attempt = 0
+        while True:
+            try:
+                response = await self.session.get(url, headers=headers)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt == self.retries:
+                    raise
+                logger.warning(f"GET {url} failed ({e!r}), retrying...")
+            else:
+                if response.status not in RETRY_STATUSES or attempt == self.retries:
+                    try:
+                        yield response
+                    finally:
+                        response.release()
+                    return
+                response.release()
+                logger.warning(f"GET {url} returned {response.status}, retrying...")
+            await asyncio.sleep(self.backoff * 2**attempt)
+            attempt += 1
+
+    async def close(self) -> None:
+        await self.session.close()
+        logger.info("Closed HTTP client")
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        await self.close()
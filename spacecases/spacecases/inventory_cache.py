@@ -0,0 +1,139 @@
+import sys
+import time
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable, Optional, cast
+from common import ItemType
+from spacecases.metrics import CacheStats
+
+# id, name, type and float, the columns of inventory/get_inventory.sql
+type CachedItem = tuple[int, str, ItemType, Optional[float]]
+
+
+@dataclass
+class _Entry:
+    items: list[CachedItem]
+    expires_at: float
+
+
+class InventoryCache:
+    """
+    Per user inventories kept in memory so autocomplete doesn't query the database on
+    every keystroke. The least recently used user is evicted once max_users are cached,
+    and entries are reloaded after ttl seconds.
+
+    Commands that change a user's items write through to their entry once the change
+    has committed, so the ttl only bounds how stale an entry can get if a write is missed.
+    """
+
+    def __init__(self, max_users: int = 10000, ttl: float = 300.0) -> None:
+        self.max_users = max_users
+        self.ttl = ttl
+        self.entries: OrderedDict[int, _Entry] = OrderedDict()
+        # at most one load per user is in flight, shared by every lookup that misses
+        # while it runs. Users written to while loading may get results from before the
+        # write, so those aren't cached
+        self.loading: dict[int, asyncio.Future[list[CachedItem]]] = {}
+        self.written_while_loading: set[int] = set()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    async def get(
+        self, user_id: int, load: Callable[[], Awaitable[Iterable[Iterable[Any]]]]
+    ) -> list[CachedItem]:
+        """Get a user's items, calling load to fetch them from the database on a miss"""
+        entry = self.entries.get(user_id)
+        if entry is not None:
+            if entry.expires_at > time.monotonic():
+                self.entries.move_to_end(user_id)
+                self.hits += 1
+                return entry.items
+            del self.entries[user_id]
+            self.expirations += 1
+        self.misses += 1
+
+        task = self.loading.get(user_id)
+        if task is None:
+            task = asyncio.ensure_future(self._load(user_id, load))
+            self.loading[user_id] = task
+        else:
+            self.coalesced += 1
+        # shielded so a cancelled lookup doesn't cancel the load for the others waiting
+        return await asyncio.shield(task)
+
+    async def _load(
+        self, user_id: int, load: Callable[[], Awaitable[Iterable[Iterable[Any]]]]
+    ) -> list[CachedItem]:
+        try:
+            items = [cast(CachedItem, tuple(row)) for row in await load()]
+        finally:
+            del self.loading[user_id]
+            stale = user_id in self.written_while_loading
+            self.written_while_loading.discard(user_id)
+        if not stale:
+            self._put(user_id, items)
+        return items
+
+    def _put(self, user_id: int, items: list[CachedItem]) -> None:
+        self.entries[user_id] = _Entry(items, time.monotonic() + self.ttl)
+        self.entries.move_to_end(user_id)
+        while len(self.entries) > self.max_users:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def _written(self, user_id: int) -> Optional[_Entry]:
+        if user_id in self.loading:
+            self.written_while_loading.add(user_id)
+        return self.entries.get(user_id)
+
+    # entries are replaced rather than mutated, so callers iterating a list they got
+    # from get are unaffected by writes
+
+    def add_item(self, user_id: int, item: CachedItem) -> None:
+        entry = self._written(user_id)
+        if entry is not None:
+            entry.items = entry.items + [item]
+
+    def add_items(self, user_id: int, items: list[CachedItem]) -> None:
+        entry = self._written(user_id)
+        if entry is not None:
+            entry.items = entry.items + items
+
+    def replace_item(self, user_id: int, item: CachedItem) -> None:
+        entry = self._written(user_id)
+        if entry is not None:
+            entry.items = [item if old[0] == item[0] else old for old in entry.items]
+
+    def remove_item(self, user_id: int, item_id: int) -> None:
+        entry = self._written(user_id)
+        if entry is not None:
+            entry.items = [item for item in entry.items if item[0] != item_id]
+
+    def invalidate(self, user_id: int) -> None:
+        self._written(user_id)
+        self.entries.pop(user_id, None)
+
+    def memory_usage(self) -> int:
+        """Approximate bytes held by cached inventories, item types are shared enum members"""
+        total = sys.getsizeof(self.entries)
+        for entry in self.entries.values():
+            total += sys.getsizeof(entry) + sys.getsizeof(entry.items)
+            for item in entry.items:
+                id, name, _, float = item
+                total += sum(map(sys.getsizeof, (item, id, name, float)))
+        return total
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            size=len(self.entries),
+            hits=self.hits,
+            misses=self.misses,
+            coalesced=self.coalesced,
+            evictions=self.evictions,
+            expirations=self.expirations,
+            memory_bytes=self.memory_usage(),
+        )
@@ -1,8 +1,8 @@
 import os
-import aiohttp
 from dataclasses import dataclass
 from typing import Optional
 from common import get_logger
+from spacecases.http_client import HttpClient
 
 logger = get_logger(__name__)
 
@@ -21,7 +21,10 @@ class Leaderboard:
 
     @classmethod
     async def from_remote_json(
-        cls, leaderboard_domain: str, id: Optional[int] = None
+        cls,
+        http_client: HttpClient,
+        leaderboard_domain: str,
+        id: Optional[int] = None,
     ) -> "Leaderboard":
         if id is None:
             url = os.path.join(leaderboard_domain, "global.json")
@@ -31,17 +34,16 @@ class Leaderboard:
         logger.info(f"Refreshing leaderboard: {url}")
 
         entries: dict[int, LeaderboardEntry] = {}
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    entries = {}
-                    data = await response.json()
-                    for key, val in data.items():
-                        entries[int(key)] = LeaderboardEntry(
-                            val["inventory_value"], val["place"], val["username"]
-                        )
-                elif response.status != 404:
-                    response.raise_for_status()
+        async with http_client.get(url) as response:
+            if response.status == 200:
+                entries = {}
+                data = await response.json()
+                for key, val in data.items():
+                    entries[int(key)] = LeaderboardEntry(
+                        val["inventory_value"], val["place"], val["username"]
+                    )
+            elif response.status != 404:
+                response.raise_for_status()
         return Leaderboard(entries)
 
     def __str__(self) -> str:
@@ -0,0 +1,135 @@
+import sys
+import time
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+from common import get_logger
+from spacecases.leaderboard import Leaderboard
+from spacecases.metrics import CacheStats
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _Entry:
+    leaderboard: Leaderboard
+    stale_at: float
+
+
+class LeaderboardCache:
+    """
+    Guild leaderboards fetched the first time they are looked at, rather than for every
+    guild the bot is in. The least recently used guild is evicted once max_guilds are
+    cached.
+
+    After ttl seconds an entry is stale. Looking at a stale entry still returns it straight
+    away, but also starts reloading it in the background. At most max_refreshes of these
+    background reloads run at once.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[int], Awaitable[Leaderboard]],
+        max_guilds: int = 1000,
+        ttl: float = 300.0,
+        max_refreshes: int = 4,
+    ) -> None:
+        self.load = load
+        self.max_guilds = max_guilds
+        self.ttl = ttl
+        self.refresh_limit = asyncio.Semaphore(max_refreshes)
+        self.entries: OrderedDict[int, _Entry] = OrderedDict()
+        # at most one load per guild is in flight, shared by every lookup that misses
+        # while it runs
+        self.loading: dict[int, asyncio.Future[Leaderboard]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __contains__(self, guild_id: int) -> bool:
+        """Whether get would return straight away, stale or not"""
+        return guild_id in self.entries
+
+    async def get(self, guild_id: int) -> Leaderboard:
+        """Get a guild's leaderboard, fetching it on a miss"""
+        entry = self.entries.get(guild_id)
+        if entry is not None:
+            self.entries.move_to_end(guild_id)
+            self.hits += 1
+            if entry.stale_at <= time.monotonic() and guild_id not in self.loading:
+                self.expirations += 1
+                self.loading[guild_id] = asyncio.ensure_future(self._refresh(guild_id))
+            return entry.leaderboard
+        self.misses += 1
+
+        task = self.loading.get(guild_id)
+        if task is None:
+            task = asyncio.ensure_future(self._load(guild_id))
+            self.loading[guild_id] = task
+        else:
+            self.coalesced += 1
+        # shielded so a cancelled lookup doesn't cancel the load for the others waiting
+        return await asyncio.shield(task)
+
+    async def _load(self, guild_id: int) -> Leaderboard:
+        try:
+            leaderboard = await self.load(guild_id)
+        finally:
+            del self.loading[guild_id]
+        self._put(guild_id, leaderboard)
+        return leaderboard
+
+    async def _refresh(self, guild_id: int) -> Leaderboard:
+        # nobody awaits a background refresh unless the entry is evicted meanwhile, so a
+        # failure is logged and the stale entry is kept, to be retried on the next lookup
+        try:
+            async with self.refresh_limit:
+                leaderboard = await self.load(guild_id)
+        except Exception:
+            logger.exception(f"Failed to refresh leaderboard for guild {guild_id}")
+            entry = self.entries.get(guild_id)
+            if entry is None:
+                raise
+            return entry.leaderboard
+        finally:
+            del self.loading[guild_id]
+        self._put(guild_id, leaderboard)
+        return leaderboard
+
+    def _put(self, guild_id: int, leaderboard: Leaderboard) -> None:
+        self.entries[guild_id] = _Entry(leaderboard, time.monotonic() + self.ttl)
+        self.entries.move_to_end(guild_id)
+        while len(self.entries) > self.max_guilds:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def close(self) -> None:
+        for task in self.loading.values():
+            task.cancel()
+
+    def memory_usage(self) -> int:
+        """Approximate bytes held by cached leaderboards"""
+        total = sys.getsizeof(self.entries)
+        for entry in self.entries.values():
+            leaderboard = entry.leaderboard
+            total += sys.getsizeof(entry) + sys.getsizeof(leaderboard)
+            total += sys.getsizeof(leaderboard.users)
+            total += sys.getsizeof(leaderboard.entries)
+            for user_id, leaderboard_entry in leaderboard.entries.items():
+                total += sys.getsizeof(user_id) + sys.getsizeof(leaderboard_entry)
+                total += sys.getsizeof(leaderboard_entry.name)
+        return total
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            size=len(self.entries),
+            hits=self.hits,
+            misses=self.misses,
+            coalesced=self.coalesced,
+            evictions=self.evictions,
+            expirations=self.expirations,
+            memory_bytes=self.memory_usage(),
+        )
@@ -0,0 +1,175 @@
+import os
+import json
+import zlib
+import hashlib
+from spacecases.http_client import HttpClient
+from enum import Enum
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+from common import MetadataManifest, METADATA_SCHEMA_VERSION, get_logger
+
+logger = get_logger(__name__)
+
+
+class Refresh(Enum):
+    # the file has not changed since the last refresh
+    Unchanged = 0
+    # only prices changed, and they were patched onto the existing models
+    Prices = 1
+    # anything else changed, and the models were parsed again into a new dict
+    Replaced = 2
+
+
+def changed_prices(
+    old: dict[str, Any], new: dict[str, Any]
+) -> Optional[dict[str, int]]:
+    """
+    Prices that differ between two versions of a metadata file, or None if anything
+    other than prices differs
+    """
+    if old.keys() != new.keys():
+        return None
+    prices = {}
+    for key, value in new.items():
+        old_value = old[key]
+        if value == old_value:
+            continue
+        price = value.get("price")
+        # anything that is not a plain int goes through full validation
+        if type(price) is not int or old_value | {"price": price} != value:
+            return None
+        prices[key] = price
+    return prices
+
+
+async def fetch_trusted_checksums(http_client: HttpClient, url: str) -> dict[str, str]:
+    """
+    Checksums of the metadata files the asset service generated for this schema
+    version, or none if its manifest is missing, unreadable or for another version
+    """
+    try:
+        async with http_client.get(url) as response:
+            if response.status == 404:
+                return {}
+            response.raise_for_status()
+            manifest = MetadataManifest.model_validate_json(await response.read())
+    except Exception as e:
+        logger.warning(f"Failed to fetch metadata manifest, validating everything: {e}")
+        return {}
+    if manifest.schema_version != METADATA_SCHEMA_VERSION:
+        return {}
+    return manifest.checksums
+
+
+@dataclass
+class MetadataFileSnapshot:
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    digest: bytes
+    compressed_body: bytes
+
+
+class MetadataFile[T]:
+    """
+    A metadata JSON file on the asset domain, refreshed with conditional requests. The
+    server's ETag and Last-Modified validators are sent back so an unchanged file costs a
+    304, and a hash of the body catches unchanged files served without them. Entries are
+    only decoded again when something other than prices changed, otherwise the new prices
+    are set on the decoded entries already in use.
+
+    Files matching the checksum in the asset service's manifest are decoded as trusted,
+    skipping validation.
+
+    The last body is kept compressed to tell price changes apart from the rest, as
+    keeping its decoded JSON would take as much memory as the entries themselves.
+    """
+
+    def __init__(
+        self, url: str, decode: Callable[[dict[str, Any], bool], dict[str, T]]
+    ) -> None:
+        self.url = url
+        self.file_name = os.path.basename(url)
+        self.decode = decode
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.digest: Optional[bytes] = None
+        self.compressed_body = b""
+        self.parsed: dict[str, T] = {}
+        # bumped whenever parsed is replaced, so users of it know to rebuild
+        self.version = 0
+        # prices patched by the last refresh
+        self.patched_prices: dict[str, int] = {}
+
+    async def refresh(
+        self, http_client: HttpClient, trusted_checksums: dict[str, str]
+    ) -> Refresh:
+        self.patched_prices = {}
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        async with http_client.get(self.url, headers) as response:
+            if response.status == 304:
+                logger.debug(f"Metadata not modified: {self.url}")
+                return Refresh.Unchanged
+            response.raise_for_status()
+            body = await response.read()
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+
+        digest = hashlib.sha256(body).digest()
+        if digest == self.digest:
+            self.etag = etag
+            self.last_modified = last_modified
+            logger.debug(f"Metadata unchanged: {self.url}")
+            return Refresh.Unchanged
+        raw = json.loads(body)
+        if self.parsed:
+            old_raw = json.loads(zlib.decompress(self.compressed_body))
+            prices = changed_prices(old_raw, raw)
+        else:
+            prices = None
+        if prices is None:
+            trusted = trusted_checksums.get(self.file_name) == digest.hex()
+            self.parsed = self.decode(raw, trusted)
+            self.version += 1
+            result = Refresh.Replaced
+        else:
+            for key, price in prices.items():
+                setattr(self.parsed[key], "price", price)
+            self.patched_prices = prices
+            result = Refresh.Prices
+        # only recorded once the new version is in use, so a failed parse is retried
+        self.compressed_body = zlib.compress(body, 1)
+        self.digest = digest
+        self.etag = etag
+        self.last_modified = last_modified
+        logger.info(f"Metadata refreshed from {self.url} ({result.name.lower()})")
+        return result
+
+    def snapshot(self) -> Optional[MetadataFileSnapshot]:
+        if self.digest is None:
+            return None
+        return MetadataFileSnapshot(
+            self.url, self.etag, self.last_modified, self.digest, self.compressed_body
+        )
+
+    def restore(self, snapshot: MetadataFileSnapshot, trusted: bool) -> None:
+        """
+        Decode a body saved by an earlier run. That run decoded it successfully, so it
+        can be trusted, unless full validation is wanted. Raises ValueError if the body
+        doesn't match its digest
+        """
+        body = zlib.decompress(snapshot.compressed_body)
+        if hashlib.sha256(body).digest() != snapshot.digest:
+            raise ValueError("Snapshot body does not match its digest")
+        raw = json.loads(body)
+        self.parsed = self.decode(raw, trusted)
+        self.version += 1
+        self.patched_prices = {}
+        self.compressed_body = snapshot.compressed_body
+        self.digest = snapshot.digest
+        self.etag = snapshot.etag
+        self.last_modified = snapshot.last_modified
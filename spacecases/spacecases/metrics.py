@@ -0,0 +1,208 @@
+from bisect import bisect_left
+from dataclasses import dataclass
+from collections import defaultdict
+from typing import Optional
+
+# histogram bucket upper bounds in seconds, from 0.1ms to ~13s in steps of sqrt(2)
+BUCKETS = tuple(0.0001 * 2 ** (i / 2) for i in range(34))
+
+
+class Histogram:
+    """
+    Fixed bucket latency histogram. Observing a value is a binary search and
+    a few additions, so it is cheap enough to leave on for every query.
+    """
+
+    def __init__(self) -> None:
+        # one count per bucket, plus one for values above the last bound
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile by interpolating linearly inside the bucket it falls in
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for idx, count in enumerate(self.counts):
+            if count == 0 or cumulative + count < rank:
+                cumulative += count
+                continue
+            lower = BUCKETS[idx - 1] if idx > 0 else 0.0
+            upper = BUCKETS[idx] if idx < len(BUCKETS) else self.max
+            estimate = lower + (upper - lower) * (rank - cumulative) / count
+            return min(estimate, self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        if self.count == 0:
+            return 0.0
+        return self.sum / self.count
+
+
+@dataclass
+class PoolStats:
+    size: int
+    idle: int
+    acquired: int
+    acquires: int
+    total_wait_time: float
+    max_wait_time: float
+
+    @property
+    def mean_wait_time(self) -> float:
+        if self.acquires == 0:
+            return 0.0
+        return self.total_wait_time / self.acquires
+
+
+@dataclass
+class CacheStats:
+    size: int
+    hits: int
+    misses: int
+    coalesced: int
+    evictions: int
+    expirations: int
+    memory_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return self.hits / lookups
+
+
+@dataclass
+class CoalescerStats:
+    requests: int
+    coalesced: int
+    superseded: int
+
+
+class QueryMetrics:
+    """Execution time and pool acquire wait histograms, keyed by query file"""
+
+    def __init__(self) -> None:
+        self.execution_time: dict[str, Histogram] = defaultdict(Histogram)
+        self.pool_wait_time: dict[str, Histogram] = defaultdict(Histogram)
+
+    def observe_execution(self, query: str, seconds: float) -> None:
+        self.execution_time[query].observe(seconds)
+
+    def observe_pool_wait(self, query: str, seconds: float) -> None:
+        self.pool_wait_time[query].observe(seconds)
+
+
+def _format_histograms(
+    name: str, description: str, histograms: dict[str, Histogram]
+) -> list[str]:
+    lines = [f"# HELP {name} {description}", f"# TYPE {name} histogram"]
+    for query, histogram in sorted(histograms.items()):
+        cumulative = 0
+        for bound, count in zip(BUCKETS, histogram.counts):
+            cumulative += count
+            lines.append(
+                f'{name}_bucket{{query="{query}",le="{bound:.6g}"}} {cumulative}'
+            )
+        lines.append(f'{name}_bucket{{query="{query}",le="+Inf"}} {histogram.count}')
+        lines.append(f'{name}_sum{{query="{query}"}} {histogram.sum:.9g}')
+        lines.append(f'{name}_count{{query="{query}"}} {histogram.count}')
+    return lines
+
+
+def _format_gauge(name: str, description: str, value: float) -> list[str]:
+    return [f"# HELP {name} {description}", f"# TYPE {name} gauge", f"{name} {value}"]
+
+
+def _format_counter(name: str, description: str, value: int) -> list[str]:
+    return [f"# HELP {name} {description}", f"# TYPE {name} counter", f"{name} {value}"]
+
+
+# name, help text, type and CacheStats field of each metric exported per cache
+CACHE_METRICS = (
+    ("hits_total", "Cache lookups served from memory", "counter", "hits"),
+    ("misses_total", "Cache lookups that had to load", "counter", "misses"),
+    ("coalesced_total", "Misses that shared a load in flight", "counter", "coalesced"),
+    ("evictions_total", "Entries evicted by the size limit", "counter", "evictions"),
+    ("expirations_total", "Entries dropped after their ttl", "counter", "expirations"),
+    ("entries", "Entries currently cached", "gauge", "size"),
+    ("memory_bytes", "Approximate memory held by entries", "gauge", "memory_bytes"),
+)
+
+
+def _format_cache_stats(caches: dict[str, CacheStats]) -> list[str]:
+    lines = []
+    for suffix, description, kind, field in CACHE_METRICS:
+        name = f"spacecases_cache_{suffix}"
+        lines += [f"# HELP {name} {description}", f"# TYPE {name} {kind}"]
+        for cache, stats in sorted(caches.items()):
+            lines.append(f'{name}{{cache="{cache}"}} {getattr(stats, field)}')
+    return lines
+
+
+def to_prometheus(
+    metrics: QueryMetrics,
+    pool_stats: PoolStats,
+    replica_lag: Optional[float] = None,
+    caches: Optional[dict[str, CacheStats]] = None,
+    autocomplete: Optional[CoalescerStats] = None,
+) -> str:
+    """Render metrics in the Prometheus text exposition format"""
+    lines = _format_histograms(
+        "spacecases_query_duration_seconds",
+        "Time spent executing a query",
+        metrics.execution_time,
+    )
+    lines += _format_histograms(
+        "spacecases_pool_wait_seconds",
+        "Time spent waiting to acquire a pooled connection",
+        metrics.pool_wait_time,
+    )
+    lines += _format_gauge(
+        "spacecases_pool_size", "Open pooled connections", pool_stats.size
+    )
+    lines += _format_gauge(
+        "spacecases_pool_idle", "Idle pooled connections", pool_stats.idle
+    )
+    lines += _format_gauge(
+        "spacecases_pool_acquired", "Acquired pooled connections", pool_stats.acquired
+    )
+    if replica_lag is not None:
+        lines += _format_gauge(
+            "spacecases_replica_lag_seconds",
+            "Seconds the read replica is behind the primary",
+            replica_lag,
+        )
+    if caches:
+        lines += _format_cache_stats(caches)
+    if autocomplete is not None:
+        lines += _format_counter(
+            "spacecases_autocomplete_requests_total",
+            "Autocomplete lookups requested",
+            autocomplete.requests,
+        )
+        lines += _format_counter(
+            "spacecases_autocomplete_coalesced_total",
+            "Autocomplete lookups that shared one in flight for the same input",
+            autocomplete.coalesced,
+        )
+        lines += _format_counter(
+            "spacecases_autocomplete_superseded_total",
+            "Autocomplete lookups cancelled by a newer one for the same option",
+            autocomplete.superseded,
+        )
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,79 @@
+"""
+Work out the odds of every container from the asset domain and write them as CSV to
+stdout, with the same environment variables as the bot
+
+uv run python -m spacecases.odds_report > odds.csv
+"""
+
+import os
+import csv
+import sys
+import asyncio
+from dotenv import load_dotenv
+from common import (
+    get_skin_cases,
+    get_skin_metadata,
+    get_souvenir_packages,
+    get_sticker_capsules,
+    get_sticker_metadata,
+)
+from spacecases.environment import DEFAULT_ASSET_DOMAIN
+from spacecases.simulation import ContainerSimulator, container_odds
+
+
+async def main() -> None:
+    load_dotenv(override=True)
+    asset_domain = os.environ.get("ASSET_DOMAIN", DEFAULT_ASSET_DOMAIN)
+    (
+        skin_metadata,
+        sticker_metadata,
+        skin_cases,
+        souvenir_packages,
+        sticker_capsules,
+    ) = await asyncio.gather(
+        get_skin_metadata(asset_domain),
+        get_sticker_metadata(asset_domain),
+        get_skin_cases(asset_domain),
+        get_souvenir_packages(asset_domain),
+        get_sticker_capsules(asset_domain),
+    )
+    item_prices = {
+        name: metadatum.price
+        for name, metadatum in (skin_metadata | sticker_metadata).items()
+    }
+    containers = skin_cases | souvenir_packages | sticker_capsules
+    simulators = {
+        name: ContainerSimulator(container)
+        for name, container in containers.items()
+        if container.drops
+    }
+    odds = container_odds(simulators, item_prices)
+
+    writer = csv.writer(sys.stdout)
+    writer.writerow(
+        [
+            "container",
+            "cost",
+            "expected_value",
+            "expected_return",
+            "standard_deviation",
+            "profit_probability",
+        ]
+    )
+    for name, odds_of_container in sorted(
+        odds.items(), key=lambda item: item[1].expected_return, reverse=True
+    ):
+        writer.writerow(
+            [
+                containers[name].formatted_name,
+                odds_of_container.cost,
+                f"{odds_of_container.expected_value:.2f}",
+                f"{odds_of_container.expected_return:.2f}",
+                f"{odds_of_container.standard_deviation:.2f}",
+                f"{odds_of_container.profit_probability:.6f}",
+            ]
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+import json
+import random
+import hashlib
+from typing import Optional, TextIO
+from common import get_logger
+
+logger = get_logger(__name__)
+
+
+def load_replay_log(path: str) -> dict[int, int]:
+    """Seeds by interaction id from a replay log written by RngProvider"""
+    with open(path, encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    return {entry["interaction_id"]: entry["seed"] for entry in entries}
+
+
+class RngProvider:
+    """
+    Hands out a random generator per interaction for everything left to chance, such as
+    what a container drops or whether an upgrade succeeds.
+
+    With a seed, each interaction's generator is derived from the seed and the interaction
+    id, so runs are reproducible however interactions interleave. Without one, seeds are
+    drawn from the OS. Either way the seed of every interaction can be appended to a
+    replay log, and seeds from the log at replay_from_path are used again for the same
+    interaction ids.
+    """
+
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        replay_log_path: Optional[str] = None,
+        replay_from_path: Optional[str] = None,
+    ) -> None:
+        self.seed = seed
+        self.seeds = random.SystemRandom()
+        self.replay_seeds: dict[int, int] = {}
+        if replay_from_path is not None:
+            # read before the replay log is opened, in case they are the same file
+            self.replay_seeds = load_replay_log(replay_from_path)
+            logger.info(
+                f"Replaying {len(self.replay_seeds)} interaction seeds from {replay_from_path}"
+            )
+        self.replay_log: Optional[TextIO] = None
+        if replay_log_path is not None:
+            self.replay_log = open(replay_log_path, "a", encoding="utf-8", buffering=1)
+            logger.info(f"Logging interaction seeds to {replay_log_path}")
+
+    def get_seed(self, interaction_id: int) -> int:
+        seed = self.replay_seeds.get(interaction_id)
+        if seed is not None:
+            return seed
+        if self.seed is None:
+            return self.seeds.getrandbits(64)
+        digest = hashlib.blake2b(
+            f"{self.seed}:{interaction_id}".encode(), digest_size=8
+        ).digest()
+        return int.from_bytes(digest)
+
+    def for_interaction(
+        self, interaction_id: int, user_id: int, action: str
+    ) -> random.Random:
+        seed = self.get_seed(interaction_id)
+        if self.replay_log is not None:
+            entry = {
+                "interaction_id": interaction_id,
+                "user_id": user_id,
+                "action": action,
+                "seed": seed,
+            }
+            self.replay_log.write(json.dumps(entry) + "\n")
+        return random.Random(seed)
+
+    def close(self) -> None:
+        if self.replay_log is not None:
+            self.replay_log.close()
+            self.replay_log = None
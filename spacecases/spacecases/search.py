@@ -0,0 +1,95 @@
+import heapq
+from array import array
+from collections import Counter, defaultdict
+from itertools import chain, islice
+from typing import Iterable
+from marisa_trie import Trie
+
+GRAM_SIZE = 3
+
+# the most choices an autocomplete response can hold
+MAX_RESULTS = 25
+
+# names containing a query's rarest trigram that are checked for the full query, bounds
+# the work for queries made only of common trigrams
+MAX_SUBSTRING_CANDIDATES = 2000
+
+# name ids counted when ranking approximate matches. The query's rarest trigrams say the
+# most about which name was meant, so they are counted first until this is reached,
+# which bounds the work however large the catalogue grows
+MAX_COUNTED_IDS = 2000
+
+# fraction of the counted trigrams an approximate match must share with the query
+MIN_GRAM_OVERLAP = 0.5
+
+_EMPTY = array("I")
+
+
+def ngrams(text: str) -> set[str]:
+    return {text[i : i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+class SearchIndex:
+    """
+    Search over normalised names (see remove_skin_name_formatting), ranking names that
+    start with the query first, in trie order, then names containing it, then names
+    sharing most of its trigrams so small typos still match. Shorter names come first
+    among names containing the query or sharing as many trigrams.
+
+    Built once per catalogue refresh. Lookups never scan the whole catalogue, only the
+    trie for prefixes and the inverted trigram index otherwise.
+    """
+
+    def __init__(self, names: Iterable[str]) -> None:
+        # ids are positions in this list, so lower ids rank first
+        self.names = sorted(set(names), key=lambda name: (len(name), name))
+        self.trie = Trie(self.names)
+        postings: defaultdict[str, array] = defaultdict(lambda: array("I"))
+        for id, name in enumerate(self.names):
+            for gram in ngrams(name):
+                postings[gram].append(id)
+        self.postings = dict(postings)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def search(self, query: str, limit: int = MAX_RESULTS) -> list[str]:
+        results = list(islice(self.trie.keys(query), limit))
+        if len(results) == limit or len(query) < GRAM_SIZE:
+            return results
+        found = set(results)
+
+        grams = ngrams(query)
+        postings = sorted((self.postings.get(gram, _EMPTY) for gram in grams), key=len)
+        # a name containing the query contains all of its trigrams, so the names with
+        # the rarest one are the only candidates, and they are already in rank order
+        for id in islice(postings[0], MAX_SUBSTRING_CANDIDATES):
+            name = self.names[id]
+            if query in name and name not in found:
+                results.append(name)
+                found.add(name)
+                if len(results) == limit:
+                    return results
+
+        # trigrams made by a typo have no postings and are skipped
+        counted: list[array] = []
+        counted_ids = 0
+        for posting in postings:
+            if len(posting) == 0:
+                continue
+            if counted and counted_ids + len(posting) > MAX_COUNTED_IDS:
+                break
+            counted.append(posting)
+            counted_ids += len(posting)
+        min_overlap = max(1, round(len(counted) * MIN_GRAM_OVERLAP))
+        counts = Counter(chain.from_iterable(counted))
+        candidates = [id for id, count in counts.items() if count >= min_overlap]
+        for id in heapq.nsmallest(
+            limit + len(found), candidates, key=lambda id: (-counts[id], id)
+        ):
+            name = self.names[id]
+            if name not in found:
+                results.append(name)
+                if len(results) == limit:
+                    break
+        return results
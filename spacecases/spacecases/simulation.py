@@ -0,0 +1,118 @@
+import math
+import numpy as np
+from dataclasses import dataclass
+from typing import Mapping
+from common import Container, ItemDrop, get_logger
+from spacecases.constants import KEY_PRICE
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class ContainerOdds:
+    """What opening a container is worth, worked out exactly from its drop table"""
+
+    cost: int
+    expected_value: float
+    standard_deviation: float
+    profit_probability: float
+
+    @property
+    def expected_return(self) -> float:
+        return self.expected_value - self.cost
+
+
+def _alias_table(probabilities: list[float]) -> tuple[np.ndarray, np.ndarray]:
+    """AliasTable over float probabilities, as arrays to draw from in bulk"""
+    n = len(probabilities)
+    scaled = [probability * n for probability in probabilities]
+    thresholds = np.ones(n)
+    aliases = np.arange(n)
+    small = [i for i, probability in enumerate(scaled) if probability < 1.0]
+    large = [i for i, probability in enumerate(scaled) if probability >= 1.0]
+    while small and large:
+        less = small.pop()
+        more = large[-1]
+        thresholds[less] = scaled[less]
+        aliases[less] = more
+        scaled[more] -= 1.0 - scaled[less]
+        if scaled[more] < 1.0:
+            small.append(large.pop())
+    return thresholds, aliases
+
+
+class ContainerSimulator:
+    """
+    The chance of a container dropping each item, with the odds of ContainerSampler.
+    Every item a drop can resolve to is its own outcome here, weighted by the drop's
+    weight and the share of wear draws giving that item. That is enough to work out the
+    container's odds exactly, and to draw openings in bulk as a single alias table draw
+    """
+
+    def __init__(self, container: Container) -> None:
+        self.container = container
+        total = sum(drop.weight for drop in container.drops)
+        if total <= 0:
+            raise ValueError("A container needs something to drop to be simulated")
+        self.item_keys: list[str] = []
+        probabilities: dict[str, float] = {}
+        for drop in container.drops:
+            if isinstance(drop, ItemDrop):
+                shares = [(drop.item_key, 1.0)]
+            else:
+                cuts = [0.0, *drop.wear_cuts, 1.0]
+                shares = [
+                    (item_key, high - low)
+                    for item_key, low, high in zip(drop.item_keys, cuts, cuts[1:])
+                ]
+            for item_key, share in shares:
+                if item_key not in probabilities:
+                    probabilities[item_key] = 0.0
+                    self.item_keys.append(item_key)
+                probabilities[item_key] += drop.weight / total * share
+        self.probabilities = np.array(list(probabilities.values()))
+        self.thresholds, self.aliases = _alias_table(list(probabilities.values()))
+
+    @property
+    def cost(self) -> int:
+        if self.container.requires_key:
+            return self.container.price + KEY_PRICE
+        return self.container.price
+
+    def draw(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """Indices into item_keys of what size openings drop"""
+        # the whole part of a scaled draw picks the column, the fraction decides between
+        # the column and its alias
+        scaled = rng.random(size) * len(self.thresholds)
+        columns = np.minimum(scaled.astype(np.int64), len(self.thresholds) - 1)
+        return np.where(
+            scaled - columns < self.thresholds[columns], columns, self.aliases[columns]
+        )
+
+    def odds(self, item_prices: Mapping[str, int]) -> ContainerOdds:
+        """Raises KeyError if an item the container drops has no price"""
+        prices = np.array(
+            [item_prices[item_key] for item_key in self.item_keys], dtype=np.float64
+        )
+        cost = self.cost
+        mean = float(self.probabilities @ prices)
+        variance = float(self.probabilities @ np.square(prices - mean))
+        return ContainerOdds(
+            cost=cost,
+            expected_value=mean,
+            standard_deviation=math.sqrt(variance),
+            profit_probability=float(self.probabilities[prices > cost].sum()),
+        )
+
+
+def container_odds(
+    simulators: Mapping[str, ContainerSimulator], item_prices: Mapping[str, int]
+) -> dict[str, ContainerOdds]:
+    """Odds of every container, leaving out those dropping items with no price"""
+    odds = {}
+    for name, simulator in simulators.items():
+        try:
+            odds[name] = simulator.odds(item_prices)
+        except KeyError as e:
+            logger.warning(f"Container {name} drops {e}, which has no price")
+    return odds
@@ -0,0 +1,73 @@
+import os
+import pickle
+from dataclasses import asdict
+from typing import Any, Sequence
+from common import METADATA_SCHEMA_VERSION, get_logger
+from spacecases.metadata_file import MetadataFile, MetadataFileSnapshot
+
+logger = get_logger(__name__)
+
+# bumped whenever the layout of the snapshot file changes
+SNAPSHOT_VERSION = 1
+
+
+def save_snapshot(path: str, snapshots: Sequence[MetadataFileSnapshot]) -> None:
+    """
+    Write the metadata files to a local snapshot, replacing the old one only once the new
+    one is fully written so a crash never leaves a torn snapshot behind
+    """
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "schema_version": METADATA_SCHEMA_VERSION,
+        "files": [asdict(snapshot) for snapshot in snapshots],
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary_path, path)
+    logger.info(f"Saved metadata snapshot to {path}")
+
+
+def load_snapshot(
+    path: str, files: Sequence[MetadataFile[Any]], trusted: bool = True
+) -> bool:
+    """
+    Restore metadata files from a snapshot written by save_snapshot, returning whether
+    every file was restored. Snapshots from another version or asset domain are ignored.
+    Unless trusted, restored files are fully validated
+    """
+    try:
+        with open(path, "rb") as f:
+            snapshot = pickle.load(f)
+    except FileNotFoundError:
+        logger.info(f"No metadata snapshot at {path}")
+        return False
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable metadata snapshot at {path}: {e}")
+        return False
+    if (
+        snapshot.get("version") != SNAPSHOT_VERSION
+        or snapshot.get("schema_version") != METADATA_SCHEMA_VERSION
+    ):
+        logger.info(f"Ignoring metadata snapshot at {path} from another version")
+        return False
+
+    file_snapshots = {
+        fields["url"]: MetadataFileSnapshot(**fields) for fields in snapshot["files"]
+    }
+    restored = 0
+    for file in files:
+        file_snapshot = file_snapshots.get(file.url)
+        if file_snapshot is None:
+            continue
+        try:
+            file.restore(file_snapshot, trusted)
+        except Exception as e:
+            logger.warning(f"Failed to restore {file.url} from snapshot: {e}")
+            continue
+        restored += 1
+    logger.info(f"Restored {restored}/{len(files)} metadata files from {path}")
+    return restored == len(files)
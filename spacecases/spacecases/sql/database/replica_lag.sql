@@ -0,0 +1,10 @@
+-- Seconds the replica is behind the primary. Zero when it has replayed everything it received,
+-- or when the server isn't a replica at all
+SELECT COALESCE(
+    CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END,
+    0
+)::DOUBLE PRECISION AS lag;
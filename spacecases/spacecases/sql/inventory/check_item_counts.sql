@@ -0,0 +1,6 @@
+-- Users whose maintained item_count doesn't match the items they actually own
+SELECT users.id, users.item_count, COUNT(items.id) AS actual_item_count
+FROM "users"
+LEFT JOIN items ON items.owner_id = users.id
+GROUP BY users.id
+HAVING users.item_count <> COUNT(items.id);
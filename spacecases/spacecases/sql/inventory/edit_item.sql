@@ -2,7 +2,7 @@ UPDATE items
 SET 
     type = $3,
     name = $4,
-    details = $5
+    float = $5
 WHERE id = $2
   AND owner_id = $1
 RETURNING id;
@@ -1,2 +1,2 @@
-SELECT id, name, type, details FROM items
+SELECT id, name, type, float FROM items
 WHERE owner_id = $1;
\ No newline at end of file
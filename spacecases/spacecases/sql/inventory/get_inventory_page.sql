@@ -0,0 +1,6 @@
+-- A page of a user's items in id order, starting after the id of the last item on the previous page
+SELECT id, type, name, float
+FROM items
+WHERE owner_id = $1 AND id > $2
+ORDER BY id
+LIMIT $3;
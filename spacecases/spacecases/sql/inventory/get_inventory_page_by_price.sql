@@ -0,0 +1,12 @@
+-- A page of a user's items, most valuable first, starting after the price and id of the last item
+-- on the previous page
+SELECT id, type, name, float, sort_key
+FROM (
+    SELECT items.id, items.type, items.name, items.float, COALESCE(item_metadata.price, 0) AS sort_key
+    FROM items
+    LEFT JOIN item_metadata ON item_metadata.name = items.name
+    WHERE items.owner_id = $1
+) AS inventory
+WHERE sort_key < $2 OR (sort_key = $2 AND id > $3)
+ORDER BY sort_key DESC, id
+LIMIT $4;
@@ -0,0 +1,12 @@
+-- A user's inventory capacity, item count and total value. Returns no rows if the user doesn't exist
+SELECT
+    inventory_capacity,
+    item_count,
+    (
+        SELECT COALESCE(SUM(item_metadata.price), 0)::BIGINT
+        FROM items
+        JOIN item_metadata ON item_metadata.name = items.name
+        WHERE items.owner_id = $1
+    ) AS inventory_value
+FROM "users"
+WHERE id = $1;
@@ -1,15 +1,15 @@
 WITH user_exists AS (
-    SELECT EXISTS (SELECT 1 FROM "users" WHERE id = $1 FOR UPDATE) AS user_exists
+    SELECT EXISTS (SELECT 1 FROM "users" WHERE id = $1) AS user_exists
 ),
 item AS (
-    SELECT name, type, details
+    SELECT name, type, float
     FROM items
     WHERE owner_id = $1 AND id = $2
 )
 SELECT 
     (SELECT user_exists FROM user_exists) AS user_exists,
     CASE WHEN EXISTS (SELECT 1 FROM item) 
-         THEN ROW(item.name, item.type, item.details) 
+         THEN ROW(item.name, item.type, item.float) 
          ELSE NULL 
     END AS item_details
 FROM user_exists
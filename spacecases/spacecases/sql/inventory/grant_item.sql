@@ -0,0 +1,2 @@
+-- see migrations/5_open_functions.sql
+SELECT registered, item_id FROM grant_item($1, $2, $3, $4);
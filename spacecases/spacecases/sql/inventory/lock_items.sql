@@ -1 +0,0 @@
-LOCK TABLE items IN EXCLUSIVE MODE;
\ No newline at end of file
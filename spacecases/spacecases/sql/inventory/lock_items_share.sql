@@ -0,0 +1,2 @@
+-- Blocks inserts and deletes on items until the end of the transaction, while still allowing reads
+LOCK TABLE items IN SHARE MODE;
@@ -0,0 +1,2 @@
+-- see migrations/8_open_containers_function.sql
+SELECT deducted, balance_before_transaction, item_ids, sold_for FROM open_containers($1, $2, $3, $4, $5, $6);
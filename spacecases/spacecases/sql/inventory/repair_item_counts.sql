@@ -0,0 +1,11 @@
+-- Recount every user's items, returning the users whose count was wrong
+UPDATE "users"
+SET item_count = counts.actual_item_count
+FROM (
+    SELECT users.id, COUNT(items.id) AS actual_item_count
+    FROM "users"
+    LEFT JOIN items ON items.owner_id = users.id
+    GROUP BY users.id
+) AS counts
+WHERE users.id = counts.id AND users.item_count <> counts.actual_item_count
+RETURNING users.id;
@@ -0,0 +1,2 @@
+-- see migrations/5_open_functions.sql
+SELECT sell_unboxed_item($1, $2) AS balance;
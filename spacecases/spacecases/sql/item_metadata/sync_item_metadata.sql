@@ -0,0 +1,6 @@
+-- Upsert every item's price and rarity, only writing rows that changed
+INSERT INTO item_metadata (name, price, rarity)
+SELECT * FROM unnest($1::TEXT[], $2::BIGINT[], $3::SMALLINT[])
+ON CONFLICT (name) DO UPDATE
+SET price = EXCLUDED.price, rarity = EXCLUDED.rarity
+WHERE (item_metadata.price, item_metadata.rarity) IS DISTINCT FROM (EXCLUDED.price, EXCLUDED.rarity);
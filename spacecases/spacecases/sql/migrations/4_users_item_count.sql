@@ -0,0 +1,32 @@
+-- Keep a count of each user's items on their row so capacity checks don't need to count items
+ALTER TABLE users ADD COLUMN item_count BIGINT NOT NULL DEFAULT 0;
+
+UPDATE users
+SET item_count = counts.item_count
+FROM (
+    SELECT owner_id, COUNT(*) AS item_count
+    FROM items
+    GROUP BY owner_id
+) AS counts
+WHERE users.id = counts.owner_id;
+
+CREATE FUNCTION maintain_item_count() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE users SET item_count = item_count + 1 WHERE id = NEW.owner_id;
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE users SET item_count = item_count - 1 WHERE id = OLD.owner_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER items_maintain_item_count
+AFTER INSERT OR DELETE ON items
+FOR EACH ROW EXECUTE FUNCTION maintain_item_count();
+
+CREATE TRIGGER items_owner_changed_maintain_item_count
+AFTER UPDATE OF owner_id ON items
+FOR EACH ROW WHEN (OLD.owner_id IS DISTINCT FROM NEW.owner_id)
+EXECUTE FUNCTION maintain_item_count();
@@ -0,0 +1,51 @@
+-- Server side functions for each step of /open, so every user action is a single round trip
+
+-- Deduct an amount from a user's balance if they can afford it. Returns no rows if the user doesn't exist
+CREATE FUNCTION try_deduct_balance(p_user_id BIGINT, p_amount BIGINT)
+RETURNS TABLE (deducted BOOLEAN, balance_before_transaction BIGINT) AS $$
+BEGIN
+    SELECT balance >= p_amount, balance
+    INTO deducted, balance_before_transaction
+    FROM users
+    WHERE id = p_user_id
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+
+    IF deducted THEN
+        UPDATE users SET balance = balance - p_amount WHERE id = p_user_id;
+    END IF;
+    RETURN NEXT;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Add an item to a user's inventory if they have space. item_id is NULL when they don't
+CREATE FUNCTION grant_item(p_user_id BIGINT, p_type item_type, p_name TEXT, p_details JSONB)
+RETURNS TABLE (registered BOOLEAN, item_id BIGINT) AS $$
+DECLARE
+    has_space BOOLEAN;
+BEGIN
+    -- the row lock serialises this user's grants, the insert then sees the latest item_count
+    SELECT item_count < inventory_capacity
+    INTO has_space
+    FROM users
+    WHERE id = p_user_id
+    FOR UPDATE;
+
+    registered := FOUND;
+    IF registered AND has_space THEN
+        INSERT INTO items (owner_id, type, name, details)
+        VALUES (p_user_id, p_type, p_name, p_details)
+        RETURNING id INTO item_id;
+    END IF;
+    RETURN NEXT;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Credit a user for an unboxed item they sold. Returns their new balance, or NULL if they don't exist
+CREATE FUNCTION sell_unboxed_item(p_user_id BIGINT, p_price BIGINT)
+RETURNS BIGINT AS $$
+    UPDATE users SET balance = balance + p_price WHERE id = p_user_id RETURNING balance;
+$$ LANGUAGE sql;
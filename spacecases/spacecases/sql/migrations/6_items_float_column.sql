@@ -0,0 +1,39 @@
+-- The only thing details ever held was a skin's float, so store it as a typed column instead
+ALTER TABLE items ADD COLUMN float DOUBLE PRECISION;
+
+UPDATE items
+SET float = (details->>'float')::DOUBLE PRECISION
+WHERE type = 'skin';
+
+ALTER TABLE items
+    ADD CONSTRAINT items_float_only_on_skins CHECK ((type = 'skin') = (float IS NOT NULL));
+
+ALTER TABLE items DROP COLUMN details;
+
+-- Lets per user float queries such as "best float I own" read the index instead of the whole inventory
+CREATE INDEX idx_items_owner_id_float ON items (owner_id, float) WHERE float IS NOT NULL;
+
+DROP FUNCTION grant_item(BIGINT, item_type, TEXT, JSONB);
+
+-- Add an item to a user's inventory if they have space. item_id is NULL when they don't
+CREATE FUNCTION grant_item(p_user_id BIGINT, p_type item_type, p_name TEXT, p_float DOUBLE PRECISION)
+RETURNS TABLE (registered BOOLEAN, item_id BIGINT) AS $$
+DECLARE
+    has_space BOOLEAN;
+BEGIN
+    -- the row lock serialises this user's grants, the insert then sees the latest item_count
+    SELECT item_count < inventory_capacity
+    INTO has_space
+    FROM users
+    WHERE id = p_user_id
+    FOR UPDATE;
+
+    registered := FOUND;
+    IF registered AND has_space THEN
+        INSERT INTO items (owner_id, type, name, float)
+        VALUES (p_user_id, p_type, p_name, p_float)
+        RETURNING id INTO item_id;
+    END IF;
+    RETURN NEXT;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,11 @@
+-- Prices and rarities from the item metadata, kept in sync by the bot, so inventories can be sorted
+-- and valued without sending every item back to the bot
+CREATE TABLE item_metadata (
+    name TEXT PRIMARY KEY,
+    price BIGINT NOT NULL,
+    rarity SMALLINT NOT NULL
+);
+
+-- Keyset pagination walks a user's items in id order, this index also serves lookups by owner alone
+CREATE INDEX idx_items_owner_id_id ON items (owner_id, id);
+DROP INDEX idx_items_owner_id;
@@ -0,0 +1,54 @@
+-- Open several containers in a single round trip: deduct their cost, add what they dropped to the user's
+-- inventory while they have space and sell the rest. Drops are kept in the order given, so pass the ones
+-- to keep first. Returns no rows if the user doesn't exist, and changes nothing if they can't afford it
+CREATE FUNCTION open_containers(
+    p_user_id BIGINT,
+    p_cost BIGINT,
+    p_types item_type[],
+    p_names TEXT[],
+    p_floats DOUBLE PRECISION[],
+    p_prices BIGINT[]
+)
+RETURNS TABLE (deducted BOOLEAN, balance_before_transaction BIGINT, item_ids BIGINT[], sold_for BIGINT) AS $$
+DECLARE
+    free_space BIGINT;
+    kept RECORD;
+    item_id BIGINT;
+BEGIN
+    SELECT balance >= p_cost, balance, GREATEST(inventory_capacity - item_count, 0)
+    INTO deducted, balance_before_transaction, free_space
+    FROM users
+    WHERE id = p_user_id
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+
+    IF NOT deducted THEN
+        RETURN NEXT;
+        RETURN;
+    END IF;
+
+    -- inserted one at a time so each id is stored at its drop's position, the order
+    -- ids come back from a multi-row insert isn't guaranteed
+    item_ids := '{}';
+    FOR kept IN
+        SELECT *
+        FROM unnest(p_types[1:free_space], p_names[1:free_space], p_floats[1:free_space])
+            WITH ORDINALITY AS kept (type, name, float, ordinality)
+    LOOP
+        INSERT INTO items (owner_id, type, name, float)
+        VALUES (p_user_id, kept.type, kept.name, kept.float)
+        RETURNING id INTO item_id;
+        item_ids[kept.ordinality] := item_id;
+    END LOOP;
+
+    SELECT COALESCE(SUM(price), 0)
+    INTO sold_for
+    FROM unnest(p_prices[free_space + 1:]) AS sold (price);
+
+    UPDATE users SET balance = balance - p_cost + sold_for WHERE id = p_user_id;
+    RETURN NEXT;
+END;
+$$ LANGUAGE plpgsql;
@@ -1,2 +0,0 @@
-SELECT EXISTS (SELECT 1 FROM "users" WHERE id = ($1) FOR UPDATE);
-
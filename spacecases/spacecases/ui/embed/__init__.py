@@ -1,4 +1,5 @@
 from .general import (
+    respond,
     send_err_embed,
     send_success_embed,
     create_err_embed,
@@ -10,6 +11,7 @@ from .exception import send_exception_embed
 from .paginated_embed import send_paginated_embed
 
 __all__ = [
+    "respond",
     "send_err_embed",
     "send_success_embed",
     "create_err_embed",
@@ -1,5 +1,5 @@
 import discord
-from . import send_err_embed
+from . import respond, send_err_embed
 from spacecases.exceptions import (
     UserNotRegisteredError,
     InsufficientBalanceError,
@@ -30,7 +30,7 @@ async def send_exception_embed(
             description=f"You need **{currency_str_format(diff)}** more to perform this action",
             color=discord.Color.red(),
         )
-        await interaction.response.send_message(embed=e, ephemeral=ephemeral)
+        await respond(interaction, e, ephemeral=ephemeral)
     elif isinstance(exception, ItemDoesNotExistError):
         await send_err_embed(
             interaction, f"Item `{exception.item}` does **not** exist", ephemeral
@@ -59,5 +59,5 @@ async def send_exception_embed(
             description="It has been reported automatically",
             color=discord.Color.red(),
         )
-        await interaction.response.send_message(embed=e, ephemeral=True)
+        await respond(interaction, e, ephemeral=True)
         logger.exception(exception)
@@ -16,6 +16,21 @@ def create_err_embed(msg_content: str) -> discord.Embed:
     return create_embed(msg_content, discord.Color.red())
 
 
+async def respond(
+    interaction: discord.Interaction,
+    embed: discord.Embed,
+    view: discord.ui.View = discord.utils.MISSING,
+    ephemeral: bool = False,
+) -> None:
+    """Respond to an interaction, as a followup if the response was deferred"""
+    if interaction.response.is_done():
+        await interaction.followup.send(embed=embed, view=view, ephemeral=ephemeral)
+    else:
+        await interaction.response.send_message(
+            embed=embed, view=view, ephemeral=ephemeral
+        )
+
+
 async def send_embed(
     interaction: discord.Interaction,
     msg_content: str,
@@ -23,30 +38,21 @@ async def send_embed(
     ephemeral: bool = False,
 ) -> None:
     embed = create_embed(msg_content, color)
-    await interaction.response.send_message(
-        embed=embed,
-        ephemeral=ephemeral,
-    )
+    await respond(interaction, embed, ephemeral=ephemeral)
 
 
 async def send_success_embed(
     interaction: discord.Interaction, msg_content: str, ephemeral: bool = False
 ) -> None:
     embed = create_success_embed(msg_content)
-    await interaction.response.send_message(
-        embed=embed,
-        ephemeral=ephemeral,
-    )
+    await respond(interaction, embed, ephemeral=ephemeral)
 
 
 async def send_err_embed(
     interaction: discord.Interaction, msg_content: str, ephemeral: bool = False
 ) -> None:
     embed = create_err_embed(msg_content)
-    await interaction.response.send_message(
-        embed=embed,
-        ephemeral=ephemeral,
-    )
+    await respond(interaction, embed, ephemeral=ephemeral)
 
 
 def get_rarity_embed_color(rarity: Rarity) -> int:
@@ -1,5 +1,5 @@
 import discord
-from spacecases.ui.embed import create_err_embed
+from spacecases.ui.embed import create_err_embed, respond
 
 
 class PaginatedEmbedView(discord.ui.View):
@@ -49,7 +49,8 @@ async def send_paginated_embed(
     if len(pages) == 0:
         raise ValueError("Can't provide 0 embed pages")
     else:
-        await interaction.response.send_message(
-            embed=pages[start_page - 1],
-            view=PaginatedEmbedView(interaction, pages, start_page - 1),
+        await respond(
+            interaction,
+            pages[start_page - 1],
+            PaginatedEmbedView(interaction, pages, start_page - 1),
         )
@@ -0,0 +1,57 @@
+import json
+from common import Condition, SkinMetadatum, StickerMetadatum
+from spacecases.catalogue import decode_skin_metadata, decode_sticker_metadata
+
+ASSET_DOMAIN = "https://assets.spacecases.xyz"
+
+
+def skin_metadata_file() -> dict:
+    skins = {
+        f"ak47redline{condition.name}": {
+            "formatted_name": f"AK-47 | Redline ({condition})",
+            "condition": condition.value,
+            "rarity": 3,
+            "price": 1000 + condition.value,
+            "image_url": f"{ASSET_DOMAIN}/generated/images/unformatted/ak47redline{condition.name}.png",
+            "description": "Red line, right down the middle",
+            "min_float": 0.1,
+            "max_float": 0.7,
+        }
+        for condition in Condition
+    }
+    # decoded from JSON like the real files, so no strings are shared between entries
+    return json.loads(json.dumps(skins))
+
+
+def test_decode_skin_metadata() -> None:
+    raw_json = skin_metadata_file()
+    for trusted in (False, True):
+        records = decode_skin_metadata(raw_json, ASSET_DOMAIN, trusted)
+        for name, value in raw_json.items():
+            metadatum = SkinMetadatum.model_validate(value)
+            for field in SkinMetadatum.model_fields:
+                assert getattr(records[name], field) == getattr(metadatum, field)
+        first, second = list(records.values())[:2]
+        assert first.condition is Condition.FactoryNew
+        assert first.description is second.description
+        assert first._image_url is None
+
+
+def test_decode_sticker_metadata_keeps_unusual_image_urls() -> None:
+    raw_json = {
+        "stickercrown": {
+            "formatted_name": "Sticker | Crown (Foil)",
+            "rarity": 4,
+            "price": 100000,
+            "image_url": "https://cdn.example.com/crown.png",
+        }
+    }
+    for trusted in (False, True):
+        record = decode_sticker_metadata(raw_json, ASSET_DOMAIN, trusted)[
+            "stickercrown"
+        ]
+        metadatum = StickerMetadatum.model_validate(raw_json["stickercrown"])
+        assert record.image_url == metadatum.image_url
+        assert record.rarity == metadatum.rarity
+        record.price = 5
+        assert record.price == 5
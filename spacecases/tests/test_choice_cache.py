@@ -0,0 +1,34 @@
+from discord import app_commands
+from spacecases.choice_cache import ChoiceCache
+
+
+def choices(*names: str) -> list[app_commands.Choice[str]]:
+    return [app_commands.Choice(name=name, value=name) for name in names]
+
+
+def test_choice_cache_hit_after_miss() -> None:
+    cache = ChoiceCache()
+    assert cache.get("ak") is None
+    cache.put("ak", choices("AK-47 | Redline"))
+    assert cache.get("ak") == choices("AK-47 | Redline")
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+    assert stats.memory_bytes > 0
+
+
+def test_choice_cache_evicts_least_recently_used() -> None:
+    cache = ChoiceCache(max_size=2)
+    cache.put("a", choices("a"))
+    cache.put("b", choices("b"))
+    cache.get("a")
+    cache.put("c", choices("c"))
+    assert list(cache.entries) == ["a", "c"]
+    assert cache.evictions == 1
+
+
+def test_choice_cache_clear() -> None:
+    cache = ChoiceCache()
+    cache.put("ak", choices("AK-47 | Redline"))
+    cache.clear()
+    assert cache.get("ak") is None
+    assert cache.stats().size == 0
@@ -0,0 +1,99 @@
+import asyncio
+import discord
+import pytest
+from typing import cast
+from types import SimpleNamespace
+from spacecases.coalescer import AutocompleteCoalescer
+
+
+def fake_interaction(user_id: int, current: str) -> discord.Interaction:
+    interaction = SimpleNamespace(
+        user=SimpleNamespace(id=user_id), namespace=[("name", current)]
+    )
+    return cast(discord.Interaction, interaction)
+
+
+def slow_lookup(result: str, calls: list[str]):
+    async def lookup():
+        calls.append(result)
+        await asyncio.sleep(0.01)
+        return [result]
+
+    return lookup
+
+
+def test_identical_lookups_share_one_result() -> None:
+    coalescer = AutocompleteCoalescer()
+    calls: list[str] = []
+
+    async def run():
+        return await asyncio.gather(
+            coalescer.run(
+                fake_interaction(1, "ak"), "item.name", slow_lookup("ak", calls)
+            ),
+            coalescer.run(
+                fake_interaction(1, "ak"), "item.name", slow_lookup("ak", calls)
+            ),
+        )
+
+    assert asyncio.run(run()) == [["ak"], ["ak"]]
+    assert calls == ["ak"]
+    assert coalescer.stats().coalesced == 1
+    assert not coalescer.in_flight
+
+
+def test_newer_lookup_supersedes_older() -> None:
+    coalescer = AutocompleteCoalescer()
+    calls: list[str] = []
+
+    async def run():
+        older = asyncio.ensure_future(
+            coalescer.run(
+                fake_interaction(1, "a"), "item.name", slow_lookup("a", calls)
+            )
+        )
+        await asyncio.sleep(0)
+        newer = await coalescer.run(
+            fake_interaction(1, "ak"), "item.name", slow_lookup("ak", calls)
+        )
+        return await older, newer
+
+    assert asyncio.run(run()) == ([], ["ak"])
+    stats = coalescer.stats()
+    assert (stats.requests, stats.coalesced, stats.superseded) == (2, 0, 1)
+
+
+def test_users_and_options_are_independent() -> None:
+    coalescer = AutocompleteCoalescer()
+    calls: list[str] = []
+
+    async def run():
+        return await asyncio.gather(
+            coalescer.run(
+                fake_interaction(1, "a"), "item.name", slow_lookup("1", calls)
+            ),
+            coalescer.run(
+                fake_interaction(2, "a"), "item.name", slow_lookup("2", calls)
+            ),
+            coalescer.run(
+                fake_interaction(1, "a"), "open.name", slow_lookup("3", calls)
+            ),
+        )
+
+    assert asyncio.run(run()) == [["1"], ["2"], ["3"]]
+    assert coalescer.stats().superseded == 0
+
+
+def test_cancelling_a_request_propagates() -> None:
+    coalescer = AutocompleteCoalescer()
+
+    async def run():
+        task = asyncio.ensure_future(
+            coalescer.run(fake_interaction(1, "a"), "item.name", slow_lookup("a", []))
+        )
+        await asyncio.sleep(0)
+        task.cancel()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(run())
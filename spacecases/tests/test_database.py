@@ -0,0 +1,107 @@
+import os
+import time
+import pytest
+from typing import Any, cast
+from spacecases.database import (
+    Database,
+    QueryRegistry,
+    QUERIES,
+    BALANCE,
+    CHANGE_BALANCE,
+    COUNT_USERS,
+    GET_INVENTORY,
+    SYNC_ITEM_METADATA,
+    load_migrations,
+)
+
+
+def test_query_registry_resolves_all_queries() -> None:
+    registry = QueryRegistry.load()
+    for name in QUERIES:
+        assert registry[name]
+
+
+def test_query_registry_skips_migrations() -> None:
+    registry = QueryRegistry.load()
+    assert not any(name.startswith("migrations/") for name in registry.queries)
+
+
+def test_query_registry_missing_query(tmp_path) -> None:
+    os.makedirs(tmp_path / "user" / "money")
+    (tmp_path / "user" / "money" / "balance.sql").write_text("SELECT 1")
+    with pytest.raises(FileNotFoundError):
+        QueryRegistry.load(str(tmp_path))
+
+
+def test_query_registry_reads_file_contents(tmp_path) -> None:
+    for name in QUERIES:
+        path = tmp_path / name
+        os.makedirs(path.parent, exist_ok=True)
+        path.write_text(f"-- {name}")
+    registry = QueryRegistry.load(str(tmp_path))
+    assert registry[BALANCE] == f"-- {BALANCE}"
+
+
+def test_load_migrations_orders_numerically(tmp_path) -> None:
+    for name in ("10_c.sql", "2_b.sql", "0_a.sql"):
+        (tmp_path / name).write_text(f"-- {name}")
+    (tmp_path / "README.md").write_text("not a migration")
+    migrations = load_migrations(str(tmp_path))
+    assert [migration.name for migration in migrations] == [
+        "0_a.sql",
+        "2_b.sql",
+        "10_c.sql",
+    ]
+
+
+def test_load_migrations_checksum_changes_with_contents(tmp_path) -> None:
+    path = tmp_path / "0_a.sql"
+    path.write_text("SELECT 1;")
+    before = load_migrations(str(tmp_path))[0].checksum
+    path.write_text("SELECT 2;")
+    after = load_migrations(str(tmp_path))[0].checksum
+    assert before != after
+
+
+def test_shipped_migrations_load() -> None:
+    migrations = load_migrations()
+    assert migrations[0].name.startswith("0_")
+
+
+def replica_database() -> Database:
+    # routing never touches the pools
+    pool = cast(Any, object())
+    db = Database(pool, QueryRegistry({}), replica_pool=pool, max_replica_lag=5.0)
+    db.replica_healthy = True
+    return db
+
+
+def test_reads_go_to_replica_unless_user_just_wrote() -> None:
+    db = replica_database()
+    assert db.use_replica(BALANCE, (1,))
+    assert db.use_replica(COUNT_USERS)
+    assert not db.use_replica(CHANGE_BALANCE, (1, 100))
+
+    db.record_write(CHANGE_BALANCE, (1, 100))
+    assert not db.use_replica(BALANCE, (1,))
+    assert not db.use_replica(GET_INVENTORY, (1,))
+    # other users and queries about nobody in particular are unaffected
+    assert db.use_replica(BALANCE, (2,))
+    assert db.use_replica(COUNT_USERS)
+
+    # once any healthy replica must have the write, the user reads from it again
+    db.last_writes[1] = time.monotonic() - db.read_your_writes_window - 1
+    assert db.use_replica(BALANCE, (1,))
+
+
+def test_reads_stay_on_primary_when_replica_unhealthy() -> None:
+    db = replica_database()
+    db.replica_healthy = False
+    assert not db.use_replica(BALANCE, (1,))
+
+
+def test_global_writes_and_reads_are_not_recorded() -> None:
+    db = replica_database()
+    db.record_write(SYNC_ITEM_METADATA, (["ak47redline"], [100], [1]))
+    db.record_write(BALANCE, (1,))
+    assert db.last_writes == {}
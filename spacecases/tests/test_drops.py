@@ -0,0 +1,193 @@
+import random
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from fractions import Fraction
+from typing import Optional, cast
+import pytest
+from common import (
+    STATTRAK_ODDS,
+    PhaseGroup,
+    Rarity,
+    SkinCase,
+    SkinContainerEntry,
+    resolve_skin_drops,
+    wear_cdf,
+    wear_float,
+)
+from spacecases.drops import AliasTable, ContainerSampler
+
+SAMPLES = 200_000
+# chi-squared values exceeded by chance 0.1% of the time, by degrees of freedom
+CHI_SQUARED_CRITICAL = {4: 18.467, 8: 26.124}
+# the wear bands of the original open command and how likely each one is
+WEAR_BOUNDS = (0.07, 0.15, 0.38, 0.45)
+WEAR_BAND_ODDS = dict(enumerate((0.1471, 0.2468, 0.4318, 0.075, 0.0993)))
+CONDITIONS = ("factorynew", "minimalwear", "fieldtested", "wellworn", "battlescarred")
+
+
+def entry(
+    name: str,
+    min_float: float = 0.0,
+    max_float: float = 1.0,
+    phase_group: Optional[PhaseGroup] = None,
+) -> SkinContainerEntry:
+    return SkinContainerEntry(
+        unformatted_name=name,
+        min_float=min_float,
+        max_float=max_float,
+        phase_group=phase_group,
+        image_url="",
+    )
+
+
+CONTAINS = {
+    Rarity.Rare: [entry("a"), entry("b"), entry("c")],
+    Rarity.Mythical: [entry("d"), entry("e")],
+    Rarity.Legendary: [entry("f", 0.1, 0.6)],
+}
+# i is like gloves, which have no StatTrak variants
+CONTAINS_RARE = [entry("g", phase_group=PhaseGroup.DOPPLER), entry("h"), entry("i")]
+PHASES = ("phase1", "phase2", "phase3", "phase4", "sapphire", "ruby", "blackpearl")
+VARIANTS = [("", STATTRAK_ODDS - 1), ("stattrak", 1)]
+ITEM_KEYS = {
+    f"{prefix}{name}{phase}{condition}"
+    for prefix, names in (("", "abcdefghi"), ("stattrak", "abcdefgh"))
+    for name in names
+    for phase in ["", *PHASES]
+    for condition in CONDITIONS
+}
+CASE = SkinCase(
+    formatted_name="Test Case",
+    price=100,
+    image_url="",
+    requires_key=True,
+    contains=CONTAINS,
+    contains_rare=CONTAINS_RARE,
+    drops=resolve_skin_drops(CONTAINS, CONTAINS_RARE, VARIANTS, ITEM_KEYS),
+)
+
+
+def expected_tier_odds() -> dict[str, Fraction]:
+    """Odds of each entry by the original cumulative table in open"""
+    cumulative = {}
+    total = 0
+    for idx, rarity in enumerate(reversed(CASE.contains.keys())):
+        total += 1 + 5 ** (idx + 1)
+        cumulative[rarity] = total
+    rare = len(CASE.contains_rare)
+    odds = {e.unformatted_name: Fraction(1, total * rare) for e in CASE.contains_rare}
+    previous = 1
+    for rarity, upper in cumulative.items():
+        entries = CASE.contains[rarity]
+        for e in entries:
+            odds[e.unformatted_name] = Fraction(upper - previous, total * len(entries))
+        previous = upper
+    return odds
+
+
+# StatTrak is 1 in STATTRAK_ODDS of everything but the gloves
+STATTRAK_SHARE = Fraction(1, STATTRAK_ODDS) * (1 - expected_tier_odds()["i"])
+
+
+def exact_odds(table: AliasTable) -> list[Fraction]:
+    n = len(table.thresholds)
+    odds = [Fraction(0)] * n
+    for column, (threshold, alias) in enumerate(zip(table.thresholds, table.aliases)):
+        odds[column] += Fraction(threshold, table.total * n)
+        odds[alias] += Fraction(table.total - threshold, table.total * n)
+    return odds
+
+
+def chi_squared(observed: Counter, expected: dict) -> float:
+    total = sum(observed.values())
+    return sum(
+        (observed[key] - total * p) ** 2 / (total * p) for key, p in expected.items()
+    )
+
+
+def test_alias_table_is_exact() -> None:
+    rng = random.Random(0)
+    for _ in range(100):
+        weights = [rng.randrange(1, 1000) for _ in range(rng.randrange(1, 20))]
+        assert exact_odds(AliasTable(weights)) == [
+            Fraction(weight, sum(weights)) for weight in weights
+        ]
+
+
+def test_resolved_drop_odds_are_unchanged() -> None:
+    sampler = ContainerSampler(CASE)
+    entry_odds: defaultdict[str, Fraction] = defaultdict(Fraction)
+    stattrak_odds = Fraction(0)
+    for drop, odds in zip(CASE.drops, exact_odds(sampler.table)):
+        item_key = drop.item_keys[0]
+        entry_odds[item_key.removeprefix("stattrak")[0]] += odds
+        if item_key.startswith("stattrak"):
+            stattrak_odds += odds
+    assert entry_odds == expected_tier_odds()
+    assert stattrak_odds == STATTRAK_SHARE
+
+
+def test_resolve_skin_drops_without_stattrak_keys() -> None:
+    # the plain key gets all of the entry's weight, so its odds are unchanged
+    gloves = [drop for drop in CASE.drops if drop.item_keys[0].startswith("i")]
+    assert len(gloves) == 1
+    assert all(
+        not item_key.startswith("stattraki")
+        for drop in CASE.drops
+        for item_key in drop.item_keys
+    )
+    # a single missing StatTrak key is enough
+    drops = resolve_skin_drops(
+        CONTAINS, CONTAINS_RARE, VARIANTS, ITEM_KEYS - {"stattrakhwellworn"}
+    )
+    assert not any(drop.item_keys[0].startswith("stattrakh") for drop in drops)
+
+
+def test_resolve_skin_drops_checks_item_keys() -> None:
+    with pytest.raises(ValueError):
+        resolve_skin_drops(
+            CONTAINS, CONTAINS_RARE, VARIANTS, ITEM_KEYS - {"grubywellworn"}
+        )
+
+
+def test_container_sampler_distribution() -> None:
+    sampler = ContainerSampler(CASE)
+    rng = random.Random(0)
+    drops = [sampler.sample(rng) for _ in range(SAMPLES)]
+    # every entry's name is one letter, followed by its phase and condition
+    names = [drop.unformatted_name.removeprefix("stattrak") for drop in drops]
+
+    assert (
+        chi_squared(Counter(name[0] for name in names), expected_tier_odds())
+        < CHI_SQUARED_CRITICAL[8]
+    )
+
+    floats = [drop.float for name, drop in zip(names, drops) if name[0] != "f"]
+    assert all(f is not None for f in floats)
+    bands = Counter(bisect_left(WEAR_BOUNDS, cast(float, f)) for f in floats)
+    assert chi_squared(bands, WEAR_BAND_ODDS) < CHI_SQUARED_CRITICAL[4]
+
+    # f only spans 0.1 to 0.6, so its wear bands are squeezed into that range
+    f_drops = [drop for name, drop in zip(names, drops) if name[0] == "f"]
+    f_floats = [cast(float, drop.float) for drop in f_drops]
+    assert all(0.1 <= f <= 0.6 for f in f_floats)
+    assert Counter(
+        bisect_left(WEAR_BOUNDS, (f - 0.1) / 0.5) for f in f_floats
+    ).keys() == set(WEAR_BAND_ODDS)
+
+    # the condition in the name matches the float
+    for name, drop in zip(names, drops):
+        condition = bisect_left(WEAR_BOUNDS, cast(float, drop.float))
+        assert name.endswith(CONDITIONS[condition])
+
+    stattrak = sum(drop.unformatted_name.startswith("stattrak") for drop in drops)
+    assert abs(stattrak / SAMPLES - float(STATTRAK_SHARE)) < 0.003
+
+
+def test_wear_float_is_continuous() -> None:
+    for cut, low in ((0.1471, 0.07), (0.3939, 0.15), (0.8257, 0.38), (0.9007, 0.45)):
+        assert abs(wear_float(cut) - low) < 1e-12
+        assert abs(wear_float(cut + 1e-12) - low) < 1e-9
+    assert wear_float(0.0) == 0.0
+    for u in (0.0, 0.1, 0.1471, 0.5, 0.9, 0.999):
+        assert abs(wear_cdf(wear_float(u)) - u) < 1e-12
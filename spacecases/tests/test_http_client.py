@@ -0,0 +1,38 @@
+import asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from spacecases.http_client import HttpClient
+
+
+def get_statuses(statuses: list[int], retries: int) -> tuple[int, int]:
+    """Status of the response and how many requests it took"""
+    requests = []
+
+    async def handler(_: web.Request) -> web.Response:
+        status = statuses[min(len(requests), len(statuses) - 1)]
+        requests.append(status)
+        return web.Response(status=status)
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/", handler)
+        async with (
+            TestServer(app) as server,
+            await HttpClient.create(retries=retries, backoff=0) as http_client,
+        ):
+            async with http_client.get(str(server.make_url("/"))) as response:
+                return response.status, len(requests)
+
+    return asyncio.run(run())
+
+
+def test_http_client_retries_transient_statuses() -> None:
+    assert get_statuses([503, 502, 200], retries=3) == (200, 3)
+
+
+def test_http_client_gives_up_after_retries() -> None:
+    assert get_statuses([503], retries=2) == (503, 3)
+
+
+def test_http_client_does_not_retry_client_errors() -> None:
+    assert get_statuses([404, 200], retries=3) == (404, 1)
@@ -0,0 +1,68 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any, cast
+from spacecases.commands.user.inventory import (
+    INVENTORY_PAGE_SIZE,
+    create_inventory_embed,
+    fetch_nonempty_inventory_page,
+    first_inventory_cursor,
+)
+
+
+class InventoryDatabase:
+    """Serves GET_INVENTORY_PAGE from a list of item ids"""
+
+    def __init__(self, item_ids: list[int]) -> None:
+        self.item_ids = item_ids
+
+    async def fetch_from_file(
+        self, query: str, user_id: int, after: int, limit: int
+    ) -> list[dict[str, Any]]:
+        return [
+            {"id": item_id, "type": "sticker", "name": "sticker", "float": None}
+            for item_id in self.item_ids
+            if item_id > after
+        ][:limit]
+
+
+def test_fetch_nonempty_inventory_page_falls_back_when_inventory_shrinks() -> None:
+    db = InventoryDatabase(list(range(1, 3 * INVENTORY_PAGE_SIZE + 1)))
+    cursors = [first_inventory_cursor("id")]
+    for page in range(3):
+        _, items, next_cursor = asyncio.run(
+            fetch_nonempty_inventory_page(cast(Any, db), 1, "id", cursors, page)
+        )
+        assert len(items) == INVENTORY_PAGE_SIZE
+        if next_cursor is not None:
+            cursors.append(next_cursor)
+    assert len(cursors) == 3
+
+    # everything past the first page is sold while the view is open
+    db.item_ids = db.item_ids[:INVENTORY_PAGE_SIZE]
+    page, items, next_cursor = asyncio.run(
+        fetch_nonempty_inventory_page(cast(Any, db), 1, "id", cursors, 2)
+    )
+    assert page == 0
+    assert [item["id"] for item in items] == db.item_ids
+    assert next_cursor is None
+
+    # and everything else too
+    db.item_ids = []
+    page, items, _ = asyncio.run(
+        fetch_nonempty_inventory_page(cast(Any, db), 1, "id", cursors, 2)
+    )
+    assert (page, items) == (0, [])
+
+
+def test_create_inventory_embed_without_items() -> None:
+    user = SimpleNamespace(
+        display_name="user", display_avatar=SimpleNamespace(url="https://avatar")
+    )
+    e = create_inventory_embed(
+        cast(Any, SimpleNamespace(item_metadata={})),
+        cast(Any, user),
+        cast(Any, (5, 0, 0)),
+        [],
+        0,
+    )
+    assert e.fields[0].value == "No items"
@@ -0,0 +1,110 @@
+import asyncio
+from common import ItemType
+from spacecases.inventory_cache import InventoryCache
+
+SKIN = (1, "ak47redline", ItemType.Skin, 0.25)
+STICKER = (2, "sticker", ItemType.Sticker, None)
+
+
+def load_items(*items):
+    calls = []
+
+    async def load():
+        calls.append(1)
+        return list(items)
+
+    return load, calls
+
+
+def test_inventory_cache_hit_after_miss() -> None:
+    cache = InventoryCache()
+    load, calls = load_items(SKIN)
+    assert asyncio.run(cache.get(1, load)) == [SKIN]
+    assert asyncio.run(cache.get(1, load)) == [SKIN]
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+    assert stats.hit_rate == 0.5
+    assert stats.memory_bytes > 0
+
+
+def test_inventory_cache_expires() -> None:
+    cache = InventoryCache(ttl=0)
+    load, calls = load_items(SKIN)
+    asyncio.run(cache.get(1, load))
+    asyncio.run(cache.get(1, load))
+    assert len(calls) == 2
+    assert cache.expirations == 1
+
+
+def test_inventory_cache_evicts_least_recently_used() -> None:
+    cache = InventoryCache(max_users=2)
+    load, calls = load_items(SKIN)
+    for user_id in (1, 2, 1, 3):
+        asyncio.run(cache.get(user_id, load))
+    assert list(cache.entries) == [1, 3]
+    assert cache.evictions == 1
+
+
+def test_inventory_cache_write_through() -> None:
+    cache = InventoryCache()
+    load, calls = load_items(SKIN)
+    items = asyncio.run(cache.get(1, load))
+    cache.add_item(1, STICKER)
+    assert asyncio.run(cache.get(1, load)) == [SKIN, STICKER]
+    # lists handed out earlier are left alone
+    assert items == [SKIN]
+    cache.replace_item(1, (1, "awpasiimov", ItemType.Skin, 0.5))
+    cache.remove_item(1, 2)
+    assert asyncio.run(cache.get(1, load)) == [(1, "awpasiimov", ItemType.Skin, 0.5)]
+    cache.invalidate(1)
+    assert asyncio.run(cache.get(1, load)) == [SKIN]
+    assert len(calls) == 2
+
+
+def test_inventory_cache_write_through_many() -> None:
+    cache = InventoryCache()
+    load, _ = load_items(SKIN)
+    asyncio.run(cache.get(1, load))
+    cache.add_items(1, [STICKER, (3, "awpasiimov", ItemType.Skin, 0.5)])
+    assert asyncio.run(cache.get(1, load)) == [
+        SKIN,
+        STICKER,
+        (3, "awpasiimov", ItemType.Skin, 0.5),
+    ]
+    # users with nothing cached stay uncached
+    cache.add_items(2, [STICKER])
+    assert 2 not in cache.entries
+
+
+def test_inventory_cache_write_during_load_is_not_cached() -> None:
+    cache = InventoryCache()
+
+    async def load():
+        # the item is granted after the query read the inventory
+        cache.add_item(1, STICKER)
+        return [SKIN]
+
+    async def run():
+        assert await cache.get(1, load) == [SKIN]
+        assert 1 not in cache.entries
+        assert not cache.loading and not cache.written_while_loading
+
+    asyncio.run(run())
+
+
+def test_inventory_cache_concurrent_misses_share_one_load() -> None:
+    cache = InventoryCache()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return [SKIN]
+
+    async def run():
+        return await asyncio.gather(cache.get(1, load), cache.get(1, load))
+
+    assert asyncio.run(run()) == [[SKIN], [SKIN]]
+    assert len(calls) == 1
+    assert cache.coalesced == 1
@@ -0,0 +1,108 @@
+import asyncio
+from spacecases.leaderboard import Leaderboard, LeaderboardEntry
+from spacecases.leaderboard_cache import LeaderboardCache
+
+
+class Loader:
+    """Counts loads per guild, each load's leaderboard has the load number as its value"""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.calls: list[int] = []
+        self.fail = fail
+
+    async def __call__(self, guild_id: int) -> Leaderboard:
+        self.calls.append(guild_id)
+        await asyncio.sleep(0)
+        if self.fail:
+            raise ConnectionError("leaderboards unreachable")
+        return Leaderboard({1: LeaderboardEntry(len(self.calls), 1, "user")})
+
+
+def value(leaderboard: Leaderboard) -> int:
+    return leaderboard.entries[1].inventory_value
+
+
+def test_leaderboard_cache_loads_on_first_lookup() -> None:
+    async def run() -> None:
+        load = Loader()
+        cache = LeaderboardCache(load)
+        assert load.calls == []
+        assert 1 not in cache
+        first, second = await asyncio.gather(cache.get(1), cache.get(1))
+        assert first is second
+        assert value(await cache.get(1)) == 1
+        assert 1 in cache
+        assert load.calls == [1]
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.coalesced) == (1, 2, 1)
+        assert stats.memory_bytes > 0
+
+    asyncio.run(run())
+
+
+def test_leaderboard_cache_refreshes_stale_entries_in_background() -> None:
+    async def run() -> None:
+        load = Loader()
+        cache = LeaderboardCache(load, ttl=0)
+        assert value(await cache.get(1)) == 1
+        # the stale entry is returned while it reloads, lookups meanwhile don't reload
+        assert value(await cache.get(1)) == 1
+        assert value(await cache.get(1)) == 1
+        await asyncio.sleep(0.01)
+        assert value(await cache.get(1)) == 2
+        await asyncio.sleep(0.01)
+        assert load.calls == [1, 1, 1]
+        assert cache.expirations == 2
+
+    asyncio.run(run())
+
+
+def test_leaderboard_cache_keeps_stale_entry_when_refresh_fails() -> None:
+    async def run() -> None:
+        load = Loader()
+        cache = LeaderboardCache(load, ttl=0)
+        await cache.get(1)
+        load.fail = True
+        assert value(await cache.get(1)) == 1
+        await asyncio.sleep(0.01)
+        assert value(await cache.get(1)) == 1
+        assert cache.loading.keys() == {1}
+        await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+
+
+def test_leaderboard_cache_bounds_refresh_concurrency() -> None:
+    async def run() -> None:
+        running = 0
+        most_running = 0
+
+        async def load(guild_id: int) -> Leaderboard:
+            nonlocal running, most_running
+            running += 1
+            most_running = max(most_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return Leaderboard({})
+
+        cache = LeaderboardCache(load, ttl=0, max_refreshes=2)
+        await asyncio.gather(*(cache.get(guild_id) for guild_id in range(8)))
+        most_running = 0
+        for guild_id in range(8):
+            await cache.get(guild_id)
+        await asyncio.sleep(0.1)
+        assert most_running == 2
+        assert not cache.loading
+
+    asyncio.run(run())
+
+
+def test_leaderboard_cache_evicts_least_recently_used() -> None:
+    async def run() -> None:
+        cache = LeaderboardCache(Loader(), max_guilds=2)
+        for guild_id in (1, 2, 1, 3):
+            await cache.get(guild_id)
+        assert list(cache.entries) == [1, 3]
+        assert cache.evictions == 1
+
+    asyncio.run(run())
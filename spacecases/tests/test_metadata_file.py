@@ -0,0 +1,138 @@
+import json
+import hashlib
+import asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from common import METADATA_SCHEMA_VERSION, StickerMetadatum, validate_metadata
+from spacecases.http_client import HttpClient
+from spacecases.metadata_file import (
+    MetadataFile,
+    Refresh,
+    changed_prices,
+    fetch_trusted_checksums,
+)
+
+STICKER = {
+    "formatted_name": "Sticker | Crown (Foil)",
+    "rarity": 4,
+    "price": 100000,
+    "image_url": "https://example.com/crown.png",
+}
+
+
+def serve(files: list[tuple[dict, dict[str, str]]]):
+    """Serves each body in turn, honouring If-None-Match"""
+    requests = []
+
+    async def handler(request: web.Request) -> web.Response:
+        body, headers = files[min(len(requests), len(files) - 1)]
+        requests.append(request)
+        etag = headers.get("ETag")
+        if etag is not None and request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304)
+        return web.Response(body=json.dumps(body).encode(), headers=headers)
+
+    app = web.Application()
+    app.router.add_get("/sticker_metadata.json", handler)
+    return TestServer(app), requests
+
+
+def refresh_all(
+    files: list[tuple[dict, dict[str, str]]], trusted_checksums: dict[str, str] = {}
+):
+    decoded_as_trusted = []
+
+    def decode(raw_json: dict, trusted: bool) -> dict[str, StickerMetadatum]:
+        decoded_as_trusted.append(trusted)
+        return validate_metadata(raw_json, StickerMetadatum)
+
+    async def run():
+        server, requests = serve(files)
+        async with server, await HttpClient.create() as http_client:
+            file = MetadataFile(str(server.make_url("/sticker_metadata.json")), decode)
+            results = []
+            parsed = []
+            for _ in files:
+                results.append(await file.refresh(http_client, trusted_checksums))
+                parsed.append(file.parsed)
+            return file, results, parsed, requests, decoded_as_trusted
+
+    return asyncio.run(run())
+
+
+def test_changed_prices() -> None:
+    cheaper = STICKER | {"price": 5}
+    assert changed_prices({"a": STICKER}, {"a": STICKER}) == {}
+    assert changed_prices({"a": STICKER}, {"a": cheaper}) == {"a": 5}
+    assert changed_prices({"a": STICKER}, {"a": STICKER, "b": STICKER}) is None
+    assert changed_prices({"a": STICKER}, {"a": STICKER | {"rarity": 5}}) is None
+    assert changed_prices({"a": STICKER}, {"a": STICKER | {"price": "5"}}) is None
+
+
+def test_metadata_file_conditional_request() -> None:
+    files = [({"crown": STICKER}, {"ETag": '"1"'})] * 2
+    file, results, _, requests, _ = refresh_all(files)
+    assert results == [Refresh.Replaced, Refresh.Unchanged]
+    assert requests[1].headers["If-None-Match"] == '"1"'
+    assert file.version == 1
+
+
+def test_metadata_file_unchanged_body_without_validators() -> None:
+    files = [({"crown": STICKER}, {})] * 2
+    _, results, _, _, _ = refresh_all(files)
+    assert results == [Refresh.Replaced, Refresh.Unchanged]
+
+
+def test_metadata_file_patches_prices() -> None:
+    files = [
+        ({"crown": STICKER}, {"ETag": '"1"'}),
+        ({"crown": STICKER | {"price": 5}}, {"ETag": '"2"'}),
+    ]
+    file, results, parsed, _, _ = refresh_all(files)
+    assert results == [Refresh.Replaced, Refresh.Prices]
+    # the models already handed out see the new price
+    assert parsed[0] is parsed[1]
+    assert parsed[0]["crown"].price == 5
+    assert file.patched_prices == {"crown": 5}
+    assert file.version == 1
+
+
+def test_metadata_file_replaces_on_new_entries() -> None:
+    files = [
+        ({"crown": STICKER}, {"ETag": '"1"'}),
+        ({"crown": STICKER, "howl": STICKER}, {"ETag": '"2"'}),
+    ]
+    file, results, parsed, _, _ = refresh_all(files)
+    assert results == [Refresh.Replaced, Refresh.Replaced]
+    assert parsed[0] is not parsed[1]
+    assert list(file.parsed) == ["crown", "howl"]
+    assert file.version == 2
+
+
+def test_metadata_file_trusts_matching_checksum() -> None:
+    files = [
+        ({"crown": STICKER}, {}),
+        ({"crown": STICKER, "howl": STICKER}, {}),
+    ]
+    checksum = hashlib.sha256(json.dumps(files[0][0]).encode()).hexdigest()
+    *_, decoded_as_trusted = refresh_all(files, {"sticker_metadata.json": checksum})
+    assert decoded_as_trusted == [True, False]
+
+
+def test_fetch_trusted_checksums() -> None:
+    checksums = {"sticker_metadata.json": "00"}
+
+    async def fetch(manifest: dict) -> dict[str, str]:
+        async def handler(_: web.Request) -> web.Response:
+            return web.json_response(manifest)
+
+        app = web.Application()
+        app.router.add_get("/manifest.json", handler)
+        async with TestServer(app) as server, await HttpClient.create() as http_client:
+            url = str(server.make_url("/manifest.json"))
+            return await fetch_trusted_checksums(http_client, url)
+
+    manifest = {"schema_version": METADATA_SCHEMA_VERSION, "checksums": checksums}
+    assert asyncio.run(fetch(manifest)) == checksums
+    manifest["schema_version"] += 1
+    assert asyncio.run(fetch(manifest)) == {}
@@ -0,0 +1,69 @@
+import pytest
+from spacecases.metrics import (
+    Histogram,
+    QueryMetrics,
+    PoolStats,
+    CacheStats,
+    to_prometheus,
+)
+
+
+def test_histogram_empty() -> None:
+    histogram = Histogram()
+    assert histogram.quantile(0.5) == 0.0
+    assert histogram.mean == 0.0
+
+
+def test_histogram_quantiles_are_close() -> None:
+    histogram = Histogram()
+    for i in range(1, 1001):
+        histogram.observe(i / 1000)
+    assert histogram.count == 1000
+    assert histogram.mean == pytest.approx(0.5005)
+    # buckets grow by sqrt(2), so estimates are within that factor
+    for q in (0.5, 0.95, 0.99):
+        assert q / 1.42 <= histogram.quantile(q) <= q * 1.42
+
+
+def test_histogram_quantile_never_exceeds_max() -> None:
+    histogram = Histogram()
+    histogram.observe(0.002)
+    assert histogram.quantile(0.99) <= 0.002
+    histogram.observe(100)
+    assert histogram.quantile(1.0) == 100
+
+
+def test_to_prometheus() -> None:
+    metrics = QueryMetrics()
+    metrics.observe_execution("user/money/balance.sql", 0.001)
+    metrics.observe_pool_wait("user/money/balance.sql", 0.0)
+    dump = to_prometheus(metrics, PoolStats(10, 9, 1, 1, 0.0, 0.0))
+    assert "# TYPE spacecases_query_duration_seconds histogram" in dump
+    assert (
+        'spacecases_query_duration_seconds_bucket{query="user/money/balance.sql",le="+Inf"} 1'
+        in dump
+    )
+    assert (
+        'spacecases_pool_wait_seconds_count{query="user/money/balance.sql"} 1' in dump
+    )
+    assert "spacecases_pool_idle 9" in dump
+    assert dump.endswith("\n")
+
+
+def test_to_prometheus_caches() -> None:
+    stats = CacheStats(
+        size=3,
+        hits=8,
+        misses=2,
+        coalesced=1,
+        evictions=0,
+        expirations=1,
+        memory_bytes=512,
+    )
+    assert stats.hit_rate == 0.8
+    dump = to_prometheus(
+        QueryMetrics(), PoolStats(10, 10, 0, 0, 0.0, 0.0), caches={"inventory": stats}
+    )
+    assert "# TYPE spacecases_cache_hits_total counter" in dump
+    assert 'spacecases_cache_hits_total{cache="inventory"} 8' in dump
+    assert 'spacecases_cache_memory_bytes{cache="inventory"} 512' in dump
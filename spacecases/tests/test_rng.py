@@ -0,0 +1,51 @@
+from spacecases.drops import ContainerSampler
+from spacecases.rng import RngProvider, load_replay_log
+from tests.test_drops import CASE
+
+
+def draws(provider: RngProvider, interaction_id: int) -> list[float]:
+    rng = provider.for_interaction(interaction_id, 1, "open")
+    return [rng.random() for _ in range(5)]
+
+
+def test_seeded_provider_is_reproducible() -> None:
+    first = RngProvider(seed=42)
+    second = RngProvider(seed=42)
+    # interleaving doesn't matter, only the seed and the interaction id
+    assert draws(first, 1) == draws(second, 1)
+    assert draws(first, 2) == draws(second, 2)
+    assert draws(first, 3) != draws(first, 4)
+    assert draws(first, 3) != draws(RngProvider(seed=43), 3)
+
+
+def test_replay_log_reproduces_interactions(tmp_path) -> None:
+    path = str(tmp_path / "replay.log")
+    provider = RngProvider(replay_log_path=path)
+    sampler = ContainerSampler(CASE)
+    dropped = {
+        interaction_id: sampler.sample_many(
+            provider.for_interaction(interaction_id, 1, "open"), 10
+        )
+        for interaction_id in (100, 200)
+    }
+    provider.close()
+
+    assert set(load_replay_log(path)) == {100, 200}
+    replay = RngProvider(replay_from_path=path)
+    for interaction_id, drops in dropped.items():
+        rng = replay.for_interaction(interaction_id, 1, "open")
+        assert sampler.sample_many(rng, 10) == drops
+
+
+def test_replay_from_the_log_being_written(tmp_path) -> None:
+    path = str(tmp_path / "replay.log")
+    provider = RngProvider(replay_log_path=path)
+    logged = draws(provider, 100)
+    provider.close()
+
+    # logged interactions draw the same again, others are seeded as usual
+    replay = RngProvider(seed=42, replay_log_path=path, replay_from_path=path)
+    assert draws(replay, 100) == logged
+    assert draws(replay, 200) == draws(RngProvider(seed=42), 200)
+    replay.close()
+    assert list(load_replay_log(path)) == [100, 200]
@@ -0,0 +1,58 @@
+from spacecases.search import SearchIndex
+
+NAMES = [
+    "ak47redlinefieldtested",
+    "ak47redlineminimalwear",
+    "stattrakak47redlinefieldtested",
+    "awpasiimovfieldtested",
+    "m4a1sasiimovbattlescarred",
+    "ak47vulcanfactorynew",
+    "stickernavikatowice2014",
+]
+
+
+def test_search_prefix_matches_come_first() -> None:
+    index = SearchIndex(NAMES)
+    results = index.search("ak47")
+    assert set(results[:3]) == {
+        "ak47vulcanfactorynew",
+        "ak47redlinefieldtested",
+        "ak47redlineminimalwear",
+    }
+    assert results[3] == "stattrakak47redlinefieldtested"
+
+
+def test_search_substring() -> None:
+    index = SearchIndex(NAMES)
+    assert index.search("asiimov")[:2] == [
+        "awpasiimovfieldtested",
+        "m4a1sasiimovbattlescarred",
+    ]
+    assert index.search("redlinefield")[:2] == [
+        "ak47redlinefieldtested",
+        "stattrakak47redlinefieldtested",
+    ]
+
+
+def test_search_tolerates_typos() -> None:
+    index = SearchIndex(NAMES)
+    assert index.search("asimov")[:2] == [
+        "awpasiimovfieldtested",
+        "m4a1sasiimovbattlescarred",
+    ]
+    assert index.search("katowise")[0] == "stickernavikatowice2014"
+
+
+def test_search_limit_and_no_duplicates() -> None:
+    index = SearchIndex(NAMES)
+    results = index.search("ak47red", limit=2)
+    assert len(results) == 2
+    results = index.search("redline")
+    assert len(results) == len(set(results))
+
+
+def test_search_short_queries_are_prefix_only() -> None:
+    index = SearchIndex(NAMES)
+    assert index.search("aw") == ["awpasiimovfieldtested"]
+    assert index.search("zz") == []
+    assert SearchIndex([]).search("anything") == []
@@ -0,0 +1,81 @@
+import math
+import numpy as np
+from spacecases.constants import KEY_PRICE
+from spacecases.simulation import ContainerSimulator, container_odds
+from tests.test_drops import CASE, ITEM_KEYS, CHI_SQUARED_CRITICAL
+
+DRAWS = 2_000_000
+ITEM_PRICES = {item_key: 10 * i for i, item_key in enumerate(sorted(ITEM_KEYS))}
+
+
+def item_odds() -> dict[str, float]:
+    """Odds of each item by the drop table, wear cut by wear cut"""
+    total = sum(drop.weight for drop in CASE.drops)
+    odds: dict[str, float] = {}
+    for drop in CASE.drops:
+        cuts = [0.0, *drop.wear_cuts, 1.0]
+        for item_key, low, high in zip(drop.item_keys, cuts, cuts[1:]):
+            odds[item_key] = odds.get(item_key, 0.0) + drop.weight / total * (
+                high - low
+            )
+    return odds
+
+
+def test_simulator_odds_match_drop_table() -> None:
+    simulator = ContainerSimulator(CASE)
+    odds = item_odds()
+    assert set(simulator.item_keys) == set(odds)
+    for item_key, probability in zip(simulator.item_keys, simulator.probabilities):
+        assert math.isclose(probability, odds[item_key], rel_tol=1e-9)
+
+    # every column of the alias table is worth 1 / n
+    n = len(simulator.thresholds)
+    implied = np.zeros(n)
+    np.add.at(implied, np.arange(n), simulator.thresholds / n)
+    np.add.at(implied, simulator.aliases, (1 - simulator.thresholds) / n)
+    assert np.allclose(implied, simulator.probabilities, rtol=1e-9, atol=1e-15)
+
+
+def test_simulator_distribution() -> None:
+    simulator = ContainerSimulator(CASE)
+    items = simulator.draw(np.random.default_rng(0), DRAWS)
+    # items are grouped by the entry they come from, the first letter of their key
+    entries = sorted({item_key.removeprefix("stattrak")[0] for item_key in ITEM_KEYS})
+    entry_of_item = np.array(
+        [entries.index(key.removeprefix("stattrak")[0]) for key in simulator.item_keys]
+    )
+    observed = np.bincount(entry_of_item[items], minlength=len(entries))
+    expected = np.bincount(
+        entry_of_item, weights=simulator.probabilities, minlength=len(entries)
+    )
+    chi_squared = (np.square(observed - DRAWS * expected) / (DRAWS * expected)).sum()
+    assert chi_squared < CHI_SQUARED_CRITICAL[8]
+
+
+def test_odds_are_exact() -> None:
+    simulator = ContainerSimulator(CASE)
+    odds = container_odds({"testcase": simulator}, ITEM_PRICES)["testcase"]
+    exact = item_odds()
+    mean = sum(p * ITEM_PRICES[item_key] for item_key, p in exact.items())
+    variance = sum(
+        p * (ITEM_PRICES[item_key] - mean) ** 2 for item_key, p in exact.items()
+    )
+    profit = sum(
+        p for item_key, p in exact.items() if ITEM_PRICES[item_key] > odds.cost
+    )
+    assert odds.cost == CASE.price + KEY_PRICE
+    assert math.isclose(odds.expected_value, mean, rel_tol=1e-9)
+    assert math.isclose(odds.standard_deviation, math.sqrt(variance), rel_tol=1e-9)
+    assert math.isclose(odds.profit_probability, profit, rel_tol=1e-9)
+
+    # and they agree with openings drawn in bulk
+    prices = np.array([ITEM_PRICES[item_key] for item_key in simulator.item_keys])
+    values = prices[simulator.draw(np.random.default_rng(0), DRAWS)]
+    assert abs(values.mean() - mean) < 5 * math.sqrt(variance / DRAWS)
+
+
+def test_container_odds_skips_unpriced_items() -> None:
+    simulators = {"testcase": ContainerSimulator(CASE)}
+    item_prices = dict(ITEM_PRICES)
+    del item_prices[next(iter(simulators["testcase"].item_keys))]
+    assert container_odds(simulators, item_prices) == {}
@@ -0,0 +1,81 @@
+import json
+import zlib
+import pickle
+import hashlib
+from pathlib import Path
+from typing import Any
+from common import StickerMetadatum, validate_metadata
+from spacecases.metadata_file import MetadataFile, MetadataFileSnapshot
+from spacecases.snapshot import save_snapshot, load_snapshot
+
+URL = "https://assets.spacecases.xyz/generated/sticker_metadata.json"
+STICKER = {
+    "formatted_name": "Sticker | Crown (Foil)",
+    "rarity": 4,
+    "price": 100000,
+    "image_url": "https://example.com/crown.png",
+}
+
+
+def sticker_metadata_file(url: str = URL) -> MetadataFile[StickerMetadatum]:
+    return MetadataFile(url, lambda raw, _: validate_metadata(raw, StickerMetadatum))
+
+
+def file_snapshot() -> MetadataFileSnapshot:
+    body = json.dumps({"crown": STICKER}).encode()
+    return MetadataFileSnapshot(
+        URL, '"1"', None, hashlib.sha256(body).digest(), zlib.compress(body)
+    )
+
+
+def test_snapshot_round_trip(tmp_path: Path) -> None:
+    path = str(tmp_path / "snapshot" / "metadata.snapshot")
+    save_snapshot(path, [file_snapshot()])
+    file = sticker_metadata_file()
+    assert load_snapshot(path, [file])
+    assert file.parsed["crown"].price == 100000
+    assert file.snapshot() == file_snapshot()
+    assert file.version == 1
+
+
+def test_snapshot_missing_files(tmp_path: Path) -> None:
+    path = str(tmp_path / "metadata.snapshot")
+    assert not load_snapshot(path, [sticker_metadata_file()])
+    save_snapshot(path, [file_snapshot()])
+    # restored files are still used when others are missing
+    file = sticker_metadata_file()
+    assert not load_snapshot(path, [file, sticker_metadata_file("other")])
+    assert file.version == 1
+
+
+def test_snapshot_from_another_version_is_ignored(tmp_path: Path) -> None:
+    path = tmp_path / "metadata.snapshot"
+    path.write_bytes(pickle.dumps({"version": -1, "files": []}))
+    assert not load_snapshot(str(path), [sticker_metadata_file()])
+    path.write_bytes(b"not a snapshot")
+    assert not load_snapshot(str(path), [sticker_metadata_file()])
+
+
+def test_snapshot_trust(tmp_path: Path) -> None:
+    path = str(tmp_path / "metadata.snapshot")
+    save_snapshot(path, [file_snapshot()])
+    trusted_flags = []
+
+    def decode(raw: Any, trusted: bool) -> dict[str, StickerMetadatum]:
+        trusted_flags.append(trusted)
+        return validate_metadata(raw, StickerMetadatum)
+
+    file = MetadataFile(URL, decode)
+    assert load_snapshot(path, [file])
+    assert load_snapshot(path, [file], trusted=False)
+    assert trusted_flags == [True, False]
+
+
+def test_snapshot_with_wrong_digest_is_not_restored(tmp_path: Path) -> None:
+    path = str(tmp_path / "metadata.snapshot")
+    snapshot = file_snapshot()
+    snapshot.digest = hashlib.sha256(b"something else").digest()
+    save_snapshot(path, [snapshot])
+    file = sticker_metadata_file()
+    assert not load_snapshot(path, [file])
+    assert file.version == 0